@@ -35,7 +35,7 @@ BAY_COUNTIES = [
     "Sonoma"
 ]
 
-CITY_WHITELIST = {
+CITY_WHITELIST = frozenset({
     # San Francisco County
     "San Francisco",
 
@@ -141,7 +141,10 @@ CITY_WHITELIST = {
     "Calistoga",
     "St. Helena",
     "Yountville",
-}
+})
+
+# Lowercased whitelist for O(1) lookups against normalize_city_name() output
+_CITY_WHITELIST_NORMALIZED = frozenset(city.lower() for city in CITY_WHITELIST)
 
 # Normalized alias mappings for common abbreviations and variants
 CITY_ALIASES = {
@@ -152,6 +155,10 @@ CITY_ALIASES = {
     "east pa": "East Palo Alto",
 }
 
+# Address patterns, compiled once: ", CA" state marker and the "City, CA" slot
+_CA_STATE_RE = re.compile(r',\s*CA\b', re.IGNORECASE)
+_CITY_STATE_RE = re.compile(r',\s*([^,]+?),\s*(?:CA|California)', re.IGNORECASE)
+
 # San Francisco coordinates (used as center for radius checks)
 SF_LATLNG: Tuple[float, float] = (37.7749, -122.4194)
 
@@ -159,6 +166,42 @@ SF_LATLNG: Tuple[float, float] = (37.7749, -122.4194)
 BAY_RADIUS_M: int = 97000
 
 
+# Simple city -> county mapping for get_county_for_city (not exhaustive, but
+# covers major cities)
+_CITY_TO_COUNTY = {
+    "san francisco": "San Francisco",
+    "oakland": "Alameda",
+    "berkeley": "Alameda",
+    "emeryville": "Alameda",
+    "alameda": "Alameda",
+    "fremont": "Alameda",
+    "hayward": "Alameda",
+    "south san francisco": "San Mateo",
+    "san mateo": "San Mateo",
+    "redwood city": "San Mateo",
+    "menlo park": "San Mateo",
+    "foster city": "San Mateo",
+    "burlingame": "San Mateo",
+    "san jose": "Santa Clara",
+    "palo alto": "Santa Clara",
+    "mountain view": "Santa Clara",
+    "sunnyvale": "Santa Clara",
+    "santa clara": "Santa Clara",
+    "cupertino": "Santa Clara",
+    "milpitas": "Santa Clara",
+    "san rafael": "Marin",
+    "novato": "Marin",
+    "napa": "Napa",
+    "vallejo": "Solano",
+    "fairfield": "Solano",
+    "concord": "Contra Costa",
+    "walnut creek": "Contra Costa",
+    "richmond": "Contra Costa",
+    "santa rosa": "Sonoma",
+    "petaluma": "Sonoma",
+}
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -218,11 +261,7 @@ def is_in_bay_area_city(city: str) -> bool:
     normalized = normalize_city_name(city)
 
     # Check against normalized whitelist
-    for whitelist_city in CITY_WHITELIST:
-        if normalized == whitelist_city.lower():
-            return True
-
-    return False
+    return normalized in _CITY_WHITELIST_NORMALIZED
 
 
 def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
@@ -317,7 +356,7 @@ def extract_city_from_address(address: str) -> Optional[str]:
     # Try to match City, State pattern
 
     # Pattern: comma, then city name, then comma or "CA" or "California"
-    match = re.search(r',\s*([^,]+?),\s*(?:CA|California)', address, re.IGNORECASE)
+    match = _CITY_STATE_RE.search(address)
     if match:
         potential_city = match.group(1).strip()
         # Validate it's not a ZIP code or state
@@ -373,7 +412,7 @@ def geofence_ok(address_or_city: str, lat: Optional[float] = None,
     if address_or_city:
         address_upper = address_or_city.upper()
         # Look for ", CA" or "California" in address
-        if re.search(r',\s*CA\b', address_or_city, re.IGNORECASE) or \
+        if _CA_STATE_RE.search(address_or_city) or \
            'CALIFORNIA' in address_upper:
             return True
 
@@ -436,41 +475,7 @@ def get_county_for_city(city: str) -> Optional[str]:
     # Normalize input
     normalized = normalize_city_name(city)
 
-    # Simple mapping (not exhaustive, but covers major cities)
-    CITY_TO_COUNTY = {
-        "san francisco": "San Francisco",
-        "oakland": "Alameda",
-        "berkeley": "Alameda",
-        "emeryville": "Alameda",
-        "alameda": "Alameda",
-        "fremont": "Alameda",
-        "hayward": "Alameda",
-        "south san francisco": "San Mateo",
-        "san mateo": "San Mateo",
-        "redwood city": "San Mateo",
-        "menlo park": "San Mateo",
-        "foster city": "San Mateo",
-        "burlingame": "San Mateo",
-        "san jose": "Santa Clara",
-        "palo alto": "Santa Clara",
-        "mountain view": "Santa Clara",
-        "sunnyvale": "Santa Clara",
-        "santa clara": "Santa Clara",
-        "cupertino": "Santa Clara",
-        "milpitas": "Santa Clara",
-        "san rafael": "Marin",
-        "novato": "Marin",
-        "napa": "Napa",
-        "vallejo": "Solano",
-        "fairfield": "Solano",
-        "concord": "Contra Costa",
-        "walnut creek": "Contra Costa",
-        "richmond": "Contra Costa",
-        "santa rosa": "Sonoma",
-        "petaluma": "Sonoma",
-    }
-
-    return CITY_TO_COUNTY.get(normalized)
+    return _CITY_TO_COUNTY.get(normalized)
 
 
 # ============================================================================
@@ -22,7 +22,7 @@ from typing import Optional
 # ============================================================================
 
 # Major California biotech hubs (not exhaustive, but covers main clusters)
-CA_BIOTECH_CITIES = {
+CA_BIOTECH_CITIES = frozenset({
     # === BAY AREA (original 9 counties) ===
     # San Francisco County
     "San Francisco", "SF",
@@ -93,7 +93,10 @@ CA_BIOTECH_CITIES = {
     # === CENTRAL COAST ===
     "Santa Barbara", "Goleta", "San Luis Obispo",
     "Santa Cruz", "Monterey", "Salinas", "Carmel",
-}
+})
+
+# Lowercased city list for O(1) lookups against normalize_city_name() output
+_CA_BIOTECH_CITIES_NORMALIZED = frozenset(city.lower() for city in CA_BIOTECH_CITIES)
 
 # Common city aliases and abbreviations
 CITY_ALIASES = {
@@ -163,9 +166,8 @@ def is_california_city(city: str) -> bool:
     normalized = normalize_city_name(city)
 
     # Check against normalized city list
-    for ca_city in CA_BIOTECH_CITIES:
-        if normalized == ca_city.lower():
-            return True
+    if normalized in _CA_BIOTECH_CITIES_NORMALIZED:
+        return True
 
     # Also accept if it has CA/California in it (very permissive)
     for indicator in CA_INDICATORS:
@@ -4,9 +4,14 @@ Create final comprehensive dataset by merging all enrichment sources.
 Combines classification data, Google Maps enrichment, and other sources.
 """
 
-import csv
+import sys
+import numpy as np
+import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.helpers import atomic_write
+
 # File paths
 COMPANIES_MERGED = Path("data/working/companies_merged.csv")
 COMPANIES_CLASSIFIED = Path("data/working/companies_classified.csv")
@@ -16,6 +21,33 @@ POST_GOOGLE_REFERENCE = Path("data/working/Post-Google-API-Reference-List.csv")
 OUTPUT_COMPLETE = Path("data/final/companies.csv")
 OUTPUT_WORKING = Path("data/working/companies_complete.csv")
 
+GOOGLE_COLUMNS = ['Google_Address', 'Google_Name', 'Google_Website', 'Confidence_Score', 'Latitude', 'Longitude']
+
+
+def read_csv_str(path):
+    """Read a CSV with every cell as a string ('' for empty/missing)."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False).fillna('')
+
+
+def latest_by_name(df):
+    """Index rows by non-empty Company Name, later rows winning (like building a dict)."""
+    if 'Company Name' not in df.columns:
+        return pd.DataFrame(columns=df.columns)
+    df = df[df['Company Name'] != '']
+    return df.drop_duplicates('Company Name', keep='last').set_index('Company Name')
+
+
+def lookup(table, names, column, default=''):
+    """Map names to table[column]; default where the column or name is absent."""
+    if column not in table.columns:
+        return pd.Series(default, index=names.index, dtype=object)
+    return names.map(table[column]).fillna(default)
+
+
+def column_or_blank(df, column):
+    return df[column] if column in df.columns else pd.Series('', index=df.index, dtype=object)
+
+
 print("=" * 70)
 print("Creating Comprehensive Final Dataset")
 print("=" * 70)
@@ -23,122 +55,82 @@ print("=" * 70)
 # Step 1: Load all data sources
 print("\n1. Loading data sources...")
 
-# Load base companies
-with open(COMPANIES_MERGED, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    base_companies = {row['Company Name']: row for row in reader}
-print(f"  ✓ Base companies: {len(base_companies)}")
+# Load base companies (one row per name, last occurrence wins)
+base_df = read_csv_str(COMPANIES_MERGED)
+base_df = base_df.drop_duplicates('Company Name', keep='last').reset_index(drop=True)
+names = base_df['Company Name']
+print(f"  ✓ Base companies: {len(base_df)}")
 
 # Load classifications (if exists)
-classified_data = {}
-if COMPANIES_CLASSIFIED.exists():
-    with open(COMPANIES_CLASSIFIED, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row.get('Company Name', '')
-            if name:
-                classified_data[name] = {
-                    'Company_Stage_Classified': row.get('Company_Stage', 'Unknown'),
-                    'Classifier_Date': row.get('Classifier_Date', ''),
-                    'Focus_Areas_Enhanced': row.get('Focus_Areas', '')
-                }
-    print(f"  ✓ Classifications: {len(classified_data)}")
+classified = latest_by_name(read_csv_str(COMPANIES_CLASSIFIED)) if COMPANIES_CLASSIFIED.exists() else None
+if classified is not None:
+    print(f"  ✓ Classifications: {len(classified)}")
 
 # Load Google Maps enrichment
-google_enriched = {}
-if COMPANIES_ENRICHED_FINAL.exists():
-    with open(COMPANIES_ENRICHED_FINAL, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row.get('Company Name', '')
-            if name:
-                google_enriched[name] = {
-                    'Google_Address': row.get('Google_Address', ''),
-                    'Google_Name': row.get('Google_Name', ''),
-                    'Google_Website': row.get('Google_Website', ''),
-                    'Confidence_Score': row.get('Confidence_Score', ''),
-                    'Latitude': row.get('Latitude', ''),
-                    'Longitude': row.get('Longitude', '')
-                }
+google_enriched = latest_by_name(read_csv_str(COMPANIES_ENRICHED_FINAL)) if COMPANIES_ENRICHED_FINAL.exists() else None
+if google_enriched is not None:
     print(f"  ✓ Google Maps enriched: {len(google_enriched)}")
 
 # Load focused companies (if exists - has enhanced descriptions)
-focused_data = {}
+focused = None
 if COMPANIES_FOCUSED.exists():
-    with open(COMPANIES_FOCUSED, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row.get('Company Name', '')
-            if name:
-                # Get enhanced description if available
-                description = row.get('Description', '')
-                if description and description != base_companies.get(name, {}).get('Description', ''):
-                    focused_data[name] = {
-                        'Description_Enhanced': description
-                    }
-    print(f"  ✓ Enhanced descriptions: {len(focused_data)}")
-
-# Step 2: Merge all data
-print("\n2. Merging data...")
-final_companies = []
-stats = {
-    'total': 0,
-    'has_classification': 0,
-    'has_google_maps': 0,
-    'has_coordinates': 0,
-    'has_enhanced_desc': 0,
-    'stage_distribution': {}
-}
-
-for company_name, base_data in base_companies.items():
-    # Start with base data
-    merged = base_data.copy()
-
-    # Add classification data
-    if company_name in classified_data:
-        merged.update(classified_data[company_name])
-        stats['has_classification'] += 1
-        stage = classified_data[company_name].get('Company_Stage_Classified', 'Unknown')
-        stats['stage_distribution'][stage] = stats['stage_distribution'].get(stage, 0) + 1
-    else:
-        merged['Company_Stage_Classified'] = 'Unknown'
-        merged['Classifier_Date'] = ''
-        merged['Focus_Areas_Enhanced'] = merged.get('Focus Areas', '')
-        stats['stage_distribution']['Unknown'] = stats['stage_distribution'].get('Unknown', 0) + 1
-
-    # Add Google Maps data
-    if company_name in google_enriched:
-        merged.update(google_enriched[company_name])
-        stats['has_google_maps'] += 1
-        if google_enriched[company_name].get('Latitude') and google_enriched[company_name].get('Longitude'):
-            stats['has_coordinates'] += 1
+    focused_df = read_csv_str(COMPANIES_FOCUSED)
+    if 'Company Name' in focused_df.columns and 'Description' in focused_df.columns:
+        # Keep only descriptions that differ from the base description
+        base_description = lookup(base_df.set_index('Company Name'), focused_df['Company Name'], 'Description')
+        focused_df = focused_df[(focused_df['Description'] != '') & (focused_df['Description'] != base_description)]
     else:
-        merged.update({
-            'Google_Address': '',
-            'Google_Name': '',
-            'Google_Website': '',
-            'Confidence_Score': '',
-            'Latitude': '',
-            'Longitude': ''
-        })
-
-    # Add enhanced description (if available)
-    if company_name in focused_data:
-        merged.update(focused_data[company_name])
-        stats['has_enhanced_desc'] += 1
+        focused_df = focused_df.iloc[0:0]
+    focused = latest_by_name(focused_df)
+    print(f"  ✓ Enhanced descriptions: {len(focused)}")
+
+# Step 2: Merge all data (column-wise over the base companies)
+print("\n2. Merging data...")
+merged = base_df.copy()
+
+# Add classification data
+has_classification = names.isin(classified.index) if classified is not None else pd.Series(False, index=names.index)
+if classified is not None:
+    merged['Company_Stage_Classified'] = np.where(has_classification, lookup(classified, names, 'Company_Stage', 'Unknown'), 'Unknown')
+    merged['Classifier_Date'] = np.where(has_classification, lookup(classified, names, 'Classifier_Date'), '')
+    merged['Focus_Areas_Enhanced'] = np.where(has_classification, lookup(classified, names, 'Focus_Areas'), column_or_blank(base_df, 'Focus Areas'))
+else:
+    merged['Company_Stage_Classified'] = 'Unknown'
+    merged['Classifier_Date'] = ''
+    merged['Focus_Areas_Enhanced'] = column_or_blank(base_df, 'Focus Areas')
+
+# Add Google Maps data
+has_google_maps = names.isin(google_enriched.index) if google_enriched is not None else pd.Series(False, index=names.index)
+for column in GOOGLE_COLUMNS:
+    if google_enriched is not None:
+        merged[column] = np.where(has_google_maps, lookup(google_enriched, names, column), '')
     else:
-        merged['Description_Enhanced'] = merged.get('Description', '')
+        merged[column] = ''
+has_coordinates = has_google_maps & (merged['Latitude'] != '') & (merged['Longitude'] != '')
 
-    # Copy Google_Address to Address column if original is empty
-    if not merged.get('Address') and merged.get('Google_Address'):
-        merged['Address'] = merged['Google_Address']
+# Add enhanced description (if available)
+has_enhanced_desc = names.isin(focused.index) if focused is not None else pd.Series(False, index=names.index)
+if focused is not None:
+    merged['Description_Enhanced'] = np.where(has_enhanced_desc, lookup(focused, names, 'Description'), column_or_blank(base_df, 'Description'))
+else:
+    merged['Description_Enhanced'] = column_or_blank(base_df, 'Description')
 
-    stats['total'] += 1
-    final_companies.append(merged)
+# Copy Google_Address to Address column if original is empty
+address = column_or_blank(merged, 'Address')
+merged['Address'] = address.mask((address == '') & (merged['Google_Address'] != ''), merged['Google_Address'])
+
+stats = {
+    'total': len(merged),
+    'has_classification': int(has_classification.sum()),
+    'has_google_maps': int(has_google_maps.sum()),
+    'has_coordinates': int(has_coordinates.sum()),
+    'has_enhanced_desc': int(has_enhanced_desc.sum()),
+    'stage_distribution': merged['Company_Stage_Classified'].value_counts().to_dict(),
+}
 
 # Step 3: Sort companies by name
 print("\n3. Sorting companies...")
-final_companies.sort(key=lambda x: x.get('Company Name', ''))
+merged = merged.sort_values('Company Name', kind='stable')
 
 # Step 4: Write output files
 print("\n4. Writing output files...")
@@ -177,24 +169,19 @@ fieldnames = [
 ]
 
 # Add any remaining fields that aren't in our list
-for company in final_companies:
-    for key in company.keys():
-        if key not in fieldnames:
-            fieldnames.append(key)
+fieldnames.extend(column for column in merged.columns if column not in fieldnames)
+
+output = merged.reindex(columns=fieldnames, fill_value='')
 
 # Write to working directory
-with open(OUTPUT_WORKING, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-    writer.writeheader()
-    writer.writerows(final_companies)
+with atomic_write(OUTPUT_WORKING, encoding='utf-8', newline='') as f:
+    output.to_csv(f, index=False, lineterminator='\r\n')
 print(f"  ✓ Saved to working: {OUTPUT_WORKING}")
 
 # Write to final directory
 OUTPUT_COMPLETE.parent.mkdir(exist_ok=True)
-with open(OUTPUT_COMPLETE, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-    writer.writeheader()
-    writer.writerows(final_companies)
+with atomic_write(OUTPUT_COMPLETE, encoding='utf-8', newline='') as f:
+    output.to_csv(f, index=False, lineterminator='\r\n')
 print(f"  ✓ Saved to final: {OUTPUT_COMPLETE}")
 
 # Step 5: Display statistics
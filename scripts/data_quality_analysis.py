@@ -10,7 +10,7 @@ from collections import Counter, defaultdict
 from urllib.parse import urlparse
 
 # Bay Area cities (comprehensive list based on 9-county definition)
-BAY_AREA_CITIES = {
+BAY_AREA_CITIES = frozenset({
     # Alameda County
     'alameda', 'albany', 'berkeley', 'dublin', 'emeryville', 'fremont', 'hayward',
     'livermore', 'newark', 'oakland', 'piedmont', 'pleasanton', 'san leandro',
@@ -40,7 +40,11 @@ BAY_AREA_CITIES = {
     # Sonoma County
     'cloverdale', 'cotati', 'healdsburg', 'petaluma', 'rohnert park', 'santa rosa',
     'sebastopol', 'sonoma', 'windsor'
-}
+})
+
+# Address heuristics, compiled once for the per-row address quality pass
+_has_digit = re.compile(r'\d').search
+_has_zip = re.compile(r'\b\d{5}\b').search
 
 def normalize_city(city):
     """Normalize city name for comparison."""
@@ -311,10 +315,10 @@ def analyze_dataset(csv_path):
         address = company.get('Address', '').strip()
         if not address:
             addresses_missing += 1
-        elif ',' in address and any(char.isdigit() for char in address):
+        elif ',' in address and _has_digit(address):
             addresses_with_street += 1
             # Check for ZIP code (5 digits)
-            if not re.search(r'\b\d{5}\b', address):
+            if not _has_zip(address):
                 addresses_without_zip += 1
         else:
             addresses_city_only += 1
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Index maintenance shared by the database fix and restore scripts.
+
+Each helper adds an index that newer schemas already define, so the scripts
+also run quickly against databases created before it existed.
+"""
+
+import sqlite3
+
+
+def ensure_current_classification_index(cursor: sqlite3.Cursor) -> None:
+    """Create the partial is_current = 1 index on older databases and refresh planner stats"""
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'index' AND name = 'idx_classifications_current_only'
+    """)
+    if cursor.fetchone() is None:
+        # Covers the "cc.company_id = c.company_id AND cc.is_current = 1" join
+        # while only holding current rows
+        cursor.execute("""
+            CREATE INDEX idx_classifications_current_only
+            ON company_classifications(company_id, company_stage)
+            WHERE is_current = 1
+        """)
+        cursor.execute("ANALYZE company_classifications")
+
+
+def ensure_empty_description_index(cursor: sqlite3.Cursor) -> None:
+    """Create the partial index over companies without a description and refresh planner stats"""
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'index' AND name = 'idx_companies_empty_desc'
+    """)
+    if cursor.fetchone() is None:
+        # Covers the "description IS NULL OR description = ''" lookups while
+        # only holding the companies still waiting for a description
+        cursor.execute("""
+            CREATE INDEX idx_companies_empty_desc
+            ON companies(company_id, company_name, google_address)
+            WHERE description IS NULL OR description = ''
+        """)
+        cursor.execute("ANALYZE companies")
@@ -50,10 +50,17 @@ class DatabaseMigrator:
             shutil.copy2(self.csv_path, backup_csv)
             logging.info(f"CSV backup created: {backup_csv}")
 
-        # Backup existing database if it exists
+        # Backup existing database if it exists. The schema drops and
+        # recreates every table, so move the old file aside instead of
+        # copying it; create_database() then starts from a fresh file.
+        # Fall back to a copy if SQLite sidecar files hold uncheckpointed data.
         if self.db_path.exists():
             backup_db = self.db_path.parent / f"{self.db_path.stem}_backup_{timestamp}.db"
-            shutil.copy2(self.db_path, backup_db)
+            sidecars = [Path(f"{self.db_path}{suffix}") for suffix in ('-wal', '-journal')]
+            if any(sidecar.exists() for sidecar in sidecars):
+                shutil.copy2(self.db_path, backup_db)
+            else:
+                self.db_path.rename(backup_db)
             logging.info(f"Database backup created: {backup_db}")
 
         return timestamp
@@ -294,7 +301,14 @@ class DatabaseMigrator:
             validation_results['top_cities'] = city_distribution
 
             # Check for data loss
-            csv_row_count = sum(1 for _ in open(self.csv_path)) - 1  # Subtract header
+            # Count newlines in raw blocks rather than decoding every line;
+            # an unterminated last line still counts
+            newlines, last = 0, b'\n'
+            with open(self.csv_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    newlines += block.count(b'\n')
+                    last = block[-1:]
+            csv_row_count = newlines + (last != b'\n') - 1  # Subtract header
             validation_results['csv_rows'] = csv_row_count
             validation_results['data_loss'] = csv_row_count - total_companies
 
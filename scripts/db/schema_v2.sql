@@ -174,6 +174,15 @@ CREATE TABLE clinical_trials (
     match_confidence REAL, -- Confidence in the sponsor/company match
     clinicaltrials_url TEXT,
     enriched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Numeric phase rank used for max-phase aggregation (3 = Phase 3/4, 0 = none/NA)
+    phase_num INTEGER GENERATED ALWAYS AS (
+        CASE
+            WHEN phase IN ('PHASE3', 'PHASE4') THEN 3
+            WHEN phase IN ('PHASE2', 'PHASE2_PHASE3') THEN 2
+            WHEN phase IN ('PHASE1', 'PHASE1_PHASE2', 'EARLY_PHASE1') THEN 1
+            ELSE 0
+        END
+    ) STORED,
     FOREIGN KEY (company_id) REFERENCES companies(company_id),
     UNIQUE(nct_id, company_id)
 );
@@ -230,6 +239,7 @@ CREATE INDEX idx_companies_confidence ON companies(confidence_score);
 CREATE INDEX idx_classifications_company ON company_classifications(company_id);
 CREATE INDEX idx_classifications_stage ON company_classifications(company_stage);
 CREATE INDEX idx_classifications_current ON company_classifications(is_current);
+CREATE INDEX idx_classifications_current_only ON company_classifications(company_id, company_stage) WHERE is_current = 1;
 
 CREATE INDEX idx_focus_company ON company_focus_areas(company_id);
 CREATE INDEX idx_focus_area ON company_focus_areas(focus_area);
@@ -243,6 +253,7 @@ CREATE INDEX idx_trials_company ON clinical_trials(company_id);
 CREATE INDEX idx_trials_nct ON clinical_trials(nct_id);
 CREATE INDEX idx_trials_phase ON clinical_trials(phase);
 CREATE INDEX idx_trials_status ON clinical_trials(trial_status);
+CREATE INDEX idx_trials_company_phase ON clinical_trials(company_id, phase_num DESC);
 
 CREATE INDEX idx_api_provider ON api_calls(api_provider);
 CREATE INDEX idx_api_company ON api_calls(company_id);
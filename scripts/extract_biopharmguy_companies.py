@@ -29,6 +29,7 @@ import csv
 import re
 import time
 import logging
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
@@ -227,21 +228,24 @@ def extract_companies_from_biopharmguy(soup):
     return companies
 
 
+def name_key(name):
+    """Comparison key for a company name (trimmed, case-insensitive)."""
+    return name.strip().lower()
+
+
 def deduplicate_companies(companies):
     """Remove duplicate companies by name."""
-    seen = {}
+    seen = set()
     deduplicated = []
 
     for company in companies:
-        name = company['Company Name'].strip()
-        # Use lowercase for comparison to catch case variations
-        name_lower = name.lower()
+        key = name_key(company['Company Name'])
 
-        if name_lower not in seen:
-            seen[name_lower] = True
+        if key not in seen:
+            seen.add(key)
             deduplicated.append(company)
         else:
-            logger.warning(f"Duplicate company found: {name}")
+            logger.warning(f"Duplicate company found: {company['Company Name'].strip()}")
 
     return deduplicated
 
@@ -268,8 +272,8 @@ def validate_extraction_output(companies):
     logger.info(f"✓ Validation: Extracted {len(companies)} companies")
 
     # Check 2: No duplicate names
-    names = [c['Company Name'].strip().lower() for c in companies]
-    duplicates = [name for name in set(names) if names.count(name) > 1]
+    name_counts = Counter(name_key(c['Company Name']) for c in companies)
+    duplicates = [name for name, count in name_counts.items() if count > 1]
 
     if duplicates:
         errors.append(f"ERROR: Found {len(duplicates)} duplicate company names")
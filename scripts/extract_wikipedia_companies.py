@@ -54,7 +54,7 @@ WIKIPEDIA_SOURCES = [
 ]
 
 # Bay Area cities whitelist (from METHODOLOGY.md Appendix A)
-BAY_AREA_CITIES = {
+BAY_AREA_CITIES = frozenset({
     # Alameda County
     'Alameda', 'Albany', 'Berkeley', 'Dublin', 'Emeryville', 'Fremont',
     'Hayward', 'Livermore', 'Newark', 'Oakland', 'Pleasanton', 'San Leandro',
@@ -77,7 +77,10 @@ BAY_AREA_CITIES = {
     'Petaluma', 'Santa Rosa',
     # Napa County
     'Napa'
-}
+})
+
+# Lowercased once for substring checks against lowercased names
+BAY_AREA_CITIES_LOWER = tuple(city.lower() for city in BAY_AREA_CITIES)
 
 
 def fetch_wikipedia_page(url):
@@ -180,8 +183,8 @@ def is_bay_area_company(company_name, city):
 
     # Check if company name mentions Bay Area location
     name_lower = company_name.lower()
-    for city_name in BAY_AREA_CITIES:
-        if city_name.lower() in name_lower:
+    for city_name in BAY_AREA_CITIES_LOWER:
+        if city_name in name_lower:
             return True
 
     # Default to including it (manual filtering later)
@@ -190,16 +193,14 @@ def is_bay_area_company(company_name, city):
 
 def deduplicate_companies(companies):
     """Remove duplicate companies by name."""
+    # Dicts keep insertion order, so the first occurrence of each name
+    # stays in its original position without a separate output list
     seen = {}
-    deduplicated = []
 
     for company in companies:
-        name = company['company_name'].strip()
-        if name not in seen:
-            seen[name] = True
-            deduplicated.append(company)
+        seen.setdefault(company['company_name'].strip(), company)
 
-    return deduplicated
+    return list(seen.values())
 
 
 def extract_core_company_name(company_name):
@@ -265,8 +266,8 @@ def score_url_for_company(url, core_name):
     domain = parsed.netloc.replace('www.', '')
     path = parsed.path.rstrip('/')
 
-    # Immediately reject document files
-    if any(ext in path.lower() for ext in ['.pdf', '.doc', '.xls', '.ppt', '.txt']):
+    # Immediately reject document files (path is already lowercased)
+    if any(ext in path for ext in ['.pdf', '.doc', '.xls', '.ppt', '.txt']):
         return -1000
 
     score = 0
@@ -676,7 +677,8 @@ def extract_website_from_wikipedia_api(page_title):
                 continue
 
             # Skip excluded patterns
-            if any(pattern in url.lower() for pattern in exclude_patterns):
+            url_lower = url.lower()
+            if any(pattern in url_lower for pattern in exclude_patterns):
                 continue
 
             # Score this URL based on company name matching
@@ -709,7 +711,8 @@ def extract_website_from_wikipedia_api(page_title):
                         original_url = 'http://' + original_url
                     # Ensure it's not another aggregator or excluded site
                     if not is_aggregator(original_url):
-                        if not any(pattern in original_url.lower() for pattern in exclude_patterns):
+                        original_url_lower = original_url.lower()
+                        if not any(pattern in original_url_lower for pattern in exclude_patterns):
                             # Return the original URL (note: site may be defunct)
                             return original_url
 
@@ -43,12 +43,12 @@ DATA_WORKING = REPO_ROOT / 'data' / 'working'
 WIKIPEDIA_API = "https://en.wikipedia.org/api/rest_v1/page/summary/"
 
 # Bay Area cities (simplified list)
-BAY_AREA_CITIES = {
+BAY_AREA_CITIES = frozenset({
     'Alameda', 'Berkeley', 'Emeryville', 'Fremont', 'Oakland', 'Pleasanton',
     'San Francisco', 'South San Francisco', 'San Mateo', 'Redwood City',
     'Palo Alto', 'Mountain View', 'San Jose', 'Sunnyvale', 'Santa Clara',
     'Cupertino', 'Menlo Park', 'Foster City', 'San Carlos', 'Burlingame'
-}
+})
 
 
 class EnhancedWikipediaExtractor:
@@ -11,6 +11,40 @@ COMPANIES_MERGED = Path("data/working/companies_merged.csv")
 FINAL_OUTPUT = Path("data/working/companies_enriched_final.csv")
 REFERENCE_LIST = Path("data/working/Post-Google-API-Reference-List.csv")
 
+# Reference list columns, in output order
+REFERENCE_FIELDS = [
+    'Original_Company_Name',
+    'Original_Website',
+    'Original_City',
+    'Google_Company_Name',
+    'Google_Address',
+    'Google_Website',
+    'Latitude',
+    'Longitude',
+    'Match_Score',
+    'Enriched',
+]
+
+
+def reference_rows(all_companies, enriched_lookup):
+    """Yield one reference row per original company (streamed to the writer)."""
+    for company_name, original in all_companies.items():
+        enriched = enriched_lookup.get(company_name, {})
+
+        yield {
+            'Original_Company_Name': company_name,
+            'Original_Website': original.get('Website', ''),
+            'Original_City': original.get('City', ''),
+            'Google_Company_Name': enriched.get('Google_Name', ''),
+            'Google_Address': enriched.get('Google_Address', ''),
+            'Google_Website': enriched.get('Google_Website', ''),
+            'Latitude': enriched.get('Latitude', ''),
+            'Longitude': enriched.get('Longitude', ''),
+            'Match_Score': enriched.get('Confidence_Score', ''),
+            'Enriched': 'Yes' if company_name in enriched_lookup else 'No'
+        }
+
+
 print("=" * 70)
 print("Finalizing Google Maps Enrichment")
 print("=" * 70)
@@ -52,28 +86,11 @@ with open(COMPANIES_MERGED, 'r', encoding='utf-8') as f:
 # Build enriched lookup
 enriched_lookup = {row['Company Name']: row for row in all_enriched}
 
-# Create reference list
-reference_data = []
-for company_name, original in all_companies.items():
-    enriched = enriched_lookup.get(company_name, {})
-
-    reference_data.append({
-        'Original_Company_Name': company_name,
-        'Original_Website': original.get('Website', ''),
-        'Original_City': original.get('City', ''),
-        'Google_Company_Name': enriched.get('Google_Name', ''),
-        'Google_Address': enriched.get('Google_Address', ''),
-        'Google_Website': enriched.get('Google_Website', ''),
-        'Latitude': enriched.get('Latitude', ''),
-        'Longitude': enriched.get('Longitude', ''),
-        'Match_Score': enriched.get('Confidence_Score', ''),
-        'Enriched': 'Yes' if company_name in enriched_lookup else 'No'
-    })
-
+# Create reference list, writing rows as they are built
 with open(REFERENCE_LIST, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=reference_data[0].keys())
+    writer = csv.DictWriter(f, fieldnames=REFERENCE_FIELDS)
     writer.writeheader()
-    writer.writerows(reference_data)
+    writer.writerows(reference_rows(all_companies, enriched_lookup))
 
 print(f"✓ Saved reference list: {REFERENCE_LIST}")
 
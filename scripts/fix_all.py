@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Run all database fix scripts in a single transaction
+
+Applies, in order:
+1. Non-California city corrections (fix_non_ca_cities)
+2. SEC EDGAR classification fixes (fix_sec_classification)
+3. ClinicalTrials.gov classification fixes (fix_clinical_trials_classification)
+
+All three share one connection and commit once, so a run costs a single
+fsync and either every fix lands or none do.
+
+Usage:
+    python scripts/fix_all.py [--db data/bayarea_biotech_sources.db]
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from scripts.fix_non_ca_cities import CACHED_STATEMENTS, apply_city_corrections
+from scripts.fix_sec_classification import apply_sec_fixes, report_sec_fixes
+from scripts.fix_clinical_trials_classification import (
+    apply_clinical_trials_fixes,
+    report_clinical_trials_fixes,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def fix_all(db_path: str = "data/bayarea_biotech_sources.db"):
+    """Apply every fix against one connection and commit once"""
+
+    # Validate database path
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+
+    if not os.access(db_path, os.R_OK | os.W_OK):
+        raise PermissionError(f"Insufficient permissions for database: {db_path}")
+
+    # isolation_level=None hands transaction control to the explicit BEGIN/COMMIT below
+    conn = sqlite3.connect(str(db_path), cached_statements=CACHED_STATEMENTS, isolation_level=None)
+    cursor = conn.cursor()
+
+    # Enable foreign key constraints for data integrity; keep temp B-trees
+    # (GROUP BY / IN lists) in memory and give the page cache ~64 MB so it
+    # stays warm across the three phases
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA cache_size = -64000")
+
+    try:
+        # Take the write lock once for all three phases
+        cursor.execute("BEGIN IMMEDIATE")
+
+        logger.info("=" * 60)
+        logger.info("PHASE 1: NON-CALIFORNIA CITY CORRECTIONS")
+        logger.info("=" * 60)
+        cities_fixed = apply_city_corrections(cursor)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("PHASE 2: SEC EDGAR CLASSIFICATIONS")
+        logger.info("=" * 60)
+        sec_results = apply_sec_fixes(cursor)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("PHASE 3: CLINICAL TRIALS CLASSIFICATIONS")
+        logger.info("=" * 60)
+        trials_fixed = apply_clinical_trials_fixes(cursor)
+
+        # Single commit for all phases
+        cursor.execute("COMMIT")
+
+        logger.info(f"\n✓ Fixed {cities_fixed} company cities")
+        report_sec_fixes(cursor, sec_results)
+        report_clinical_trials_fixes(cursor, trials_fixed)
+
+    except Exception as e:
+        logger.error(f"Error applying fixes: {e}")
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all database fixes in one transaction')
+    parser.add_argument('--db', default='data/bayarea_biotech_sources.db', help='Database path')
+
+    args = parser.parse_args()
+
+    fix_all(db_path=args.db)
+
+if __name__ == "__main__":
+    main()
@@ -27,28 +27,38 @@ CITY_CORRECTIONS = [
     ("Oncolytics Biotech", "Calgary", "AB, Canada"),
 ]
 
-def fix_cities(db_path='data/bayarea_biotech_sources.db', dry_run=False):
-    """
-    Fix incorrect city data for non-California companies
+# SQL kept as module-level constants so sqlite3's statement cache reuses
+# the prepared statements
+SELECT_COMPANIES_SQL = """
+    SELECT company_id, company_name, city, google_address
+    FROM companies
+    WHERE company_name IN ({placeholders})
+"""
+UPDATE_CITY_SQL = "UPDATE companies SET city = ? WHERE company_id = ?"
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+def apply_city_corrections(cursor, dry_run=False):
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    Apply CITY_CORRECTIONS using an open cursor.
 
-    logger.info("=" * 70)
-    logger.info("FIXING NON-CALIFORNIA COMPANY CITIES")
-    logger.info("=" * 70)
+    Runs inside the caller's transaction and does not commit, so it can be
+    combined with the other fix scripts (see fix_all.py).
 
-    fixed_count = 0
+    Returns:
+        Number of company cities updated (0 in dry-run mode)
+    """
+    # Look up every company in one query instead of one SELECT per correction
+    names = [name for name, _, _ in CITY_CORRECTIONS]
+    placeholders = ",".join("?" * len(names))
+    cursor.execute(SELECT_COMPANIES_SQL.format(placeholders=placeholders), names)
+    by_name = {row[1]: row for row in cursor.fetchall()}
 
-    for company_name, correct_city, location in CITY_CORRECTIONS:
-        # Find the company
-        cursor.execute("""
-            SELECT company_id, company_name, city, google_address
-            FROM companies
-            WHERE company_name = ?
-        """, (company_name,))
+    updates = []
 
-        result = cursor.fetchone()
+    for company_name, correct_city, location in CITY_CORRECTIONS:
+        result = by_name.get(company_name)
 
         if result:
             company_id, name, old_city, address = result
@@ -57,24 +67,51 @@ def fix_cities(db_path='data/bayarea_biotech_sources.db', dry_run=False):
             logger.info(f"  New city: {correct_city} ({location})")
             logger.info(f"  Address: {address[:80]}...")
 
-            if not dry_run:
-                cursor.execute("""
-                    UPDATE companies
-                    SET city = ?
-                    WHERE company_id = ?
-                """, (correct_city, company_id))
-                fixed_count += 1
+            updates.append((correct_city, company_id))
         else:
             logger.warning(f"Company not found: {company_name}")
 
-    if not dry_run and fixed_count > 0:
-        conn.commit()
-        logger.info(f"\n✓ Fixed {fixed_count} company cities")
-    elif dry_run:
-        logger.info("\n*** DRY RUN MODE - No changes made ***")
-        logger.info(f"Would fix {len(CITY_CORRECTIONS)} companies")
+    if dry_run or not updates:
+        return 0
+
+    cursor.executemany(UPDATE_CITY_SQL, updates)
+    return len(updates)
 
-    conn.close()
+def fix_cities(db_path='data/bayarea_biotech_sources.db', dry_run=False):
+    """
+    Fix incorrect city data for non-California companies
+    """
+    # isolation_level=None hands transaction control to the explicit BEGIN/COMMIT below
+    conn = sqlite3.connect(db_path, cached_statements=CACHED_STATEMENTS, isolation_level=None)
+    cursor = conn.cursor()
+
+    try:
+        # A dry run only reads, so it takes no write lock; a real run takes it
+        # up front so lookups and updates share one transaction
+        if not dry_run:
+            cursor.execute("BEGIN IMMEDIATE")
+
+        logger.info("=" * 70)
+        logger.info("FIXING NON-CALIFORNIA COMPANY CITIES")
+        logger.info("=" * 70)
+
+        fixed_count = apply_city_corrections(cursor, dry_run=dry_run)
+
+        if dry_run:
+            logger.info("\n*** DRY RUN MODE - No changes made ***")
+            logger.info(f"Would fix {len(CITY_CORRECTIONS)} companies")
+        else:
+            cursor.execute("COMMIT")
+            if fixed_count > 0:
+                logger.info(f"\n✓ Fixed {fixed_count} company cities")
+
+    except Exception as e:
+        logger.error(f"Error fixing cities: {e}")
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
 
 def main():
     import argparse
@@ -3,13 +3,164 @@
 Fix SEC classification bug - properly classify companies with formerly_public and acquired status
 """
 
+import sys
 import sqlite3
 import logging
+from collections import Counter
 from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.db.indexes import ensure_current_classification_index
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def apply_sec_fixes(cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """
+    Reclassify companies with SEC data but an Unknown/NULL classification.
+
+    Runs inside the caller's transaction and does not commit, so it can be
+    combined with the other fix scripts (see fix_all.py).
+
+    Returns:
+        Dict with before_count and per-status fixed counts
+    """
+    ensure_current_classification_index(cursor)
+
+    # First, get statistics before fix
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM companies c
+        JOIN sec_edgar_data s ON c.company_id = s.company_id
+        LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
+        WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
+    """)
+    before_count = cursor.fetchone()[0]
+
+    logger.info(f"Companies with SEC data but Unknown/NULL classification: {before_count}")
+
+    # Get breakdown by status
+    cursor.execute("""
+        SELECT s.company_status, COUNT(*) as count
+        FROM companies c
+        JOIN sec_edgar_data s ON c.company_id = s.company_id
+        LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
+        WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
+        GROUP BY s.company_status
+    """)
+
+    logger.info("\nBreakdown by SEC status:")
+    status_counts = {}
+    for status, count in cursor.fetchall():
+        status_counts[status] = count
+        logger.info(f"  {status}: {count} companies")
+
+    # Fix 1: Mark existing classifications as not current for companies we're updating
+    logger.info("\nUpdating existing classifications...")
+    cursor.execute("""
+        UPDATE company_classifications
+        SET is_current = 0
+        WHERE company_id IN (
+            SELECT c.company_id
+            FROM companies c
+            JOIN sec_edgar_data s ON c.company_id = s.company_id
+            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
+            WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
+            AND s.company_status IN ('formerly_public', 'acquired', 'public')
+        )
+    """)
+
+    # Fix 2-4: Add proper classifications for formerly_public, acquired and
+    # public companies in one pass. RETURNING hands back the inserted rows
+    # so the per-status counts need no follow-up query.
+    logger.info("Adding classifications for formerly_public, acquired and public companies...")
+    cursor.execute("""
+        INSERT INTO company_classifications (
+            company_id, company_stage, classification_method,
+            classification_confidence, classification_source, is_current
+        )
+        SELECT
+            c.company_id,
+            CASE s.company_status
+                WHEN 'public' THEN 'Public'
+                ELSE 'Public/Late-Stage'
+            END,
+            'sec_edgar_fix',
+            CASE s.company_status
+                WHEN 'formerly_public' THEN 0.85
+                WHEN 'acquired' THEN 0.90
+                ELSE 0.95
+            END,
+            CASE s.company_status
+                WHEN 'formerly_public' THEN 'SEC EDGAR (formerly public)'
+                WHEN 'acquired' THEN 'SEC EDGAR (acquired)'
+                ELSE 'SEC EDGAR (public)'
+            END,
+            1
+        FROM companies c
+        JOIN sec_edgar_data s ON c.company_id = s.company_id
+        LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
+        WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
+        AND s.company_status IN ('formerly_public', 'acquired', 'public')
+        RETURNING classification_source
+    """)
+    fixed_by_source = Counter(row[0] for row in cursor.fetchall())
+
+    formerly_public_fixed = fixed_by_source['SEC EDGAR (formerly public)']
+    acquired_fixed = fixed_by_source['SEC EDGAR (acquired)']
+    public_fixed = fixed_by_source['SEC EDGAR (public)']
+    logger.info(f"  Fixed {formerly_public_fixed} formerly_public companies")
+    logger.info(f"  Fixed {acquired_fixed} acquired companies")
+    logger.info(f"  Fixed {public_fixed} public companies")
+
+    return {
+        'before_count': before_count,
+        'formerly_public': formerly_public_fixed,
+        'acquired': acquired_fixed,
+        'public': public_fixed,
+    }
+
+def report_sec_fixes(cursor: sqlite3.Cursor, results: Dict[str, int]):
+    """Log the outcome of apply_sec_fixes (run after commit)"""
+    before_count = results['before_count']
+    formerly_public_fixed = results['formerly_public']
+    acquired_fixed = results['acquired']
+    public_fixed = results['public']
+
+    # Every inserted row resolves one previously Unknown/NULL SEC company
+    after_count = before_count - formerly_public_fixed - acquired_fixed - public_fixed
+
+    # Get overall Unknown count
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM companies c
+        LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
+        WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
+    """)
+    total_unknown = cursor.fetchone()[0]
+
+    logger.info("\n" + "="*60)
+    logger.info("FIX RESULTS")
+    logger.info("="*60)
+    logger.info(f"Companies with SEC data but Unknown (before): {before_count}")
+    logger.info(f"Companies with SEC data but Unknown (after):  {after_count}")
+    logger.info(f"Total fixed: {before_count - after_count}")
+    logger.info(f"  - Formerly public: {formerly_public_fixed}")
+    logger.info(f"  - Acquired: {acquired_fixed}")
+    logger.info(f"  - Public: {public_fixed}")
+
+    # Get total companies for percentage calculations
+    cursor.execute("SELECT COUNT(*) FROM companies")
+    total_companies = cursor.fetchone()[0]
+
+    logger.info(f"\nTotal Unknown companies remaining: {total_unknown}")
+    if total_companies > 0:
+        logger.info(f"Unknown percentage: {total_unknown / total_companies * 100:.1f}%")
+    else:
+        logger.info("No companies found in database")
+
 def fix_sec_classifications(db_path: str = "data/bayarea_biotech_sources.db"):
     """Fix classification for companies with SEC data but incorrect/missing classification"""
 
@@ -24,172 +175,31 @@ def fix_sec_classifications(db_path: str = "data/bayarea_biotech_sources.db"):
     if not os.access(db_path, os.R_OK | os.W_OK):
         raise PermissionError(f"Insufficient permissions for database: {db_path}")
 
-    # Use row factory for safer data access
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
+    # Rows are unpacked positionally, so keep the default tuple rows.
+    # isolation_level=None hands transaction control to the explicit
+    # BEGIN/COMMIT below.
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
     cursor = conn.cursor()
 
     # Enable foreign key constraints for data integrity
     cursor.execute("PRAGMA foreign_keys = ON")
 
     try:
-        # First, get statistics before fix
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
-        """)
-        before_count = cursor.fetchone()[0]
+        # Take the write lock up front so the fix runs as one transaction
+        # without mid-transaction lock promotion
+        cursor.execute("BEGIN IMMEDIATE")
 
-        logger.info(f"Companies with SEC data but Unknown/NULL classification: {before_count}")
-
-        # Get breakdown by status
-        cursor.execute("""
-            SELECT s.company_status, COUNT(*) as count
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
-            GROUP BY s.company_status
-        """)
-
-        logger.info("\nBreakdown by SEC status:")
-        status_counts = {}
-        for status, count in cursor.fetchall():
-            status_counts[status] = count
-            logger.info(f"  {status}: {count} companies")
-
-        # Fix 1: Mark existing classifications as not current for companies we're updating
-        logger.info("\nUpdating existing classifications...")
-        cursor.execute("""
-            UPDATE company_classifications
-            SET is_current = 0
-            WHERE company_id IN (
-                SELECT c.company_id
-                FROM companies c
-                JOIN sec_edgar_data s ON c.company_id = s.company_id
-                LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-                WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
-                AND s.company_status IN ('formerly_public', 'acquired', 'public')
-            )
-        """)
-
-        # Fix 2: Add proper classifications for formerly_public companies
-        logger.info("Adding classifications for formerly_public companies...")
-        cursor.execute("""
-            INSERT INTO company_classifications (
-                company_id, company_stage, classification_method,
-                classification_confidence, classification_source, is_current
-            )
-            SELECT
-                c.company_id,
-                'Public/Late-Stage',
-                'sec_edgar_fix',
-                0.85,
-                'SEC EDGAR (formerly public)',
-                1
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
-            AND s.company_status = 'formerly_public'
-        """)
-        formerly_public_fixed = cursor.rowcount
-        logger.info(f"  Fixed {formerly_public_fixed} formerly_public companies")
-
-        # Fix 3: Add proper classifications for acquired companies
-        logger.info("Adding classifications for acquired companies...")
-        cursor.execute("""
-            INSERT INTO company_classifications (
-                company_id, company_stage, classification_method,
-                classification_confidence, classification_source, is_current
-            )
-            SELECT
-                c.company_id,
-                'Public/Late-Stage',
-                'sec_edgar_fix',
-                0.90,
-                'SEC EDGAR (acquired)',
-                1
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
-            AND s.company_status = 'acquired'
-        """)
-        acquired_fixed = cursor.rowcount
-        logger.info(f"  Fixed {acquired_fixed} acquired companies")
-
-        # Fix 4: Also fix any public companies that somehow got missed
-        logger.info("Checking for any missed public companies...")
-        cursor.execute("""
-            INSERT INTO company_classifications (
-                company_id, company_stage, classification_method,
-                classification_confidence, classification_source, is_current
-            )
-            SELECT
-                c.company_id,
-                'Public',
-                'sec_edgar_fix',
-                0.95,
-                'SEC EDGAR (public)',
-                1
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE (cc.company_stage = 'Unknown' OR cc.company_stage IS NULL)
-            AND s.company_status = 'public'
-        """)
-        public_fixed = cursor.rowcount
-        logger.info(f"  Fixed {public_fixed} public companies")
+        results = apply_sec_fixes(cursor)
 
         # Commit changes
-        conn.commit()
+        cursor.execute("COMMIT")
 
-        # Get statistics after fix
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM companies c
-            JOIN sec_edgar_data s ON c.company_id = s.company_id
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
-        """)
-        after_count = cursor.fetchone()[0]
-
-        # Get overall Unknown count
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM companies c
-            LEFT JOIN company_classifications cc ON c.company_id = cc.company_id AND cc.is_current = 1
-            WHERE cc.company_stage = 'Unknown' OR cc.company_stage IS NULL
-        """)
-        total_unknown = cursor.fetchone()[0]
-
-        logger.info("\n" + "="*60)
-        logger.info("FIX RESULTS")
-        logger.info("="*60)
-        logger.info(f"Companies with SEC data but Unknown (before): {before_count}")
-        logger.info(f"Companies with SEC data but Unknown (after):  {after_count}")
-        logger.info(f"Total fixed: {before_count - after_count}")
-        logger.info(f"  - Formerly public: {formerly_public_fixed}")
-        logger.info(f"  - Acquired: {acquired_fixed}")
-        logger.info(f"  - Public: {public_fixed}")
-
-        # Get total companies for percentage calculations
-        cursor.execute("SELECT COUNT(*) FROM companies")
-        total_companies = cursor.fetchone()[0]
-
-        logger.info(f"\nTotal Unknown companies remaining: {total_unknown}")
-        if total_companies > 0:
-            logger.info(f"Unknown percentage: {total_unknown / total_companies * 100:.1f}%")
-        else:
-            logger.info("No companies found in database")
+        report_sec_fixes(cursor, results)
 
     except Exception as e:
         logger.error(f"Error fixing classifications: {e}")
-        conn.rollback()
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
         raise
     finally:
         conn.close()
@@ -23,12 +23,13 @@ Author: Bay Area Biotech Map V4.3
 Date: 2025-11-16
 """
 
-import csv
 import sys
 import logging
-import random
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict
+
+import numpy as np
+import pandas as pd
 
 # ============================================================================
 # Setup Logging
@@ -49,6 +50,12 @@ INPUT_FILE = Path("data/working/companies_focused.csv")
 SPOT_CHECK_FILE = Path("data/working/spot_check_sample.csv")
 TIER_4_FILE = Path("data/working/tier_4_review.csv")
 
+# Column names (Path B writes Confidence, Path A writes Confidence_Det)
+CONFIDENCE_COLUMN = "Confidence"
+CONFIDENCE_DET_COLUMN = "Confidence_Det"
+TIER_COLUMN = "Tier"
+CONFIDENCE_SCORE_COLUMN = "Confidence_Score"
+
 # Tier thresholds
 TIER_1_THRESHOLD = 0.95
 TIER_2_THRESHOLD = 0.90
@@ -60,58 +67,61 @@ SPOT_CHECK_SIZE = 10
 # Random seed for reproducible sampling
 RANDOM_SEED = 42
 
+# Write buffer for the (potentially large) Tier 4 dump
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 # ============================================================================
 # Tier Calculation
 # ============================================================================
 
-def calculate_tier(confidence: float) -> int:
+def get_confidence_scores(df: pd.DataFrame) -> np.ndarray:
     """
-    Calculate tier based on confidence score.
+    Extract confidence scores for every row of a DataFrame.
+
+    Tries multiple fields for compatibility:
+    - Confidence (from Path B)
+    - Confidence_Det (from Path A)
 
     Args:
-        confidence: Confidence score (0.0 to 1.0)
+        df: Company data loaded with dtype=str
 
     Returns:
-        Tier number (1, 2, 3, or 4)
+        Array of confidence scores (0.0 where no valid score is found)
     """
-    if confidence >= TIER_1_THRESHOLD:
-        return 1
-    elif confidence >= TIER_2_THRESHOLD:
-        return 2
-    elif confidence >= TIER_3_THRESHOLD:
-        return 3
+    # Try "Confidence" first (Path B)
+    if CONFIDENCE_COLUMN in df.columns:
+        confidence = df[CONFIDENCE_COLUMN].str.strip()
     else:
-        return 4
+        confidence = pd.Series("", index=df.index)
 
+    # Fall back to "Confidence_Det" (Path A)
+    if CONFIDENCE_DET_COLUMN in df.columns:
+        confidence = confidence.where(confidence != "", df[CONFIDENCE_DET_COLUMN].str.strip())
 
-def get_confidence_from_row(row: Dict) -> float:
-    """
-    Extract confidence score from a row.
+    # Parse as float; missing/invalid scores are treated as Tier 4 (lowest confidence)
+    scores = pd.to_numeric(confidence, errors="coerce").to_numpy(dtype=float)
+    return np.nan_to_num(scores, nan=0.0)
 
-    Tries multiple fields for compatibility:
-    - Confidence (from Path B)
-    - Confidence_Det (from Path A)
+
+def calculate_tiers(confidence: np.ndarray) -> np.ndarray:
+    """
+    Calculate tiers for an array of confidence scores.
 
     Args:
-        row: Company data row
+        confidence: Array of confidence scores (0.0 to 1.0)
 
     Returns:
-        Confidence score, or 0.0 if not found
+        Array of tier numbers (1, 2, 3, or 4); NaN scores fail every
+        threshold and land in Tier 4
     """
-    # Try "Confidence" first (Path B)
-    confidence_str = row.get("Confidence", "").strip()
-
-    # Fall back to "Confidence_Det" (Path A)
-    if not confidence_str:
-        confidence_str = row.get("Confidence_Det", "").strip()
-
-    # Parse as float
-    try:
-        return float(confidence_str)
-    except (ValueError, TypeError):
-        # If no valid confidence score, treat as Tier 4 (lowest confidence)
-        return 0.0
+    return np.select(
+        [confidence >= TIER_1_THRESHOLD,
+         confidence >= TIER_2_THRESHOLD,
+         confidence >= TIER_3_THRESHOLD],
+        [1, 2, 3],
+        default=4,
+    )
 
 
 # ============================================================================
@@ -140,40 +150,23 @@ def generate_review_queues(input_path: Path,
     # Load data and categorize by tier
     logger.info(f"Loading data from: {input_path}")
 
-    tier_1_companies = []
-    tier_2_companies = []
-    tier_3_companies = []
-    tier_4_companies = []
-
-    with open(input_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-
-        for row in reader:
-            confidence = get_confidence_from_row(row)
-            tier = calculate_tier(confidence)
-
-            # Add tier to row for output
-            row_with_tier = row.copy()
-            row_with_tier["Tier"] = str(tier)
-            row_with_tier["Confidence_Score"] = f"{confidence:.3f}"
-
-            if tier == 1:
-                tier_1_companies.append(row_with_tier)
-            elif tier == 2:
-                tier_2_companies.append(row_with_tier)
-            elif tier == 3:
-                tier_3_companies.append(row_with_tier)
-            else:  # tier == 4
-                tier_4_companies.append(row_with_tier)
+    df = pd.read_csv(input_path, dtype=str, keep_default_na=False, encoding='utf-8').fillna("")
+
+    # Compute tiers for the whole column at once
+    confidence = get_confidence_scores(df)
+    tiers = calculate_tiers(confidence)
+
+    # Add Tier and Confidence_Score for output
+    df[TIER_COLUMN] = tiers.astype(str)
+    df[CONFIDENCE_SCORE_COLUMN] = np.char.mod("%.3f", confidence)
 
     # Statistics
     stats = {
-        "total": len(tier_1_companies) + len(tier_2_companies) + len(tier_3_companies) + len(tier_4_companies),
-        "tier_1": len(tier_1_companies),
-        "tier_2": len(tier_2_companies),
-        "tier_3": len(tier_3_companies),
-        "tier_4": len(tier_4_companies),
+        "total": len(df),
+        "tier_1": int((tiers == 1).sum()),
+        "tier_2": int((tiers == 2).sum()),
+        "tier_3": int((tiers == 3).sum()),
+        "tier_4": int((tiers == 4).sum()),
     }
 
     logger.info(f"Loaded {stats['total']} companies")
@@ -183,26 +176,20 @@ def generate_review_queues(input_path: Path,
     logger.info(f"  Tier 4 (<0.75): {stats['tier_4']}")
     logger.info("")
 
-    # Prepare output fieldnames (add Tier and Confidence_Score)
-    output_fieldnames = list(fieldnames) + ["Tier", "Confidence_Score"]
-
-    # Generate spot check sample (10 random from Tier 1/2)
-    tier_1_2_companies = tier_1_companies + tier_2_companies
+    # Generate spot check sample (10 random from Tier 1/2). Only the row
+    # positions are sampled, so the Tier 1/2 subset is never copied out.
+    tier_1_2_positions = np.flatnonzero(tiers <= 2)
 
-    if len(tier_1_2_companies) > 0:
-        # Set random seed for reproducibility
-        random.seed(RANDOM_SEED)
-
-        # Sample up to SPOT_CHECK_SIZE companies
-        sample_size = min(SPOT_CHECK_SIZE, len(tier_1_2_companies))
-        spot_check_sample = random.sample(tier_1_2_companies, sample_size)
+    if len(tier_1_2_positions) > 0:
+        # Sample up to SPOT_CHECK_SIZE companies (seeded for reproducibility)
+        sample_size = min(SPOT_CHECK_SIZE, len(tier_1_2_positions))
+        rng = np.random.default_rng(RANDOM_SEED)
+        sample_positions = rng.choice(tier_1_2_positions, size=sample_size, replace=False)
+        spot_check_sample = df.iloc[sample_positions]
 
         logger.info(f"Generating spot check sample ({sample_size} companies)...")
 
-        with open(spot_check_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=output_fieldnames)
-            writer.writeheader()
-            writer.writerows(spot_check_sample)
+        spot_check_sample.to_csv(spot_check_path, index=False, encoding='utf-8')
 
         logger.info(f"  ✓ Spot check sample written to: {spot_check_path}")
 
@@ -212,22 +199,20 @@ def generate_review_queues(input_path: Path,
         stats["spot_check_size"] = 0
 
     # Generate Tier 4 review queue (ALL Tier 4 companies)
+    tier_4_companies = df[tiers == 4]
+
     if len(tier_4_companies) > 0:
         logger.info(f"Generating Tier 4 review queue ({len(tier_4_companies)} companies)...")
-
-        with open(tier_4_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=output_fieldnames)
-            writer.writeheader()
-            writer.writerows(tier_4_companies)
-
-        logger.info(f"  ✓ Tier 4 review queue written to: {tier_4_path}")
     else:
         logger.info("No Tier 4 companies found - no manual review needed!")
 
-        # Write empty file to indicate completion
-        with open(tier_4_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=output_fieldnames)
-            writer.writeheader()
+    # Writes a header-only file when there are no Tier 4 companies, to indicate completion.
+    # A 1 MiB buffer keeps write() syscalls low when the queue is several MB.
+    with open(tier_4_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        tier_4_companies.to_csv(f, index=False)
+
+    if len(tier_4_companies) > 0:
+        logger.info(f"  ✓ Tier 4 review queue written to: {tier_4_path}")
 
     return stats
 
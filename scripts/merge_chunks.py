@@ -2,34 +2,102 @@
 """Merge enriched chunks into final output file."""
 
 import csv
+import io
 from pathlib import Path
 
 CHUNKS_DIR = Path("data/working/chunks")
 OUTPUT_FILE = Path("data/working/companies_enriched_parallel.csv")
 
+# 1 MB file buffers: fewer read/write syscalls when streaming chunks
+IO_BUFFER_SIZE = 1 << 20
+
+
+def count_records(block, in_quotes):
+    """
+    Count the CSV records ended in a block of raw bytes.
+
+    A newline ends a record only outside a quoted field. Quotes inside
+    fields are doubled, so splitting on b'"' alternates between outside
+    and inside, and the quoted state carries over to the next block.
+
+    Returns:
+        (records ended in this block, whether the block ends inside quotes)
+    """
+    parts = block.split(b'"')
+    count = sum(part.count(b'\n') for part in parts[1 if in_quotes else 0::2])
+    return count, in_quotes != ((len(parts) - 1) % 2 == 1)
+
+
 # Collect all enriched chunks
 chunk_files = sorted(CHUNKS_DIR.glob("chunk_*_enriched.csv"))
 print(f"Found {len(chunk_files)} enriched chunks")
 
-# Read all enriched companies
-all_enriched = []
+# Stream every chunk straight into the merged output. Files are handled as
+# bytes so matching chunks are copied without decoding/re-encoding UTF-8;
+# only a chunk whose header differs goes through the csv module.
 headers = None
+merged_chunks = 0
+total_rows = 0
+
+with open(OUTPUT_FILE, 'wb', buffering=IO_BUFFER_SIZE) as out:
+    row_buffer = io.StringIO()
+    writer = csv.writer(row_buffer)
+
+    for chunk_file in chunk_files:
+        with open(chunk_file, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            header_line = f.readline()
+            if not header_line:
+                print(f"{chunk_file.name}: empty file, skipped")
+                continue
+            chunk_headers = next(csv.reader([header_line.decode('utf-8')]))
+
+            if headers is None:
+                headers = chunk_headers
+                header_source = chunk_file.name
+                out.write(header_line)
+                if not header_line.endswith(b'\n'):
+                    out.write(b'\r\n')
 
-for chunk_file in chunk_files:
-    with open(chunk_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        if headers is None:
-            headers = reader.fieldnames
-        chunk_data = list(reader)
-        all_enriched.extend(chunk_data)
-        print(f"{chunk_file.name}: {len(chunk_data)} companies")
+            chunk_count = 0
+            if chunk_headers == headers:
+                # Same schema: copy the data rows verbatim, counting records
+                # from the raw bytes instead of parsing them
+                in_quotes = False
+                last_byte = b'\n'
+                for block in iter(lambda: f.read(IO_BUFFER_SIZE), b''):
+                    out.write(block)
+                    records, in_quotes = count_records(block, in_quotes)
+                    chunk_count += records
+                    last_byte = block[-1:]
+                if last_byte != b'\n':
+                    out.write(b'\r\n')
+                    chunk_count += 1
+                print(f"{chunk_file.name}: {chunk_count} companies")
+            else:
+                # Different column order: project columns into the output order
+                # by name; a column the output has no place for is an error,
+                # not something to drop silently
+                extra = [name for name in chunk_headers if name not in headers]
+                if extra:
+                    raise ValueError(
+                        f"{chunk_file.name} has columns not in {header_source}: {', '.join(extra)}"
+                    )
+                positions = {name: i for i, name in enumerate(chunk_headers)}
+                projection = [positions.get(name) for name in headers]
 
-print(f"\nTotal enriched: {len(all_enriched)} companies")
+                for row in csv.reader(io.TextIOWrapper(f, encoding='utf-8', newline='')):
+                    if not row:
+                        continue
+                    writer.writerow([row[i] if i is not None and i < len(row) else '' for i in projection])
+                    out.write(row_buffer.getvalue().encode('utf-8'))
+                    row_buffer.seek(0)
+                    row_buffer.truncate()
+                    chunk_count += 1
+                print(f"{chunk_file.name}: {chunk_count} companies (header differs, re-mapped)")
 
-# Write merged output
-with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=headers)
-    writer.writeheader()
-    writer.writerows(all_enriched)
+        merged_chunks += 1
+        total_rows += chunk_count
 
+print(f"\nMerged {merged_chunks} chunks")
+print(f"Total enriched: {total_rows} companies")
 print(f"✓ Merged output saved to: {OUTPUT_FILE}")
@@ -10,7 +10,7 @@ This script implements Phase 2 (Stage-B) from the V4.3 methodology:
 - BPG Website preservation (canonical ground truth)
 
 Usage:
-    python3 merge_company_sources.py
+    python3 merge_company_sources.py [--unsorted]
 
 Inputs:
     data/working/bpg_ca_raw.csv          (BioPharmGuy CA-wide extraction)
@@ -26,11 +26,17 @@ Date: January 2025
 Version: V4.3 Stage-B
 """
 
+import argparse
 import csv
+import re
 import sys
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import attrgetter
+
+import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -38,7 +44,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import V4.3 modules
 # Using CA-wide geography for broader coverage
 from config.geography_ca import is_in_bay_area_city, is_valid_county
-from utils.helpers import etld1, normalize_name, is_aggregator, AGGREGATOR_ETLD1
+from utils.helpers import etld1, normalize_name, AGGREGATOR_ETLD1
 
 # ============================================================================
 # Constants
@@ -50,16 +56,94 @@ ALLOWLIST_DOMAINS = {
     'gene.com',  # Genentech parent domain for multiple brands
 }
 
+# Dedup source priority: BPG (ground truth) > Existing > Wikipedia
+SOURCE_PRIORITY = {'BPG': 1, 'Existing': 2, 'Wikipedia': 3}
+UNKNOWN_SOURCE_PRIORITY = 99
+
+# Wikipedia meta entries and non-companies, matched against lowercased names
+WIKIPEDIA_SKIP_KEYWORDS = [
+    'list of', 'category:', 'companies based in', 'biotechnology industry',
+    'by county', 'by city', 'wikipedia', 'portal:',
+]
+WIKIPEDIA_SKIP_RE = re.compile('|'.join(map(re.escape, WIKIPEDIA_SKIP_KEYWORDS)))
+
+# 1 MB file buffers: fewer read/write syscalls on multi-MB CSVs
+IO_BUFFER_SIZE = 1 << 20
+
 # Final schema columns
 FINAL_COLUMNS = [
     'Company Name', 'Website', 'City', 'Address',
     'Company Stage', 'Focus Areas', 'Description', 'Validation_Source'
 ]
 
+# ============================================================================
+# Company Record
+# ============================================================================
+
+class Company:
+    """
+    One company row from a source, carried through dedup/geofence/output.
+
+    Uses __slots__ rather than a per-row dict: merges hold every company from
+    all three sources in memory at once.
+    """
+
+    __slots__ = ('name', 'website', 'city', 'address', 'stage', 'focus', 'description', 'source')
+
+    def __init__(self, name, website='', city='', address='', stage='', focus='',
+                 description='', source=''):
+        self.name = name
+        self.website = website
+        self.city = city
+        self.address = address
+        self.stage = stage
+        self.focus = focus
+        self.description = description
+        self.source = source
+
+    def __repr__(self):
+        return f"Company({self.name!r}, website={self.website!r}, city={self.city!r}, source={self.source!r})"
+
+
 # ============================================================================
 # Loading Functions
 # ============================================================================
 
+def _read_source_columns(filepath, columns):
+    """
+    Read the given columns of a source CSV as stripped strings.
+
+    Columns missing from the file come back as ''. 'Company Name' is required
+    whenever the file has data rows; an empty or header-only file loads as an
+    empty frame.
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as f:
+        try:
+            df = pd.read_csv(
+                f,
+                dtype=str,
+                keep_default_na=False,
+                index_col=False,
+                usecols=lambda column: column in columns,
+            )
+        except pd.errors.EmptyDataError:
+            # Zero-byte file: no header and no rows
+            df = pd.DataFrame()
+
+        if 'Company Name' not in df.columns:
+            # The frame cannot tell us whether rows were read when no wanted
+            # column matched, so look for a non-blank line after the header
+            f.seek(0)
+            next(f, None)
+            if any(line.strip() for line in f):
+                raise ValueError(f"'Company Name' column not found in {filepath}")
+
+    df = df.reindex(columns=columns, fill_value='').fillna('')
+    for column in columns:
+        df[column] = df[column].str.strip()
+    return df
+
+
 def load_bpg_companies(filepath):
     """
     Load BioPharmGuy CA-wide companies.
@@ -71,23 +155,15 @@ def load_bpg_companies(filepath):
         print(f"Warning: {filepath} not found, skipping BPG source")
         return companies
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Clean up city - remove trailing commas and whitespace
-            city = row.get('City', '').strip()
-            if city.endswith(','):
-                city = city[:-1].strip()
-
-            companies.append({
-                'Company Name': row['Company Name'].strip(),
-                'Website': row.get('Website', '').strip(),
-                'City': city,
-                'Address': '',
-                'Company Stage': '',
-                'Focus Areas': row.get('Focus Area', '').strip(),
-                'source': 'BPG'
-            })
+    df = _read_source_columns(filepath, ['Company Name', 'Website', 'City', 'Focus Area'])
+
+    # Clean up city - remove trailing commas and whitespace
+    cities = df['City'].str.replace(r',$', '', regex=True).str.strip()
+
+    companies = [
+        Company(name, website=website, city=city, focus=focus, source='BPG')
+        for name, website, city, focus in zip(df['Company Name'], df['Website'], cities, df['Focus Area'])
+    ]
 
     print(f"Loaded {len(companies)} companies from BPG (CA-wide, unfiltered)")
     return companies
@@ -100,27 +176,21 @@ def load_wikipedia_companies(filepath):
         print(f"Warning: {filepath} not found, skipping Wikipedia source")
         return companies
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            company_name = row['Company Name'].strip()
+    df = _read_source_columns(filepath, ['Company Name', 'Website', 'City', 'Description'])
 
-            # Skip meta entries and non-companies
-            skip_keywords = ['list of', 'category:', 'companies based in', 'biotechnology industry',
-                           'by county', 'by city', 'wikipedia', 'portal:']
-            if any(keyword in company_name.lower() for keyword in skip_keywords):
-                continue
+    # Skip meta entries and non-companies
+    df = df[~df['Company Name'].str.lower().str.contains(WIKIPEDIA_SKIP_RE)]
 
-            companies.append({
-                'Company Name': company_name,
-                'Website': row.get('Website', '').strip(),  # Now we have websites from Wikipedia
-                'City': row.get('City', '').strip(),
-                'Address': '',
-                'Company Stage': '',
-                'Focus Areas': '',
-                'Description': row.get('Description', '').strip(),  # Preserve Wikipedia description
-                'source': 'Wikipedia'
-            })
+    companies = [
+        Company(
+            name,
+            website=website,  # Now we have websites from Wikipedia
+            city=city,
+            description=description,  # Preserve Wikipedia description
+            source='Wikipedia',
+        )
+        for name, website, city, description in zip(df['Company Name'], df['Website'], df['City'], df['Description'])
+    ]
 
     print(f"Loaded {len(companies)} companies from Wikipedia")
     return companies
@@ -133,18 +203,18 @@ def load_existing_companies(filepath):
         print(f"Note: {filepath} not found, starting fresh (no existing companies)")
         return companies
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            companies.append({
-                'Company Name': row['Company Name'].strip(),
-                'Website': row.get('Website', '').strip(),
-                'City': row.get('City', '').strip(),
-                'Address': row.get('Address', '').strip(),
-                'Company Stage': row.get('Company Stage', '').strip(),
-                'Focus Areas': row.get('Focus Areas', '').strip(),
-                'source': 'Existing'
-            })
+    df = _read_source_columns(
+        filepath,
+        ['Company Name', 'Website', 'City', 'Address', 'Company Stage', 'Focus Areas'],
+    )
+
+    companies = [
+        Company(name, website=website, city=city, address=address, stage=stage, focus=focus, source='Existing')
+        for name, website, city, address, stage, focus in zip(
+            df['Company Name'], df['Website'], df['City'],
+            df['Address'], df['Company Stage'], df['Focus Areas'],
+        )
+    ]
 
     print(f"Loaded {len(companies)} companies from existing dataset")
     return companies
@@ -163,12 +233,15 @@ def check_and_reset_aggregators(companies):
     aggregator_count = 0
 
     for company in companies:
-        website = company.get('Website', '').strip()
+        website = company.website.strip()
+        if not website:
+            continue
 
-        if website and is_aggregator(website):
-            print(f"  WARNING: Aggregator detected for '{company['Company Name']}': {website}")
+        # etld1 is memoized, so the dedup pass reuses this parse
+        if etld1(website) in AGGREGATOR_ETLD1:
+            print(f"  WARNING: Aggregator detected for '{company.name}': {website}")
             print(f"           Resetting Website to '' (will route to Path B enrichment)")
-            company['Website'] = ''
+            company.website = ''
             aggregator_count += 1
 
     return companies, aggregator_count
@@ -189,12 +262,19 @@ def deduplicate_by_etld1_and_name(companies):
 
     Returns: deduplicated companies, domain reuse conflicts
     """
-    # Build index: (etld1, normalized_name) -> list of companies
-    dedup_index = defaultdict(list)
+    # Single pass: keep only the current best company per
+    # (etld1, normalized_name) key, prefer BPG > Existing > Wikipedia
+    winner_by_key = {}
+    variants = {}  # key -> names of all companies that collided on it
+    domain_conflicts = defaultdict(list)  # etld1 -> list of company names
+
+    # Check for domain reuse as we go: same eTLD+1 used by different
+    # companies (different normalized names)
+    domain_usage = defaultdict(set)  # etld1 -> set of normalized company names
 
     for company in companies:
-        website = company.get('Website', '').strip()
-        name = company.get('Company Name', '').strip()
+        website = company.website.strip()
+        name = company.name.strip()
 
         # Extract eTLD+1 (empty string if no website)
         domain = etld1(website) if website else ''
@@ -202,54 +282,40 @@ def deduplicate_by_etld1_and_name(companies):
         # Normalize name
         norm_name = normalize_name(name)
 
-        # Create dedup key
-        # If no website, use just normalized name
-        # If website, use (etld1, normalized_name)
-        if domain:
-            key = (domain, norm_name)
+        # Create dedup key: "etld1\x00normalized_name" as one interned string
+        # (cheaper to hash than a tuple; NUL cannot occur in either part)
+        # Companies without websites get an empty domain part, so they are
+        # keyed on name only and never collide with a company that has one
+        key = sys.intern(f"{domain}\x00{norm_name}")
+
+        current = winner_by_key.get(key)
+        if current is None:
+            winner_by_key[key] = company
         else:
-            # Companies without websites get unique keys based on name only
-            # We'll still check for name collisions separately
-            key = ('__no_website__', norm_name)
+            if key not in variants:
+                variants[key] = [current.name]
+            variants[key].append(company.name)
 
-        dedup_index[key].append(company)
+            # Strictly better priority only, so ties keep the first seen
+            if (SOURCE_PRIORITY.get(company.source, UNKNOWN_SOURCE_PRIORITY)
+                    >= SOURCE_PRIORITY.get(current.source, UNKNOWN_SOURCE_PRIORITY)):
+                continue
 
-    # Deduplicate: prefer BPG > Existing > Wikipedia
-    deduplicated = []
-    domain_conflicts = defaultdict(list)  # etld1 -> list of company names
+            winner_by_key[key] = company
+            if domain and domain not in ALLOWLIST_DOMAINS:
+                domain_usage[domain].discard((norm_name, current.name))
 
-    for key, company_list in dedup_index.items():
-        domain_part, name_part = key
+        if domain and domain not in ALLOWLIST_DOMAINS:
+            domain_usage[domain].add((norm_name, company.name))
 
-        if len(company_list) == 1:
-            # No conflict, keep the company
-            deduplicated.append(company_list[0])
-        else:
-            # Multiple companies with same (etld1, normalized_name)
-            # Sort by priority: BPG > Existing > Wikipedia
-            priority_order = {'BPG': 1, 'Existing': 2, 'Wikipedia': 3}
-            sorted_companies = sorted(company_list, key=lambda c: priority_order.get(c['source'], 99))
-
-            # Keep the highest priority one
-            winner = sorted_companies[0]
-            deduplicated.append(winner)
-
-            # If they have different actual names, log the merge
-            unique_names = set(c['Company Name'] for c in company_list)
-            if len(unique_names) > 1:
-                print(f"  Merged {len(company_list)} variants: {', '.join(unique_names)} -> '{winner['Company Name']}' (from {winner['source']})")
-
-    # Now check for domain reuse: same eTLD+1 used by different companies
-    # (different normalized names)
-    domain_usage = defaultdict(set)  # etld1 -> set of normalized company names
+    deduplicated = list(winner_by_key.values())
 
-    for company in deduplicated:
-        website = company.get('Website', '').strip()
-        if website:
-            domain = etld1(website)
-            if domain and domain not in ALLOWLIST_DOMAINS:
-                norm_name = normalize_name(company['Company Name'])
-                domain_usage[domain].add((norm_name, company['Company Name']))
+    # If merged variants have different actual names, log the merge
+    for key, names in variants.items():
+        unique_names = set(names)
+        if len(unique_names) > 1:
+            winner = winner_by_key[key]
+            print(f"  Merged {len(names)} variants: {', '.join(unique_names)} -> '{winner.name}' (from {winner.source})")
 
     # Find conflicts: domains used by >1 company
     for domain, name_set in domain_usage.items():
@@ -279,8 +345,8 @@ def apply_geofence(companies):
     rejected_count = 0
 
     for company in companies:
-        city = company.get('City', '').strip()
-        source = company.get('source', '')
+        city = company.city.strip()
+        source = company.source
 
         # Check if in California (using CA-wide geography)
         if city and is_in_bay_area_city(city):  # This now uses CA-wide check
@@ -291,7 +357,7 @@ def apply_geofence(companies):
         else:
             rejected_count += 1
             # Optionally log rejections (can be verbose)
-            # print(f"  Filtered out: '{company['Company Name']}' in {city} (not in California)")
+            # print(f"  Filtered out: '{company.name}' in {city} (not in California)")
 
     print(f"\nGeofence filtering (California-wide + Wikipedia):")
     print(f"  - Passed CA geofence: {len(filtered)}")
@@ -348,35 +414,51 @@ def generate_domain_reuse_report(conflicts, output_path):
 # Output
 # ============================================================================
 
-def save_companies(companies, filepath):
-    """Save merged companies to CSV (staging output only)."""
+def save_companies(companies, filepath, sort=True):
+    """
+    Save merged companies to CSV (staging output only).
+
+    companies may be any iterable. With sort=False rows are streamed to disk
+    in merge order, skipping the in-memory sort for callers that don't need
+    name-ordered output.
+
+    Returns: number of companies written
+    """
     # Validate output path is in working/ directory
     if 'working' not in str(filepath):
         raise ValueError(f"Output path must be in working/ directory, got: {filepath}")
 
-    # Sort by company name
-    companies.sort(key=lambda x: x['Company Name'])
+    # Sort by company name (needs the full list in memory)
+    if sort:
+        if not isinstance(companies, list):
+            companies = list(companies)
+        companies.sort(key=attrgetter('name'))
 
     # Ensure directory exists
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=FINAL_COLUMNS)
-        writer.writeheader()
+    saved_count = 0
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(FINAL_COLUMNS)
 
+        # Positional rows in FINAL_COLUMNS order
         for company in companies:
-            writer.writerow({
-                'Company Name': company['Company Name'],
-                'Website': company.get('Website', ''),
-                'City': company.get('City', ''),
-                'Address': company.get('Address', ''),
-                'Company Stage': company.get('Company Stage', ''),
-                'Focus Areas': company.get('Focus Areas', ''),
-                'Description': company.get('Description', ''),  # Include Wikipedia description
-                'Validation_Source': company.get('source', '')
-            })
+            writer.writerow((
+                company.name,
+                company.website,
+                company.city,
+                company.address,
+                company.stage,
+                company.focus,
+                company.description,  # Include Wikipedia description
+                company.source,  # Validation_Source
+            ))
+            saved_count += 1
+
+    print(f"\n✓ Saved {saved_count} companies to: {filepath}")
 
-    print(f"\n✓ Saved {len(companies)} companies to: {filepath}")
+    return saved_count
 
 
 # ============================================================================
@@ -385,6 +467,11 @@ def save_companies(companies, filepath):
 
 def main():
     """Main merge workflow with V4.3 deduplication and geofencing."""
+    parser = argparse.ArgumentParser(description='Merge company sources with V4.3 deduplication and geofencing')
+    parser.add_argument('--unsorted', action='store_true',
+                        help='Write companies in merge order instead of sorting by name')
+    args = parser.parse_args()
+
     print("="*70)
     print("Company Data Merge - V4.3 Stage-B")
     print("="*70)
@@ -398,11 +485,16 @@ def main():
     output_file = data_dir / 'working' / 'companies_merged.csv'
     report_file = data_dir / 'working' / 'domain_reuse_report.txt'
 
-    # Load all sources
+    # Load all sources (independent files, so read them concurrently)
     print("Loading data sources...")
-    bpg_companies = load_bpg_companies(bpg_file)
-    wikipedia_companies = load_wikipedia_companies(wikipedia_file)
-    existing_companies = load_existing_companies(existing_file)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        bpg_future = executor.submit(load_bpg_companies, bpg_file)
+        wikipedia_future = executor.submit(load_wikipedia_companies, wikipedia_file)
+        existing_future = executor.submit(load_existing_companies, existing_file)
+
+        bpg_companies = bpg_future.result()
+        wikipedia_companies = wikipedia_future.result()
+        existing_companies = existing_future.result()
 
     # Combine all sources
     all_companies = bpg_companies + existing_companies + wikipedia_companies
@@ -431,7 +523,7 @@ def main():
 
     # Save merged output
     print("\nSaving merged companies...")
-    save_companies(geofenced, output_file)
+    save_companies(geofenced, output_file, sort=not args.unsorted)
 
     # Summary
     print("\n" + "="*70)
@@ -447,7 +539,7 @@ def main():
 
     # Coverage stats
     if len(geofenced) > 0:
-        with_website = sum(1 for c in geofenced if c.get('Website', '').strip())
+        with_website = sum(1 for c in geofenced if c.website.strip())
         without_website = len(geofenced) - with_website
         print(f"\n  Coverage:")
         print(f"    - With Website: {with_website} ({100*with_website/len(geofenced):.1f}%)")
@@ -463,6 +555,10 @@ def main():
     print(f"  3. Run Path B enrichment on companies without Website")
     print()
 
+    # Release memoized domain/name lookups now that the merge is done
+    etld1.cache_clear()
+    normalize_name.cache_clear()
+
     # Exit with error if domain conflicts detected (blocks promotion)
     if not no_conflicts:
         print("⚠ WARNING: Domain conflicts detected! Review and resolve before proceeding.")
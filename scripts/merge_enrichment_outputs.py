@@ -14,10 +14,14 @@ Author: Bay Area Biotech Map V4.3
 Date: 2025-11-16
 """
 
-import csv
 import sys
 from pathlib import Path
-from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.helpers import atomic_write
 
 # ============================================================================
 # Configuration
@@ -31,11 +35,45 @@ PATH_A_FILE = WORKING_DIR / "companies_enriched_path_a.csv"
 PATH_B_FILE = WORKING_DIR / "companies_enriched_path_b.csv"
 OUTPUT_FILE = WORKING_DIR / "companies_enriched.csv"
 
+# Output schema, in column order
+STANDARD_FIELDS = [
+    'Company Name',
+    'Website',
+    'City',
+    'Address',
+    'Company Stage',
+    'Focus Areas',
+    'Validation_Source',
+    'Place_ID',
+    'Confidence',
+    'Validation_Notes',
+]
+
 
 # ============================================================================
 # Merge Logic
 # ============================================================================
 
+def load_frame(file_path: Path) -> pd.DataFrame:
+    """
+    Load CSV file into a DataFrame of strings.
+
+    Args:
+        file_path: Path to CSV file
+
+    Returns:
+        DataFrame with one column per header field (empty if the file is missing)
+    """
+    if not file_path.exists():
+        return pd.DataFrame()
+
+    try:
+        return pd.read_csv(file_path, dtype=str, keep_default_na=False,
+                           index_col=False, encoding='utf-8')
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
 def load_csv(file_path: Path) -> list:
     """
     Load CSV file into list of dicts.
@@ -46,16 +84,55 @@ def load_csv(file_path: Path) -> list:
     Returns:
         List of row dicts
     """
-    if not file_path.exists():
-        return []
+    return load_frame(file_path).to_dict('records')
 
-    rows = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
 
-    return rows
+def deduplicate_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deduplicate a DataFrame of companies by Company Name, column-wise.
+
+    Same preference order as deduplicate_companies; rows lacking a field
+    (NaN) count as empty.
+
+    Args:
+        df: DataFrame of companies
+
+    Returns:
+        Deduplicated rows (in order of each name's first occurrence)
+    """
+    if 'Company Name' not in df.columns:
+        return df.iloc[:0]
+
+    # Group by company name (case-insensitive)
+    name_key = df['Company Name'].fillna('').astype(str).str.strip().str.lower()
+
+    # Confidence, falling back to Confidence_Det only when the row has no
+    # Confidence field at all; blank or unparseable values count as 0.0
+    confidence = df['Confidence'] if 'Confidence' in df.columns else pd.Series(np.nan, index=df.index)
+    if 'Confidence_Det' in df.columns:
+        confidence = confidence.where(confidence.notna(), df['Confidence_Det'])
+    confidence = pd.to_numeric(confidence.fillna('').astype(str).str.strip(), errors='coerce').fillna(0.0)
+
+    # Completeness: number of non-empty fields in the row
+    completeness = (df.fillna('').astype(str).apply(lambda column: column.str.strip()) != '').sum(axis=1)
+
+    ranked = pd.DataFrame({
+        'name_key': name_key.to_numpy(),
+        'confidence': confidence.to_numpy(),
+        'completeness': completeness.to_numpy(),
+        'order': np.arange(len(df)),
+    })
+    ranked = ranked[ranked['name_key'] != '']
+    ranked['first_seen'] = ranked.groupby('name_key')['order'].transform('min')
+
+    # Prefer higher confidence, then more complete data, then first occurrence
+    winners = ranked.sort_values(
+        ['name_key', 'confidence', 'completeness', 'order'],
+        ascending=[True, False, False, True],
+        kind='stable',
+    ).drop_duplicates('name_key', keep='first')
+
+    return df.iloc[winners.sort_values('first_seen')['order'].to_numpy()]
 
 
 def deduplicate_companies(companies: list) -> list:
@@ -73,51 +150,51 @@ def deduplicate_companies(companies: list) -> list:
     Returns:
         Deduplicated list
     """
-    # Group by company name (case-insensitive)
-    by_name = {}
+    if not companies:
+        return []
 
-    for company in companies:
-        name = company.get('Company Name', '').strip()
-        if not name:
-            continue
+    # One column per field seen in any row; fields a row lacks are NaN
+    df = pd.DataFrame.from_records(companies)
+    df.index = np.arange(len(df))
 
-        name_key = name.lower()
+    # Return deduplicated list (the original dicts, not rebuilt rows)
+    return [companies[i] for i in deduplicate_frame(df).index]
 
-        if name_key not in by_name:
-            by_name[name_key] = company
-        else:
-            # Compare with existing
-            existing = by_name[name_key]
 
-            # Prefer higher confidence (check both Confidence and Confidence_Det)
-            existing_conf = float(existing.get('Confidence', existing.get('Confidence_Det', '0.0')) or '0.0')
-            new_conf = float(company.get('Confidence', company.get('Confidence_Det', '0.0')) or '0.0')
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a DataFrame of companies to STANDARD_FIELDS, column-wise.
 
-            if new_conf > existing_conf:
-                by_name[name_key] = company
-            elif new_conf == existing_conf:
-                # Prefer more complete data
-                existing_fields = sum(1 for v in existing.values() if v and v.strip())
-                new_fields = sum(1 for v in company.values() if v and v.strip())
+    Rows lacking a field (NaN) get ''. Confidence falls back to
+    Confidence_Det when a row has no Confidence field; Validation_Notes
+    comes from Validation_Reason for PathA rows and Validation_JSON otherwise.
 
-                if new_fields > existing_fields:
-                    by_name[name_key] = company
+    Args:
+        df: Company rows, one column per field
 
-    # Return deduplicated list (preserve original order as much as possible)
-    seen_names = set()
-    deduplicated = []
+    Returns:
+        DataFrame with exactly the STANDARD_FIELDS columns
+    """
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
 
-    for company in companies:
-        name = company.get('Company Name', '').strip()
-        if not name:
-            continue
+    # Map Confidence_Det to Confidence if needed
+    confidence = column('Confidence').where(column('Confidence').notna(), column('Confidence_Det'))
 
-        name_key = name.lower()
-        if name_key not in seen_names:
-            deduplicated.append(by_name[name_key])
-            seen_names.add(name_key)
+    # Map Validation_Reason to notes if PathA
+    validation_source = column('Validation_Source').fillna('')
+    validation_notes = np.where(
+        validation_source == 'PathA',
+        column('Validation_Reason').fillna(''),
+        column('Validation_JSON').fillna(''),
+    )
 
-    return deduplicated
+    normalized = df.reindex(columns=STANDARD_FIELDS)
+    normalized['Validation_Source'] = validation_source
+    normalized['Confidence'] = confidence
+    normalized['Validation_Notes'] = validation_notes
+
+    return normalized.fillna('')
 
 
 def normalize_fields(companies: list) -> list:
@@ -142,35 +219,10 @@ def normalize_fields(companies: list) -> list:
     Returns:
         Normalized list
     """
-    normalized = []
-
-    for company in companies:
-        # Map Confidence_Det to Confidence if needed
-        confidence = company.get('Confidence', company.get('Confidence_Det', ''))
-
-        # Map Validation_Reason to notes if PathA
-        validation_source = company.get('Validation_Source', '')
-        if validation_source == 'PathA':
-            validation_notes = company.get('Validation_Reason', '')
-        else:
-            validation_notes = company.get('Validation_JSON', '')
-
-        normalized_row = OrderedDict([
-            ('Company Name', company.get('Company Name', '')),
-            ('Website', company.get('Website', '')),
-            ('City', company.get('City', '')),
-            ('Address', company.get('Address', '')),
-            ('Company Stage', company.get('Company Stage', '')),
-            ('Focus Areas', company.get('Focus Areas', '')),
-            ('Validation_Source', validation_source),
-            ('Place_ID', company.get('Place_ID', '')),
-            ('Confidence', confidence),
-            ('Validation_Notes', validation_notes)
-        ])
-
-        normalized.append(normalized_row)
+    if not companies:
+        return []
 
-    return normalized
+    return normalize_frame(pd.DataFrame.from_records(companies)).to_dict('records')
 
 
 # ============================================================================
@@ -186,15 +238,15 @@ def main():
 
     # Load Path A
     print(f"Loading Path A from: {PATH_A_FILE}")
-    path_a_companies = load_csv(PATH_A_FILE)
+    path_a_companies = load_frame(PATH_A_FILE)
     print(f"  Loaded {len(path_a_companies)} Path A companies")
 
     # Load Path B
     print(f"Loading Path B from: {PATH_B_FILE}")
-    path_b_companies = load_csv(PATH_B_FILE)
+    path_b_companies = load_frame(PATH_B_FILE)
     print(f"  Loaded {len(path_b_companies)} Path B companies")
 
-    if not path_a_companies and not path_b_companies:
+    if len(path_a_companies) == 0 and len(path_b_companies) == 0:
         print()
         print("Error: No companies found in either Path A or Path B outputs")
         print("Run enrich_with_google_maps.py and path_b_enrichment.py first")
@@ -202,20 +254,23 @@ def main():
 
     print()
 
-    # Combine
-    all_companies = path_a_companies + path_b_companies
+    # Combine (fields missing from one source are NaN in its rows)
+    all_companies = pd.concat(
+        [frame for frame in (path_a_companies, path_b_companies) if len(frame)],
+        ignore_index=True, sort=False,
+    )
     print(f"Combined: {len(all_companies)} total companies")
 
     # Deduplicate
     print("Deduplicating by Company Name...")
-    deduplicated = deduplicate_companies(all_companies)
+    deduplicated = deduplicate_frame(all_companies)
     duplicates_removed = len(all_companies) - len(deduplicated)
     print(f"  Removed {duplicates_removed} duplicates")
     print(f"  Remaining: {len(deduplicated)} unique companies")
 
     # Normalize
     print("Normalizing fields...")
-    normalized = normalize_fields(deduplicated)
+    normalized = normalize_frame(deduplicated)
     print(f"  Normalized {len(normalized)} companies")
 
     print()
@@ -223,12 +278,8 @@ def main():
     # Write output
     WORKING_DIR.mkdir(parents=True, exist_ok=True)
 
-    fieldnames = list(normalized[0].keys()) if normalized else []
-
-    with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(normalized)
+    with atomic_write(OUTPUT_FILE, encoding='utf-8', newline='') as f:
+        normalized.to_csv(f, index=False, lineterminator='\r\n')
 
     print(f"✓ Wrote {len(normalized)} companies to: {OUTPUT_FILE}")
     print()
@@ -244,8 +295,8 @@ def main():
     print(f"Final unique companies: {len(normalized)}")
 
     # Breakdown by source
-    path_a_count = sum(1 for c in normalized if c.get('Validation_Source') == 'PathA')
-    path_b_count = sum(1 for c in normalized if c.get('Validation_Source') == 'PathB')
+    path_a_count = int((normalized['Validation_Source'] == 'PathA').sum())
+    path_b_count = int((normalized['Validation_Source'] == 'PathB').sum())
 
     print()
     print("By Source:")
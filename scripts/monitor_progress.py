@@ -1,14 +1,62 @@
 #!/usr/bin/env python3
 """Monitor enrichment progress in real-time."""
 
+import os
 import time
-import csv
+import threading
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Optional: without watchdog we fall back to polling every POLL_INTERVAL seconds
+    Observer = None
+    FileSystemEventHandler = object
+
 CHUNKS_DIR = Path("data/working/chunks")
 TOTAL_COMPANIES = 1941
 NUM_WORKERS = 16
+POLL_INTERVAL = 10  # seconds between refreshes when no file events arrive
+IO_BUFFER_SIZE = 1 << 20  # read appended bytes in 1 MB blocks
+
+# Per-file line counts, advanced by reading only bytes appended since the last tick:
+# path -> (inode, mtime_ns, bytes read so far, newlines seen so far)
+line_state = {}
+
+
+def count_rows(chunk_file):
+    """Return data rows in chunk_file, reading only what was appended since the last call."""
+    # Unbuffered: we already read in large blocks
+    with open(chunk_file, 'rb', buffering=0) as f:
+        # fstat the open file so the stat and the bytes read come from the same inode
+        stat = os.fstat(f.fileno())
+        inode, mtime_ns, offset, lines = line_state.get(chunk_file, (None, None, 0, 0))
+        if (stat.st_ino != inode or stat.st_size < offset
+                or (stat.st_size == offset and stat.st_mtime_ns != mtime_ns)):
+            # Replaced (os.replace gives a new inode), truncated, or rewritten
+            # in place without growing: the bytes already counted may be gone
+            offset, lines = 0, 0
+
+        f.seek(offset)
+        for block in iter(lambda: f.read(IO_BUFFER_SIZE), b''):
+            lines += block.count(b'\n')
+            offset += len(block)
+
+    line_state[chunk_file] = (stat.st_ino, stat.st_mtime_ns, offset, lines)
+    return max(lines - 1, 0)  # Subtract header
+
+
+class ChunkChangeHandler(FileSystemEventHandler):
+    """Wake the monitor loop as soon as any chunk file changes."""
+
+    def __init__(self, changed):
+        self.changed = changed
+
+    def on_any_event(self, event):
+        self.changed.set()
+
 
 print("=" * 70)
 print("LIVE ENRICHMENT PROGRESS MONITOR")
@@ -19,40 +67,53 @@ print()
 
 start_time = time.time()
 
-while True:
-    # Count enriched files and companies
-    enriched_files = list(CHUNKS_DIR.glob("chunk_*_enriched.csv"))
-    total_enriched = 0
-
-    worker_status = []
-    for i in range(NUM_WORKERS):
-        chunk_file = CHUNKS_DIR / f"chunk_{i}_enriched.csv"
-        if chunk_file.exists():
-            with open(chunk_file, 'r', encoding='utf-8') as f:
-                count = sum(1 for _ in f) - 1  # Subtract header
+# Refresh on file events when watchdog is available, otherwise on a timer
+changed = threading.Event()
+observer = None
+if Observer is not None and CHUNKS_DIR.exists():
+    observer = Observer()
+    observer.schedule(ChunkChangeHandler(changed), str(CHUNKS_DIR), recursive=False)
+    observer.start()
+
+try:
+    while True:
+        # Count enriched files and companies
+        enriched_files = list(CHUNKS_DIR.glob("chunk_*_enriched.csv"))
+        total_enriched = 0
+
+        worker_status = []
+        for i in range(NUM_WORKERS):
+            chunk_file = CHUNKS_DIR / f"chunk_{i}_enriched.csv"
+            if chunk_file.exists():
+                count = count_rows(chunk_file)
                 total_enriched += count
                 worker_status.append(f"W{i:02d}: ✓ ({count})")
-        else:
-            worker_status.append(f"W{i:02d}: ...")
-
-    # Calculate progress
-    completed_workers = len(enriched_files)
-    progress_pct = (total_enriched / TOTAL_COMPANIES * 100) if TOTAL_COMPANIES > 0 else 0
-    elapsed = time.time() - start_time
-
-    # Clear screen (for terminal) and show status
-    print(f"\r\033[K[{datetime.now().strftime('%H:%M:%S')}] "
-          f"Workers: {completed_workers}/{NUM_WORKERS} | "
-          f"Enriched: {total_enriched}/{TOTAL_COMPANIES} ({progress_pct:.1f}%) | "
-          f"Elapsed: {int(elapsed)}s", end='', flush=True)
-
-    # Check if complete
-    if completed_workers == NUM_WORKERS:
-        print("\n\n✓ All workers completed!")
-        print("=" * 70)
-        print(f"Total enriched: {total_enriched} companies")
-        print(f"Total time: {int(elapsed)}s ({elapsed/60:.1f} minutes)")
-        print("=" * 70)
-        break
-
-    time.sleep(10)
+            else:
+                worker_status.append(f"W{i:02d}: ...")
+
+        # Calculate progress
+        completed_workers = len(enriched_files)
+        progress_pct = (total_enriched / TOTAL_COMPANIES * 100) if TOTAL_COMPANIES > 0 else 0
+        elapsed = time.time() - start_time
+
+        # Clear screen (for terminal) and show status
+        print(f"\r\033[K[{datetime.now().strftime('%H:%M:%S')}] "
+              f"Workers: {completed_workers}/{NUM_WORKERS} | "
+              f"Enriched: {total_enriched}/{TOTAL_COMPANIES} ({progress_pct:.1f}%) | "
+              f"Elapsed: {int(elapsed)}s", end='', flush=True)
+
+        # Check if complete
+        if completed_workers == NUM_WORKERS:
+            print("\n\n✓ All workers completed!")
+            print("=" * 70)
+            print(f"Total enriched: {total_enriched} companies")
+            print(f"Total time: {int(elapsed)}s ({elapsed/60:.1f} minutes)")
+            print("=" * 70)
+            break
+
+        changed.wait(POLL_INTERVAL)
+        changed.clear()
+finally:
+    if observer is not None:
+        observer.stop()
+        observer.join()
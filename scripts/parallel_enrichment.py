@@ -1,28 +1,124 @@
 #!/usr/bin/env python3
 """
 Parallel Google Maps enrichment coordinator.
-Splits remaining companies into chunks and processes them in parallel.
+Splits remaining companies into per-worker byte ranges of the input CSV and
+processes them in parallel.
 """
 
 import csv
+import io
 import json
+import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # Optional: without orjson, checkpoint and config JSON go through the stdlib json module
+    orjson = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.helpers import atomic_write
+
 # Configuration
 NUM_WORKERS = 16
 CHECKPOINT_FILE = Path("data/working/.checkpoint_enrichment.json")
 INPUT_CSV = Path("data/working/companies_merged.csv")
 CHUNK_DIR = Path("data/working/chunks")
 
+# 1 MB file buffers: fewer read syscalls when scanning the input CSV
+IO_BUFFER_SIZE = 1 << 20
+
+
+def read_json(path):
+    """Parse a JSON file (checkpoint or worker config), using orjson when installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    """Atomically write data as compact JSON, using orjson when installed."""
+    if orjson is not None:
+        with atomic_write(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
+        with atomic_write(path) as f:
+            json.dump(data, f)
+
+
+def scan_records(f):
+    """
+    Yield (byte_offset, row) for every non-blank row of a binary CSV stream.
+
+    csv.reader does the parsing, so quoted fields spanning several lines are
+    handled; its line_num maps each row back to the byte offset it started at.
+    """
+    line_offsets = [f.tell()]
+
+    def lines():
+        for line in iter(f.readline, b''):
+            line_offsets.append(line_offsets[-1] + len(line))
+            yield line.decode('utf-8')
+
+    reader = csv.reader(lines())
+    consumed = 0
+    for row in reader:
+        start = line_offsets[consumed]
+        consumed = reader.line_num
+        if row:
+            yield start, row
+
+
+def load_worker_rows(worker):
+    """
+    Load the companies assigned to one worker from worker_config.json.
+
+    Byte-range entries are read straight from the input CSV: seek to
+    byte_start, parse up to byte_end, and keep the rows whose original index
+    is listed for the worker. Entries with a chunk_file (as written by
+    resume_enrichment.py) are read from that file.
+
+    Raises:
+        ValueError: If the input CSV's size or mtime differs from when the
+            config was written, so the byte ranges no longer match its rows
+    """
+    if 'chunk_file' in worker:
+        with open(worker['chunk_file'], 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+            return list(csv.DictReader(f))
+
+    # One read of the whole slice, so skip the intermediate buffer
+    with open(worker['input_file'], 'rb', buffering=0) as f:
+        stat = os.fstat(f.fileno())
+        if (stat.st_size, stat.st_mtime_ns) != (worker.get('input_size'), worker.get('input_mtime_ns')):
+            raise ValueError(
+                f"{worker['input_file']} changed since worker_config.json was written; "
+                "rerun parallel_enrichment.py"
+            )
+        f.seek(worker['byte_start'])
+        data = f.read(worker['byte_end'] - worker['byte_start'])
+
+    wanted = set(worker['indices'])
+    reader = csv.DictReader(io.StringIO(data.decode('utf-8'), newline=None),
+                            fieldnames=worker['header'])
+    companies = []
+    for idx, company in enumerate(reader, start=worker['start_index']):
+        if idx in wanted:
+            company['original_index'] = idx
+            companies.append(company)
+    return companies
+
+
 def main():
     # Load and validate checkpoint file
     processed_indices = set()
 
     try:
         if CHECKPOINT_FILE.exists():
-            with open(CHECKPOINT_FILE, 'r') as f:
-                checkpoint_data = json.load(f)
+            checkpoint_data = read_json(CHECKPOINT_FILE)
 
             # Validate checkpoint structure
             if not isinstance(checkpoint_data, dict):
@@ -58,33 +154,37 @@ def main():
             CHECKPOINT_FILE.rename(backup_path)
             print(f"Corrupted checkpoint backed up to: {backup_path}")
 
-    # Load all companies
-    with open(INPUT_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        all_companies = list(reader)
-
-    total_companies = len(all_companies)
+    # Scan the input once, recording where each row starts instead of
+    # copying rows out into per-worker chunk files
+    offsets = []
+    unprocessed = []
+    with open(INPUT_CSV, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        # Workers check these before trusting the byte offsets
+        input_stat = os.fstat(f.fileno())
+        records = scan_records(f)
+        _, header = next(records, (0, []))
+        website_col = header.index('Website') if 'Website' in header else None
+
+        for idx, (offset, row) in enumerate(records):
+            offsets.append(offset)
+            # Path A companies (with Website) that are not yet processed
+            if website_col is not None and website_col < len(row) and row[website_col]:
+                if idx not in processed_indices:
+                    unprocessed.append(idx)
+        offsets.append(f.tell())
+
+    total_companies = len(offsets) - 1
     print(f"Total companies: {total_companies}")
-
-    # Filter to Path A companies (with Website) and add index
-    path_a_companies = []
-    for idx, company in enumerate(all_companies):
-        if company.get('Website'):
-            company['original_index'] = idx
-            path_a_companies.append(company)
-
-    # Get unprocessed companies
-    unprocessed = [c for c in path_a_companies if c['original_index'] not in processed_indices]
     print(f"Unprocessed companies: {len(unprocessed)}")
 
     if len(unprocessed) == 0:
         print("All companies already processed!")
         return
 
-    # Create chunk directory
+    # Create chunk directory (worker config and enriched outputs live here)
     CHUNK_DIR.mkdir(exist_ok=True)
 
-    # Split into chunks
+    # Split into byte ranges
     chunk_size = (len(unprocessed) + NUM_WORKERS - 1) // NUM_WORKERS
     chunks = []
 
@@ -95,32 +195,29 @@ def main():
         if start_idx >= len(unprocessed):
             break
 
-        chunk_companies = unprocessed[start_idx:end_idx]
-        chunk_file = CHUNK_DIR / f"chunk_{i}.csv"
-
-        # Write chunk to CSV
-        if chunk_companies:
-            with open(chunk_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=chunk_companies[0].keys())
-                writer.writeheader()
-                writer.writerows(chunk_companies)
-
-            chunks.append({
-                'worker_id': i,
-                'chunk_file': str(chunk_file),
-                'start_index': int(chunk_companies[0]['original_index']),
-                'end_index': int(chunk_companies[-1]['original_index']),
-                'size': len(chunk_companies)
-            })
-
-            print(f"Worker {i}: {len(chunk_companies)} companies (indices {chunks[-1]['start_index']}-{chunks[-1]['end_index']})")
+        chunk_indices = unprocessed[start_idx:end_idx]
+        chunks.append({
+            'worker_id': i,
+            'input_file': str(INPUT_CSV),
+            'input_size': input_stat.st_size,
+            'input_mtime_ns': input_stat.st_mtime_ns,
+            'header': header,
+            'byte_start': offsets[chunk_indices[0]],
+            'byte_end': offsets[chunk_indices[-1] + 1],
+            'output_file': str(CHUNK_DIR / f"chunk_{i}_enriched.csv"),
+            'start_index': chunk_indices[0],
+            'end_index': chunk_indices[-1],
+            'size': len(chunk_indices),
+            'indices': chunk_indices
+        })
+
+        print(f"Worker {i}: {len(chunk_indices)} companies (indices {chunks[-1]['start_index']}-{chunks[-1]['end_index']})")
 
     # Write worker config
     config_file = CHUNK_DIR / "worker_config.json"
-    with open(config_file, 'w') as f:
-        json.dump(chunks, f, indent=2)
+    write_json(config_file, chunks)
 
-    print(f"\nCreated {len(chunks)} chunks")
+    print(f"\nAssigned {len(chunks)} chunks")
     print(f"Config saved to: {config_file}")
     print("\nTo run workers in parallel, use:")
     for i in range(len(chunks)):
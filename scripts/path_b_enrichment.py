@@ -24,16 +24,23 @@ import os
 import sys
 import json
 import time
+import hashlib
+import inspect
+import sqlite3
 import argparse
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Import V4.3 modules
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from config.geography import BAY_COUNTIES, CITY_WHITELIST
-    from utils.helpers import is_aggregator, etld1
+    from config.geography import BAY_COUNTIES, CITY_WHITELIST, is_in_bay_area_city
+    from utils.helpers import atomic_write, is_aggregator, etld1, normalize_name
 except ImportError as e:
     print(f"Error importing V4.3 modules: {e}")
     print("Make sure config/geography.py and utils/helpers.py exist")
@@ -41,6 +48,8 @@ except ImportError as e:
 
 try:
     import googlemaps
+    import requests
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: googlemaps library not installed")
     print("Run: pip install googlemaps")
@@ -53,6 +62,18 @@ except ImportError:
     print("Run: pip install anthropic")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    # Optional: without orjson, tool results and Validation_JSON go through the stdlib json module
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    # Optional: without fastjsonschema, final results are checked by check_schema below
+    fastjsonschema = None
+
 
 # ============================================================================
 # Configuration
@@ -62,22 +83,95 @@ except ImportError:
 DATA_DIR = Path(__file__).parent.parent / "data"
 WORKING_DIR = DATA_DIR / "working"
 
+CACHE_DIR = DATA_DIR / "cache"
+
 INPUT_FILE = WORKING_DIR / "path_b_queue.csv"
 OUTPUT_FILE = WORKING_DIR / "companies_enriched_path_b.csv"
 MANUAL_QUEUE = WORKING_DIR / "manual_review_queue_path_b.csv"
 ANTHROPIC_USAGE_REPORT = WORKING_DIR / "anthropic_usage_report.txt"
+PLACES_CACHE_FILE = CACHE_DIR / "path_b_places_cache.db"
+
+# Output columns (rows are written as each company finishes). Queue_City is
+# the queue row's City hint, which --resume matches rows on; City is the
+# enriched city and may differ from it
+OUTPUT_FIELDS = [
+    'Company Name', 'Website', 'City', 'Address',
+    'Place_ID', 'Confidence', 'Validation_Source', 'Validation_JSON', 'Queue_City'
+]
+MANUAL_QUEUE_FIELDS = OUTPUT_FIELDS + ['Rejection_Reason', 'Error']
 
 # Anthropic configuration
 ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"  # Claude Sonnet 4.5 (latest)
+TRIAGE_MODEL = "claude-3-5-haiku-20241022"  # Cheap first pass; unsure results go to ANTHROPIC_MODEL
+ESCALATION_BAND = (0.55, 0.80)  # Triage confidences in this range are re-run on ANTHROPIC_MODEL
 TEMPERATURE = 0
 MAX_TOKENS = 1200
 MAX_TOOL_ROUNDS = 8
 
+# USD per million tokens: (input, output). Prompt cache writes cost 1.25x
+# input, reads 0.1x input. Unlisted models are priced as ANTHROPIC_MODEL.
+MODEL_PRICING = {
+    ANTHROPIC_MODEL: (3.00, 15.00),
+    TRIAGE_MODEL: (0.80, 4.00),
+}
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
 # Acceptance thresholds
 ACCEPTANCE_THRESHOLD = 0.75
 
 # Rate limiting
-RATE_LIMIT_DELAY = 0.5  # Delay between API calls (seconds)
+RATE_LIMIT_DELAY = 0.5  # Starting spacing between Anthropic calls (seconds); adapts to 429s
+MIN_RATE_LIMIT_DELAY = 0.125  # Fastest Anthropic spacing reached while calls keep succeeding
+MAX_BACKOFF_DELAY = 8.0  # Slowest spacing (either API) after repeated throttling
+MAX_WORKERS = 8  # Companies enriched concurrently (each call is network-bound)
+PLACES_QPS = 20  # Starting Google Places calls per second, summed over all workers
+PLACES_MAX_QPS = 40  # Ceiling the Places rate can grow to while calls keep succeeding
+PLACES_TIMEOUT = 10  # Seconds before a stalled Places request is abandoned
+PLACES_CONNECT_RETRIES = 3  # Reconnect attempts on dropped/reset connections
+MAX_PARALLEL_TOOL_CALLS = 4  # Tool calls from one LLM turn run at most this many at once
+
+# Tool results are re-sent to the model on every later round, so keep them small
+MAX_TOOL_NAME_CHARS = 80
+MAX_TOOL_ADDRESS_CHARS = 120
+MAX_TOOL_TYPES = 4  # Google lists the most specific place types first
+COORD_DECIMALS = 5  # ~1 m, far finer than the geofence needs
+
+# Place Details fields the tool result uses; 'geometry/location' skips the
+# viewport box that plain 'geometry' returns
+PLACE_DETAILS_FIELDS = [
+    'name',
+    'formatted_address',
+    'website',
+    'types',
+    'geometry/location',
+    'business_status'
+]
+
+# Path B queue columns enrichment reads; everything else is skipped at parse time
+QUEUE_COLUMNS = ['Company Name', 'City']
+
+# Google Places tool cache (persists across runs; each call is billed)
+PLACES_CACHE_TTL_DAYS = 14
+CACHEABLE_STATUSES = {'OK', 'ZERO_RESULTS', 'NOT_FOUND'}  # Not transient errors
+
+
+# ============================================================================
+# JSON Helpers
+# ============================================================================
+
+def dumps_json(obj) -> str:
+    """Compact JSON text; orjson when installed, identical stdlib output otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def loads_json(text):
+    """Parse JSON text; errors are json.JSONDecodeError either way."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 # ============================================================================
@@ -137,10 +231,143 @@ GET_PLACE_DETAILS_TOOL = {
 TOOL_REGISTRY = {}
 
 
+# ============================================================================
+# Google Places Tool Cache
+# ============================================================================
+
+class PlacesCache:
+    """SQLite cache of Google Places tool responses, keyed by tool name + arguments."""
+
+    def __init__(self, cache_file: Path, max_age_days: int = PLACES_CACHE_TTL_DAYS):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        # One connection shared by the worker threads, serialized by the lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(cache_file), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS places_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                ts INTEGER NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: dict) -> str:
+        """Stable key for a tool call."""
+        payload = tool_name + json.dumps(arguments, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, tool_name: str, arguments: dict) -> Optional[dict]:
+        """Return the cached response, or None if missing or expired."""
+        key = self.make_key(tool_name, arguments)
+        min_ts = int(time.time()) - self.max_age_seconds
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM places_cache WHERE key = ? AND ts >= ?", (key, min_ts)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return loads_json(row[0])
+
+    def put(self, tool_name: str, arguments: dict, response: dict):
+        """Store a response."""
+        key = self.make_key(tool_name, arguments)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO places_cache (key, value, ts) VALUES (?, ?, ?)",
+                (key, dumps_json(response), int(time.time()))
+            )
+            self.conn.commit()
+
+    def vacuum(self) -> int:
+        """Drop expired entries and compact the file. Returns entries removed."""
+        min_ts = int(time.time()) - self.max_age_seconds
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM places_cache WHERE ts < ?", (min_ts,)).rowcount
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+        return removed
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a free-text Places query."""
+    return ' '.join(text.split()).casefold()
+
+
+def cached_tool(tool_name: str, normalize=None):
+    """
+    Serve a tool wrapper from TOOL_REGISTRY['places_cache'] when registered.
+
+    Only responses with a status in CACHEABLE_STATUSES are stored, so
+    errors and quota failures are retried on the next run. `normalize`, if
+    given, is applied to string arguments when building the cache key, so
+    near-identical LLM queries share an entry (free text only: place IDs
+    are case-sensitive).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = TOOL_REGISTRY.get('places_cache')
+            if cache is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if normalize is not None:
+                arguments = {
+                    name: normalize(value) if isinstance(value, str) else value
+                    for name, value in arguments.items()
+                }
+
+            cached = cache.get(tool_name, arguments)
+            if cached is not None:
+                return cached
+
+            response = func(*args, **kwargs)
+            if response.get('status') in CACHEABLE_STATUSES:
+                cache.put(tool_name, arguments, response)
+            return response
+
+        return wrapper
+    return decorator
+
+
 # ============================================================================
 # Tool Python Wrappers
 # ============================================================================
 
+def wait_for_places():
+    """Respect TOOL_REGISTRY['places_limiter'] (if registered) before a Places call."""
+    limiter = TOOL_REGISTRY.get('places_limiter')
+    if limiter is not None:
+        limiter.wait()
+
+
+def record_places_outcome(error: Optional[Exception] = None):
+    """Adapt TOOL_REGISTRY['places_limiter']: back off on OVER_QUERY_LIMIT, speed up after a success."""
+    limiter = TOOL_REGISTRY.get('places_limiter')
+    if limiter is None:
+        return
+    if error is None:
+        limiter.recover()
+    elif getattr(error, 'status', None) == 'OVER_QUERY_LIMIT':
+        limiter.backoff()
+
+
+@cached_tool('search_places', normalize=normalize_query)
 def search_places_tool(query: str, location_bias: str = "") -> dict:
     """
     Python wrapper for search_places tool.
@@ -170,10 +397,12 @@ def search_places_tool(query: str, location_bias: str = "") -> dict:
                     pass
 
         # Call Google Places Text Search
+        wait_for_places()
         if location:
             result = gmaps.places(query, location=location)
         else:
             result = gmaps.places(query)
+        record_places_outcome()
 
         if result.get('status') == 'OK':
             # Return simplified results
@@ -181,9 +410,9 @@ def search_places_tool(query: str, location_bias: str = "") -> dict:
             for place in result.get('results', [])[:5]:  # Top 5
                 results.append({
                     'place_id': place.get('place_id'),
-                    'name': place.get('name'),
-                    'address': place.get('formatted_address', ''),
-                    'types': place.get('types', [])
+                    'name': (place.get('name') or '')[:MAX_TOOL_NAME_CHARS],
+                    'address': place.get('formatted_address', '')[:MAX_TOOL_ADDRESS_CHARS],
+                    'types': place.get('types', [])[:MAX_TOOL_TYPES]
                 })
 
             return {
@@ -199,6 +428,7 @@ def search_places_tool(query: str, location_bias: str = "") -> dict:
             }
 
     except Exception as e:
+        record_places_outcome(e)
         return {
             "status": "ERROR",
             "error": str(e),
@@ -207,6 +437,7 @@ def search_places_tool(query: str, location_bias: str = "") -> dict:
         }
 
 
+@cached_tool('get_place_details')
 def get_place_details_tool(place_id: str) -> dict:
     """
     Python wrapper for get_place_details tool.
@@ -223,21 +454,16 @@ def get_place_details_tool(place_id: str) -> dict:
 
     try:
         # Call Google Places Details API
-        fields = [
-            'name',
-            'formatted_address',
-            'website',
-            'types',
-            'geometry',
-            'business_status'
-        ]
-
-        result = gmaps.place(place_id, fields=fields)
+        wait_for_places()
+        result = gmaps.place(place_id, fields=PLACE_DETAILS_FIELDS)
+        record_places_outcome()
 
         if result.get('status') == 'OK':
             details = result.get('result', {})
             geometry = details.get('geometry', {})
             location = geometry.get('location', {})
+            lat = location.get('lat')
+            lng = location.get('lng')
 
             return {
                 "status": "OK",
@@ -245,9 +471,9 @@ def get_place_details_tool(place_id: str) -> dict:
                 "name": details.get('name', ''),
                 "formatted_address": details.get('formatted_address', ''),
                 "website": details.get('website', ''),
-                "types": details.get('types', []),
-                "latitude": location.get('lat'),
-                "longitude": location.get('lng'),
+                "types": details.get('types', [])[:MAX_TOOL_TYPES],
+                "latitude": round(lat, COORD_DECIMALS) if lat is not None else None,
+                "longitude": round(lng, COORD_DECIMALS) if lng is not None else None,
                 "business_status": details.get('business_status', '')
             }
         else:
@@ -257,6 +483,7 @@ def get_place_details_tool(place_id: str) -> dict:
             }
 
     except Exception as e:
+        record_places_outcome(e)
         return {
             "status": "ERROR",
             "error": str(e)
@@ -267,6 +494,16 @@ def get_place_details_tool(place_id: str) -> dict:
 TOOL_REGISTRY['search_places'] = search_places_tool
 TOOL_REGISTRY['get_place_details'] = get_place_details_tool
 
+# Tools offered to the model (the same object on every request) and the
+# read-only table tool_use blocks dispatch through. Kept apart from the
+# runtime entries in TOOL_REGISTRY (client, cache, limiter) so a tool name
+# from the model can only ever reach a tool function.
+ANTHROPIC_TOOLS = (SEARCH_PLACES_TOOL, GET_PLACE_DETAILS_TOOL)
+TOOL_FUNCTIONS = MappingProxyType({
+    SEARCH_PLACES_TOOL['name']: search_places_tool,
+    GET_PLACE_DETAILS_TOOL['name']: get_place_details_tool,
+})
+
 
 # ============================================================================
 # JSON Schema for Structured Output
@@ -315,6 +552,10 @@ COMPANY_ENRICHMENT_SCHEMA = {
                 "type": "number",
                 "description": "Confidence score from 0.0 to 1.0"
             },
+            "escalate": {
+                "type": "boolean",
+                "description": "True if the candidates are ambiguous and the decision needs a second, more careful look"
+            },
             "validation": {
                 "type": "object",
                 "properties": {
@@ -348,19 +589,76 @@ COMPANY_ENRICHMENT_SCHEMA = {
     }
 }
 
+# JSON schema type -> Python types accepted for it
+SCHEMA_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'number': (int, float),
+    'integer': int,
+    'boolean': bool,
+    'null': type(None),
+}
+
+
+def check_schema(value, schema: dict, path: str = "data"):
+    """
+    Check value against the JSON schema subset COMPANY_ENRICHMENT_SCHEMA uses.
+
+    Handles type, anyOf, properties, required and additionalProperties.
+
+    Raises:
+        ValueError: On the first mismatch, naming the offending path
+    """
+    if 'anyOf' in schema:
+        for option in schema['anyOf']:
+            try:
+                return check_schema(value, option, path)
+            except ValueError:
+                pass
+        allowed = ' or '.join(option.get('type', '?') for option in schema['anyOf'])
+        raise ValueError(f"{path} must be {allowed}")
+
+    expected = schema.get('type')
+    if expected is not None:
+        # bool is an int subclass but not a JSON number
+        if not isinstance(value, SCHEMA_TYPES[expected]) or (
+            isinstance(value, bool) and expected in ('number', 'integer')
+        ):
+            raise ValueError(f"{path} must be {expected}")
+
+    if expected == 'object':
+        missing = [key for key in schema.get('required', []) if key not in value]
+        if missing:
+            raise ValueError(f"{path} must contain {', '.join(missing)}")
+
+        properties = schema.get('properties', {})
+        for key, item in value.items():
+            if key in properties:
+                check_schema(item, properties[key], f"{path}.{key}")
+            elif schema.get('additionalProperties') is False:
+                raise ValueError(f"{path} must not contain {key}")
+
+
+# Built once at import; fastjsonschema generates Python code specialized to
+# the schema. Both raise ValueError subclasses on a mismatch.
+if fastjsonschema is not None:
+    validate_enrichment_result = fastjsonschema.compile(COMPANY_ENRICHMENT_SCHEMA["schema"])
+else:
+    validate_enrichment_result = functools.partial(check_schema, schema=COMPANY_ENRICHMENT_SCHEMA["schema"])
+
 
 # ============================================================================
 # Validation Prompt Template
 # ============================================================================
 
+# The rubric only depends on the city whitelist, so it is formatted once at
+# import; the per-company details go last. Every request then starts with
+# the same bytes, which keeps the prompt prefix cacheable across companies.
 VALIDATION_PROMPT_TEMPLATE = """You are a data validation assistant helping to enrich Bay Area biotech company information.
 
-**Company to validate:**
-- Name: {company_name}
-- City hint: {city}
-
 **Your task:**
-Use the provided tools to search for this company and validate the information according to strict criteria.
+Use the provided tools to search for the company given at the end of this message and validate the information according to strict criteria.
 
 **HARD GATES (Must all pass for acceptance ≥ 0.75):**
 
@@ -396,7 +694,7 @@ Use the provided tools to search for this company and validate the information a
    - NEVER guess or hallucinate data
 
 **Process:**
-1. Use search_places with query like "{company_name} {city} CA biotech"
+1. Use search_places with query like "<company name> <city hint> CA biotech"
 2. For top candidates, use get_place_details to get full information
 3. Validate each candidate against all hard gates
 4. Calculate confidence based on:
@@ -405,11 +703,31 @@ Use the provided tools to search for this company and validate the information a
    - Business type appropriateness (up to 0.2)
    - Source reliability (up to 0.1)
 5. Select best candidate if confidence ≥ 0.75, otherwise return nulls
+6. Set escalate to true if you are unsure between candidates or about a gate
 
 **Output:**
 Return a company_enrichment_result with all fields populated according to validation rules.
 """
 
+COMPANY_PROMPT_TEMPLATE = """
+**Company to validate:**
+- Name: {company_name}
+- City hint: {city}
+"""
+
+SCHEMA_RETRY_PROMPT = """Your final JSON does not match the company_enrichment_result schema: {error}
+Return the corrected company_enrichment_result JSON only."""
+
+PREFETCH_PROMPT_TEMPLATE = """
+**Pre-fetched candidates** (search_places query "{query}", already run for you;
+go straight to get_place_details unless none of these fit):
+{results}
+"""
+
+# Whitelist excerpt shown in the prompt (first 20 cities), built once
+PROMPT_CITY_WHITELIST = ", ".join(sorted(CITY_WHITELIST)[:20]) + ", ..."
+VALIDATION_RUBRIC = VALIDATION_PROMPT_TEMPLATE.format(city_whitelist=PROMPT_CITY_WHITELIST)
+
 
 # ============================================================================
 # Anthropic Token Usage Counter
@@ -422,22 +740,64 @@ class AnthropicUsageCounter:
         self.total_calls = 0
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cache_write_tokens = 0
+        self.total_cache_read_tokens = 0
+        # model -> {'calls', 'input', 'output', 'cache_write', 'cache_read'}
+        self.model_usage = {}
+        self._lock = threading.Lock()  # Shared by concurrent workers
 
-    def record_usage(self, usage):
+    def record_usage(self, usage, model: str = ANTHROPIC_MODEL):
         """
         Record usage from API response.
 
         Args:
             usage: Usage object from response (response.usage)
+            model: Model the request was sent to (prices differ per model)
         """
-        self.total_calls += 1
-        self.total_input_tokens += usage.input_tokens
-        self.total_output_tokens += usage.output_tokens
+        # Cache fields are None when the request did not use prompt caching
+        cache_write = getattr(usage, 'cache_creation_input_tokens', None)
+        cache_read = getattr(usage, 'cache_read_input_tokens', None)
+        cache_write = cache_write if isinstance(cache_write, int) else 0
+        cache_read = cache_read if isinstance(cache_read, int) else 0
+
+        with self._lock:
+            self.total_calls += 1
+            self.total_input_tokens += usage.input_tokens
+            self.total_output_tokens += usage.output_tokens
+            self.total_cache_write_tokens += cache_write
+            self.total_cache_read_tokens += cache_read
+
+            stats = self.model_usage.setdefault(model, {
+                'calls': 0, 'input': 0, 'output': 0, 'cache_write': 0, 'cache_read': 0
+            })
+            stats['calls'] += 1
+            stats['input'] += usage.input_tokens
+            stats['output'] += usage.output_tokens
+            stats['cache_write'] += cache_write
+            stats['cache_read'] += cache_read
 
     def total_tokens(self) -> int:
-        """Get total tokens (input + output)."""
+        """Get total tokens (input + output), excluding prompt-cache tokens."""
         return self.total_input_tokens + self.total_output_tokens
 
+    @staticmethod
+    def model_costs(model: str, stats: dict) -> dict:
+        """USD cost of one model's usage, split into input/cache_write/cache_read/output."""
+        input_price, output_price = MODEL_PRICING.get(model, MODEL_PRICING[ANTHROPIC_MODEL])
+        return {
+            'input': stats['input'] * input_price / 1e6,
+            'cache_write': stats['cache_write'] * input_price * CACHE_WRITE_MULTIPLIER / 1e6,
+            'cache_read': stats['cache_read'] * input_price * CACHE_READ_MULTIPLIER / 1e6,
+            'output': stats['output'] * output_price / 1e6,
+        }
+
+    def estimated_cost(self) -> float:
+        """Estimated USD cost summed over every model, priced per MODEL_PRICING."""
+        return sum(
+            sum(self.model_costs(model, stats).values())
+            for model, stats in self.model_usage.items()
+        )
+
     def report(self) -> str:
         """Generate usage report."""
         lines = [
@@ -452,28 +812,153 @@ class AnthropicUsageCounter:
             f"  Input tokens: {self.total_input_tokens:,}",
             f"  Output tokens: {self.total_output_tokens:,}",
             f"  Total tokens: {self.total_tokens():,}",
+            f"  Prompt cache writes: {self.total_cache_write_tokens:,}",
+            f"  Prompt cache reads: {self.total_cache_read_tokens:,}",
             "",
             "Estimated Cost:",
             "  Note: Anthropic pricing varies by model and volume tier.",
-            "  For Claude 3.5 Sonnet (as of 2024):",
-            f"    Input: ~${self.total_input_tokens * 0.000003:.4f} (at $3/MTok)",
-            f"    Output: ~${self.total_output_tokens * 0.000015:.4f} (at $15/MTok)",
-            f"    Total estimate: ~${(self.total_input_tokens * 0.000003 + self.total_output_tokens * 0.000015):.4f}",
+        ]
+        for model, stats in sorted(self.model_usage.items()):
+            costs = self.model_costs(model, stats)
+            lines += [
+                f"  {model} ({stats['calls']} calls, {stats['input']:,} in / {stats['output']:,} out):",
+                f"    Input: ~${costs['input']:.4f}",
+                f"    Cache writes: ~${costs['cache_write']:.4f}",
+                f"    Cache reads: ~${costs['cache_read']:.4f}",
+                f"    Output: ~${costs['output']:.4f}",
+            ]
+        lines += [
+            f"  Total estimate: ~${self.estimated_cost():.4f}",
             "",
             "  (Check current pricing at https://anthropic.com/pricing)",
         ]
         return "\n".join(lines)
 
 
+# ============================================================================
+# Rate Limiter
+# ============================================================================
+
+class RateLimiter:
+    """
+    Space out calls across threads by at least `interval` seconds.
+
+    Given a min_interval/max_interval range the spacing adapts: backoff()
+    doubles it when the API reports throttling, and recover() shortens it
+    by 10% after each success, so a healthy API is not slowed by a fixed
+    worst-case delay.
+    """
+
+    def __init__(self, interval: float, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None):
+        self.interval = interval
+        self.min_interval = interval if min_interval is None else min_interval
+        self.max_interval = interval if max_interval is None else max_interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's start slot arrives."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def backoff(self):
+        """Double the spacing (up to max_interval) after a throttling response."""
+        with self._lock:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    def recover(self):
+        """Shorten the spacing by 10% (down to min_interval) after a success."""
+        with self._lock:
+            self.interval = max(self.interval / 1.1, self.min_interval)
+
+
+# ============================================================================
+# API Clients
+# ============================================================================
+
+def make_gmaps_client(api_key: str, pool_size: int = MAX_WORKERS) -> "googlemaps.Client":
+    """
+    Build the single Google Maps client shared by every worker thread.
+
+    requests keeps at most 10 idle connections per host by default, so with
+    more workers than that the surplus connections are dropped after each
+    call and the next request pays a new TLS handshake. Size the keep-alive
+    pool to the worker count instead.
+
+    A stale keep-alive connection that the server has closed is retried at
+    the connection level (googlemaps itself only retries HTTP 5xx and
+    OVER_QUERY_LIMIT), and every request gets a timeout so a stalled socket
+    cannot pin a worker thread.
+    """
+    session = requests.Session()
+    retry = Retry(total=PLACES_CONNECT_RETRIES, status=0, backoff_factor=0.3)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=max(pool_size, 1), max_retries=retry
+    )
+    session.mount('https://', adapter)
+    return googlemaps.Client(key=api_key, requests_session=session, timeout=PLACES_TIMEOUT)
+
+
 # ============================================================================
 # Tool Use Controller Loop
 # ============================================================================
 
+def run_tool_call(block) -> dict:
+    """
+    Execute one tool_use block.
+
+    Args:
+        block: tool_use content block from an Anthropic response
+
+    Returns:
+        Tool output dict
+    """
+    tool_func = TOOL_FUNCTIONS.get(block.name)
+    if tool_func is not None:
+        return tool_func(**block.input)
+
+    return {
+        "status": "ERROR",
+        "error": f"Unknown tool: {block.name}"
+    }
+
+
+def no_candidates_result(company_name: str) -> dict:
+    """Null enrichment result for a company Google Places has no candidates for."""
+    return {
+        "company_name": company_name,
+        "website": None,
+        "address": None,
+        "city": None,
+        "place_id": None,
+        "confidence": 0.0,
+        "validation": {
+            "in_bay_area": False,
+            "is_business": False,
+            "brand_domain_ok": True,
+            "multi_tenant_ok": True,
+            "reasoning": "No Google Places results found"
+        }
+    }
+
+
+def prefetch_query(company_name: str, city: str) -> str:
+    """Opening search_places query, matching step 1 of the prompt's process."""
+    return " ".join(part for part in (company_name, city, "CA biotech") if part)
+
+
 def run_structured_enrichment(
     company_name: str,
     city: str,
     client: anthropic.Anthropic,
-    counter: AnthropicUsageCounter
+    counter: AnthropicUsageCounter,
+    limiter: Optional[RateLimiter] = None,
+    model: str = ANTHROPIC_MODEL
 ) -> dict:
     """
     Run Anthropic structured enrichment with tool use.
@@ -483,6 +968,8 @@ def run_structured_enrichment(
         city: City hint for the company
         client: Anthropic client
         counter: Usage counter
+        limiter: Optional shared limiter spacing messages.create calls
+        model: Anthropic model to run the loop on
 
     Returns:
         Enrichment result dict
@@ -490,14 +977,28 @@ def run_structured_enrichment(
     Raises:
         RuntimeError: If controller loop fails or exceeds max rounds
     """
-    # Build prompt with validation instructions
-    city_whitelist = ", ".join(sorted(CITY_WHITELIST)[:20]) + ", ..."  # First 20 cities
+    # Run the opening Places search before the first model call: its result
+    # rides along in the prompt, saving the round trip the model would spend
+    # asking for it, and no candidates at all means no model call is needed
+    query = prefetch_query(company_name, city)
+    prefetched = search_places_tool(query)
+    if prefetched.get('status') == 'ZERO_RESULTS':
+        return no_candidates_result(company_name)
 
-    prompt = VALIDATION_PROMPT_TEMPLATE.format(
-        company_name=company_name,
-        city=city,
-        city_whitelist=city_whitelist
-    )
+    # Build prompt with validation instructions
+    # The rubric block is identical for every company; the cache breakpoint
+    # on it caches the tool definitions plus rubric, which every round of
+    # every company then reads back instead of re-processing
+    prompt = [
+        {"type": "text", "text": VALIDATION_RUBRIC, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": COMPANY_PROMPT_TEMPLATE.format(company_name=company_name, city=city)},
+    ]
+    if prefetched.get('status') == 'OK':
+        # Company-specific, so it goes after the cached rubric block
+        prompt.append({
+            "type": "text",
+            "text": PREFETCH_PROMPT_TEMPLATE.format(query=query, results=dumps_json(prefetched))
+        })
 
     # Initialize message history
     messages = [
@@ -508,58 +1009,83 @@ def run_structured_enrichment(
     for round_num in range(MAX_TOOL_ROUNDS):
         try:
             # Call Anthropic API
-            response = client.messages.create(
-                model=ANTHROPIC_MODEL,
-                max_tokens=MAX_TOKENS,
-                temperature=TEMPERATURE,
-                tools=[SEARCH_PLACES_TOOL, GET_PLACE_DETAILS_TOOL],
-                messages=messages
-            )
+            if limiter is not None:
+                limiter.wait()
+            try:
+                response = client.messages.create(
+                    model=model,
+                    max_tokens=MAX_TOKENS,
+                    temperature=TEMPERATURE,
+                    tools=ANTHROPIC_TOOLS,
+                    messages=messages
+                )
+            except anthropic.RateLimitError:
+                if limiter is not None:
+                    limiter.backoff()
+                raise
+            if limiter is not None:
+                limiter.recover()
 
             # Record usage
-            counter.record_usage(response.usage)
+            counter.record_usage(response.usage, model)
 
             # Check stop reason
             if response.stop_reason == "end_turn":
                 # Extract final JSON from response
+                result = None
                 for block in response.content:
                     if hasattr(block, 'text') and block.text:
                         # Try to parse as JSON
                         try:
-                            result = json.loads(block.text)
-                            return result
+                            result = loads_json(block.text)
+                            break
                         except json.JSONDecodeError:
                             pass
 
                 # No valid JSON found
-                raise RuntimeError(f"No JSON output in end_turn response: {response.content}")
+                if result is None:
+                    raise RuntimeError(f"No JSON output in end_turn response: {response.content}")
 
-            elif response.stop_reason == "tool_use":
-                # Process tool use blocks
-                tool_results = []
+                # Malformed output would otherwise surface later as KeyErrors
+                # in accept_enrichment_result; send the error back instead
+                try:
+                    validate_enrichment_result(result)
+                except ValueError as e:
+                    messages.append({"role": "assistant", "content": response.content})
+                    messages.append({"role": "user", "content": SCHEMA_RETRY_PROMPT.format(error=e)})
+                    continue
 
-                for block in response.content:
-                    if block.type == "tool_use":
-                        tool_name = block.name
-                        tool_input = block.input
-                        tool_use_id = block.id
-
-                        # Execute tool
-                        if tool_name in TOOL_REGISTRY:
-                            tool_func = TOOL_REGISTRY[tool_name]
-                            tool_output = tool_func(**tool_input)
-                        else:
-                            tool_output = {
-                                "status": "ERROR",
-                                "error": f"Unknown tool: {tool_name}"
-                            }
-
-                        # Build tool_result block
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": json.dumps(tool_output)
-                        })
+                return result
+
+            elif response.stop_reason == "tool_use":
+                # Process tool use blocks; several in one turn are independent
+                # Places calls, so they run concurrently (results keep block order)
+                tool_blocks = [block for block in response.content if block.type == "tool_use"]
+
+                if len(tool_blocks) > 1:
+                    workers = min(len(tool_blocks), MAX_PARALLEL_TOOL_CALLS)
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        tool_outputs = list(executor.map(run_tool_call, tool_blocks))
+                else:
+                    tool_outputs = [run_tool_call(block) for block in tool_blocks]
+
+                # Nothing to validate if neither the prefetch nor the opening
+                # searches found candidates: return the null result instead of
+                # paying for more rounds that can only reach the same answer
+                if round_num == 0 and prefetched.get('status') != 'OK' and tool_blocks and all(
+                    block.name == 'search_places' and output.get('status') == 'ZERO_RESULTS'
+                    for block, output in zip(tool_blocks, tool_outputs)
+                ):
+                    return no_candidates_result(company_name)
+
+                tool_results = [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": dumps_json(output)
+                    }
+                    for block, output in zip(tool_blocks, tool_outputs)
+                ]
 
                 # Append assistant message and tool results to history
                 messages.append({"role": "assistant", "content": response.content})
@@ -583,6 +1109,54 @@ def run_structured_enrichment(
     raise RuntimeError(f"Exceeded {MAX_TOOL_ROUNDS} tool use rounds without completion")
 
 
+def needs_escalation(result: dict) -> bool:
+    """True if a triage result is too uncertain to act on without ANTHROPIC_MODEL."""
+    if result.get('escalate') is True:
+        return True
+    confidence = result.get('confidence')
+    if not isinstance(confidence, (int, float)):
+        return True
+    low, high = ESCALATION_BAND
+    return low <= confidence <= high
+
+
+def run_triaged_enrichment(
+    company_name: str,
+    city: str,
+    client: anthropic.Anthropic,
+    counter: AnthropicUsageCounter,
+    limiter: Optional[RateLimiter] = None
+) -> dict:
+    """
+    Enrich on TRIAGE_MODEL first, re-running on ANTHROPIC_MODEL only when needed.
+
+    Clear accepts and clear rejects keep the triage result. Results in
+    ESCALATION_BAND, results the model flagged with escalate, and triage
+    runs that fail are re-run on ANTHROPIC_MODEL. The re-run's Places calls
+    are served from the tool cache.
+
+    Args:
+        company_name: Company name to enrich
+        city: City hint for the company
+        client: Anthropic client
+        counter: Usage counter
+        limiter: Optional shared limiter spacing messages.create calls
+
+    Returns:
+        Enrichment result dict
+    """
+    try:
+        result = run_structured_enrichment(
+            company_name, city, client, counter, limiter, model=TRIAGE_MODEL
+        )
+        if not needs_escalation(result):
+            return result
+    except RuntimeError:
+        pass
+
+    return run_structured_enrichment(company_name, city, client, counter, limiter, model=ANTHROPIC_MODEL)
+
+
 # ============================================================================
 # Acceptance Logic
 # ============================================================================
@@ -614,20 +1188,21 @@ def accept_enrichment_result(result: dict, company_name: str) -> Tuple[bool, dic
     is_business = validation.get('is_business', False)
     brand_domain_ok = validation.get('brand_domain_ok', True)  # Default True
 
-    website = result.get('website')
+    website = (result.get('website') or '').strip()
 
-    # Check if website is aggregator (double-check)
-    if website and is_aggregator(website):
-        brand_domain_ok = False
-
-    # Apply acceptance gates
-    accepted = (
+    # Apply acceptance gates; the aggregator double-check on the website
+    # only runs once every cheaper gate has passed
+    accepted = bool(
         confidence >= ACCEPTANCE_THRESHOLD
         and in_bay_area
         and is_business
         and brand_domain_ok
+        and not (website and is_aggregator(website))
     )
 
+    # Serialized once for either branch; compact output keeps the CSV column small
+    validation_json = dumps_json(validation)
+
     if accepted:
         # Build enriched data
         enriched_data = {
@@ -638,7 +1213,7 @@ def accept_enrichment_result(result: dict, company_name: str) -> Tuple[bool, dic
             'Place_ID': result.get('place_id') or '',
             'Confidence': f"{confidence:.3f}",
             'Validation_Source': 'PathB',
-            'Validation_JSON': json.dumps(validation)
+            'Validation_JSON': validation_json
         }
     else:
         # Rejected - keep nulls
@@ -651,13 +1226,249 @@ def accept_enrichment_result(result: dict, company_name: str) -> Tuple[bool, dic
             'Place_ID': '',
             'Confidence': f"{confidence:.3f}",
             'Validation_Source': 'PathB',
-            'Validation_JSON': json.dumps(validation),
+            'Validation_JSON': validation_json,
             'Rejection_Reason': rejection_reason
         }
 
     return accepted, enriched_data
 
 
+# ============================================================================
+# Per-Company Processing
+# ============================================================================
+
+class EnrichmentMemo:
+    """
+    Share one run_structured_enrichment result between queue rows for the same company.
+
+    Rows match on normalize_name(company name) plus the case- and
+    whitespace-folded city, so "Acme Bio, Inc." and "ACME BIO" in the same
+    city cost one controller loop. A duplicate that arrives while the first
+    row is still running waits for its result. Failures are not remembered,
+    so a later duplicate retries.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(company_name: str, city: str) -> Tuple[str, str]:
+        """Key for a (company name, city) pair."""
+        return normalize_name(company_name), ' '.join(city.split()).casefold()
+
+    def get_or_run(self, company_name: str, city: str, run) -> dict:
+        """Return the result for this company, calling run() only for the first row."""
+        key = self.make_key(company_name, city)
+        if not key[0]:
+            return run()
+
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                future.set_result(run())
+            except Exception as e:
+                with self._lock:
+                    del self._futures[key]
+                future.set_exception(e)
+
+        return future.result()
+
+
+def out_of_area_rejection(company: "QueueRow") -> Optional[dict]:
+    """
+    Rejection row for a company whose City hint is outside the 9-county whitelist.
+
+    Such rows would fail the geographic hard gate anyway, so they are
+    rejected without spending Anthropic or Places calls; they still land in
+    the manual review queue. Rows with no City hint are left to the LLM.
+
+    Returns:
+        Rejected data dict, or None if the company should be enriched
+    """
+    city = company.city
+    if not city.strip() or is_in_bay_area_city(city):
+        return None
+
+    reason = f"City hint '{city.strip()}' is outside the 9-county whitelist"
+    return {
+        'Company Name': company.company_name,
+        'Website': '',
+        'Address': '',
+        'City': '',
+        'Place_ID': '',
+        'Confidence': '0.000',
+        'Validation_Source': 'PathB',
+        'Validation_JSON': dumps_json({'in_bay_area': False, 'reasoning': reason}),
+        'Rejection_Reason': reason
+    }
+
+
+def process_company(
+    company: "QueueRow",
+    client: anthropic.Anthropic,
+    counter: AnthropicUsageCounter,
+    memo: Optional[EnrichmentMemo] = None,
+    limiter: Optional[RateLimiter] = None
+) -> Tuple[str, dict]:
+    """
+    Enrich one Path B company (safe to run from worker threads).
+
+    Args:
+        company: Row from the Path B queue
+        client: Anthropic client
+        counter: Usage counter
+        memo: Optional result memo shared by all rows of this run
+        limiter: Optional shared limiter spacing Anthropic calls
+
+    Returns:
+        (outcome, data) tuple
+        - outcome: 'accepted', 'rejected' or 'error'
+        - data: Enriched data, or error row for the manual queue
+    """
+    company_name = company.company_name
+    city = company.city
+
+    try:
+        # Run structured enrichment (once per distinct company when memoized)
+        if memo is not None:
+            result = memo.get_or_run(
+                company_name, city,
+                lambda: run_triaged_enrichment(company_name, city, client, counter, limiter)
+            )
+        else:
+            result = run_triaged_enrichment(company_name, city, client, counter, limiter)
+
+        # Apply acceptance logic
+        accepted, enriched_data = accept_enrichment_result(result, company_name)
+        return ('accepted' if accepted else 'rejected'), enriched_data
+
+    except Exception as e:
+        return 'error', {
+            'Company Name': company_name,
+            'Website': '',
+            'Address': '',
+            'City': city,
+            'Place_ID': '',
+            'Confidence': '0.000',
+            'Validation_Source': 'PathB',
+            'Validation_JSON': dumps_json({'error': str(e)}),
+            'Error': str(e)
+        }
+
+
+# ============================================================================
+# Path B Queue
+# ============================================================================
+
+class QueueRow(NamedTuple):
+    """The columns of one Path B queue row that enrichment reads."""
+    company_name: str
+    city: str = ''
+
+
+def load_queue(path: Path) -> List[QueueRow]:
+    """
+    Load the Path B queue, keeping only the columns enrichment reads.
+
+    The whole queue stays in memory for the run, so rows are QueueRow
+    tuples rather than full row dicts, and rows in the same city share
+    one string.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = [header.index(column) if column in header else None for column in QUEUE_COLUMNS]
+
+        cities = {}
+        rows = []
+        for record in reader:
+            if not record:
+                continue
+            name, city = (
+                record[pos] if pos is not None and pos < len(record) else ''
+                for pos in positions
+            )
+            rows.append(QueueRow(name, cities.setdefault(city, city)))
+    return rows
+
+
+# ============================================================================
+# Incremental Output
+# ============================================================================
+
+def is_error_row(row: Dict[str, str]) -> bool:
+    """Whether an output row records a failed enrichment rather than an outcome."""
+    try:
+        validation = loads_json(row.get('Validation_JSON') or 'null')
+    except ValueError:
+        return False
+    return isinstance(validation, dict) and 'error' in validation
+
+
+def done_key(row: Dict[str, str]) -> Tuple[str, str]:
+    """
+    EnrichmentMemo key of the queue row an output row was written for.
+
+    Keyed on name and City hint, so finishing one company does not skip a
+    same-named company in another city. Rows written before Queue_City
+    existed fall back to their City column.
+    """
+    city = row.get('Queue_City')
+    if city is None:
+        city = row.get('City') or ''
+    return EnrichmentMemo.make_key(row.get('Company Name') or '', city)
+
+
+def drop_error_rows(path: Path, fieldnames: List[str]) -> List[Dict[str, str]]:
+    """
+    Rewrite an output CSV without its error rows before a resumed run.
+
+    --resume retries the companies those rows record, so leaving them in
+    place would list each retried company twice (and keep an accepted
+    company in the manual queue). The file is replaced atomically.
+
+    Returns:
+        The accepted and rejected rows kept (empty if the file does not exist)
+    """
+    if not path.exists():
+        return []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if not is_error_row(row)]
+
+    with atomic_write(path, newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def open_csv_writer(path: Path, fieldnames: List[str], append: bool = False):
+    """
+    Open `path` for row-by-row CSV output.
+
+    Appending to a non-empty file skips the header so an interrupted run can
+    be resumed into the same file.
+
+    Returns:
+        (file, csv.DictWriter) tuple; the caller closes the file
+    """
+    append = append and path.exists() and path.stat().st_size > 0
+    f = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+    writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', extrasaction='ignore')
+    if not append:
+        writer.writeheader()
+    return f, writer
+
+
 # ============================================================================
 # Main Processing
 # ============================================================================
@@ -666,8 +1477,23 @@ def main():
     """Main Path B enrichment workflow."""
     parser = argparse.ArgumentParser(description='Path B Enrichment with Anthropic structured outputs')
     parser.add_argument('--limit', type=int, help='Limit number of companies to process (for testing)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f'Companies to enrich concurrently (default: {MAX_WORKERS})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always call Google Places (skip the on-disk tool cache)')
+    parser.add_argument('--vacuum-cache', action='store_true',
+                        help='Drop expired Google Places cache entries, compact the cache, and exit')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip companies already in the output file and append to it')
     args = parser.parse_args()
 
+    if args.vacuum_cache:
+        cache = PlacesCache(PLACES_CACHE_FILE)
+        removed = cache.vacuum()
+        cache.close()
+        print(f"✓ Removed {removed} expired entries from {PLACES_CACHE_FILE}")
+        return
+
     print("=" * 70)
     print("Path B Enrichment: Anthropic Structured Outputs")
     print("=" * 70)
@@ -687,7 +1513,7 @@ def main():
 
     # Initialize clients
     try:
-        gmaps = googlemaps.Client(key=google_api_key)
+        gmaps = make_gmaps_client(google_api_key, pool_size=args.workers)
         TOOL_REGISTRY['gmaps'] = gmaps
         print("✓ Google Maps API client initialized")
     except Exception as e:
@@ -695,12 +1521,20 @@ def main():
         sys.exit(1)
 
     try:
+        # One client for all workers: its connection pool keeps TLS sessions alive
         client = anthropic.Anthropic(api_key=anthropic_api_key)
         print("✓ Anthropic API client initialized")
     except Exception as e:
         print(f"Error initializing Anthropic client: {e}")
         sys.exit(1)
 
+    # Google Places tool cache
+    places_cache = None
+    if not args.no_cache:
+        places_cache = PlacesCache(PLACES_CACHE_FILE)
+        TOOL_REGISTRY['places_cache'] = places_cache
+        print(f"✓ Google Places cache: {PLACES_CACHE_FILE}")
+
     # Initialize counter
     counter = AnthropicUsageCounter()
     print()
@@ -712,14 +1546,20 @@ def main():
         sys.exit(1)
 
     print(f"Loading Path B queue from: {INPUT_FILE}")
-    companies = []
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            companies.append(row)
+    companies = load_queue(INPUT_FILE)
 
     total_companies = len(companies)
 
+    # Skip companies finished by an interrupted run; its error rows are
+    # dropped from both outputs so those companies are retried cleanly
+    done_rows = []
+    if args.resume:
+        done_rows = drop_error_rows(OUTPUT_FILE, OUTPUT_FIELDS)
+        drop_error_rows(MANUAL_QUEUE, MANUAL_QUEUE_FIELDS)
+        done = {done_key(row) for row in done_rows}
+        companies = [c for c in companies if EnrichmentMemo.make_key(c.company_name, c.city) not in done]
+        print(f"  Resuming: {total_companies - len(companies)} companies already done in {OUTPUT_FILE}")
+
     # Apply limit if specified
     if args.limit:
         companies = companies[:args.limit]
@@ -729,12 +1569,14 @@ def main():
 
     print()
 
+    if not companies:
+        print("No Path B companies left to process")
+        return
+
     # Process companies
     print(f"Processing {len(companies)} Path B companies...")
     print()
 
-    enriched_companies = []
-    manual_queue = []
     stats = {
         'total': len(companies),
         'accepted': 0,
@@ -742,103 +1584,94 @@ def main():
         'errors': 0
     }
 
-    for i, company in enumerate(companies):
-        company_name = company.get('Company Name', '')
-        city = company.get('City', '')
-
-        print(f"[{i+1}/{stats['total']}] {company_name} ({city})")
+    # Every worker's Anthropic calls share one adaptive spacing, as do its
+    # Places calls (cache hits skip the Places limiter)
+    limiter = RateLimiter(RATE_LIMIT_DELAY, MIN_RATE_LIMIT_DELAY, MAX_BACKOFF_DELAY)
+    TOOL_REGISTRY['places_limiter'] = RateLimiter(1 / PLACES_QPS, 1 / PLACES_MAX_QPS, MAX_BACKOFF_DELAY)
 
-        try:
-            # Run structured enrichment
-            result = run_structured_enrichment(company_name, city, client, counter)
-
-            # Apply acceptance logic
-            accepted, enriched_data = accept_enrichment_result(result, company_name)
-
-            if accepted:
-                enriched_companies.append(enriched_data)
-                stats['accepted'] += 1
-
-                address_short = enriched_data['Address'][:50]
-                print(f"  ✓ Accepted: {address_short}...")
-                print(f"    Confidence: {enriched_data['Confidence']}")
-            else:
-                # Rejected - add to manual queue
-                manual_queue.append(enriched_data)
-                enriched_companies.append(enriched_data)  # Still include in output
-                stats['rejected'] += 1
-
-                rejection_reason = enriched_data.get('Rejection_Reason', 'Unknown')
-                print(f"  ✗ Rejected: {rejection_reason}")
+    memo = EnrichmentMemo()
 
-        except Exception as e:
-            # Error during enrichment
-            print(f"  ✗ Error: {e}")
-
-            error_data = {
-                'Company Name': company_name,
-                'Website': '',
-                'Address': '',
-                'City': city,
-                'Place_ID': '',
-                'Confidence': '0.000',
-                'Validation_Source': 'PathB',
-                'Validation_JSON': json.dumps({'error': str(e)}),
-                'Error': str(e)
-            }
+    def enrich(company):
+        rejected = out_of_area_rejection(company)
+        if rejected is not None:
+            return 'rejected', rejected
+        return process_company(company, client, counter, memo, limiter)
 
-            manual_queue.append(error_data)
-            enriched_companies.append(error_data)
-            stats['errors'] += 1
-
-        # Rate limiting
-        time.sleep(RATE_LIMIT_DELAY)
+    # Rows are written (and flushed) as each company finishes, so an
+    # interrupted run keeps its work and can continue with --resume
+    WORKING_DIR.mkdir(parents=True, exist_ok=True)
+    output_f, output_writer = open_csv_writer(OUTPUT_FILE, OUTPUT_FIELDS, append=args.resume)
+    queue_f, queue_writer = open_csv_writer(MANUAL_QUEUE, MANUAL_QUEUE_FIELDS, append=args.resume)
 
-        # Progress update every 10 companies
-        if (i + 1) % 10 == 0:
-            print()
-            print(f"  Progress: {i+1}/{stats['total']} ({100*(i+1)/stats['total']:.1f}%)")
-            print(f"  Accepted: {stats['accepted']}, Rejected: {stats['rejected']}, Errors: {stats['errors']}")
-            print()
+    # Companies run concurrently; results are consumed in input order
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for i, (company, (outcome, data)) in enumerate(zip(companies, executor.map(enrich, companies))):
+                company_name = company.company_name
+                city = company.city
+                data['Queue_City'] = city
+
+                print(f"[{i+1}/{stats['total']}] {company_name} ({city})")
+
+                if outcome == 'accepted':
+                    stats['accepted'] += 1
+
+                    address_short = data['Address'][:50]
+                    print(f"  ✓ Accepted: {address_short}...")
+                    print(f"    Confidence: {data['Confidence']}")
+                elif outcome == 'rejected':
+                    # Rejected - add to manual queue (still included in output)
+                    queue_writer.writerow(data)
+                    queue_f.flush()
+                    stats['rejected'] += 1
+
+                    rejection_reason = data.get('Rejection_Reason', 'Unknown')
+                    print(f"  ✗ Rejected: {rejection_reason}")
+                else:
+                    # Error during enrichment
+                    print(f"  ✗ Error: {data['Error']}")
+                    queue_writer.writerow(data)
+                    queue_f.flush()
+                    stats['errors'] += 1
+
+                output_writer.writerow(data)
+                output_f.flush()
+
+                # Progress update every 10 companies
+                if (i + 1) % 10 == 0:
+                    print()
+                    print(f"  Progress: {i+1}/{stats['total']} ({100*(i+1)/stats['total']:.1f}%)")
+                    print(f"  Accepted: {stats['accepted']}, Rejected: {stats['rejected']}, Errors: {stats['errors']}")
+                    print()
+    finally:
+        output_f.close()
+        queue_f.close()
+        del TOOL_REGISTRY['places_limiter']
 
     print()
     print("=" * 70)
 
-    # Save results
-    WORKING_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Write Path B enriched companies
-    if enriched_companies:
-        fieldnames = [
-            'Company Name', 'Website', 'City', 'Address',
-            'Place_ID', 'Confidence', 'Validation_Source', 'Validation_JSON'
-        ]
-
-        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            for company in enriched_companies:
-                row = {field: company.get(field, '') for field in fieldnames}
-                writer.writerow(row)
-
-        print(f"✓ Wrote {len(enriched_companies)} companies to: {OUTPUT_FILE}")
-
-    # Write manual review queue
-    if manual_queue:
-        fieldnames = list(manual_queue[0].keys())
-        with open(MANUAL_QUEUE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(manual_queue)
-
-        print(f"✓ Wrote {len(manual_queue)} companies to manual queue: {MANUAL_QUEUE}")
+    # On --resume the files also hold rows from earlier runs
+    already_done = len(done_rows)
+    if already_done:
+        print(f"✓ Processed {stats['total']} this run ({already_done} already done): "
+              f"{stats['total'] + already_done} companies in {OUTPUT_FILE}")
+    else:
+        print(f"✓ Wrote {stats['total']} companies to: {OUTPUT_FILE}")
+    manual_count = stats['rejected'] + stats['errors']
+    if manual_count:
+        print(f"✓ Wrote {manual_count} companies to manual queue: {MANUAL_QUEUE}")
 
     # Generate Anthropic usage report
     report = counter.report()
     with open(ANTHROPIC_USAGE_REPORT, 'w') as f:
         f.write(report)
         f.write("\n\nPath B Statistics:\n")
-        f.write(f"  Total Path B companies: {stats['total']}\n")
+        if already_done:
+            f.write(f"  Processed this run: {stats['total']} ({already_done} already done)\n")
+            f.write(f"  Total Path B companies in output: {stats['total'] + already_done}\n")
+        else:
+            f.write(f"  Total Path B companies: {stats['total']}\n")
         f.write(f"  Accepted: {stats['accepted']} ({100*stats['accepted']/stats['total']:.1f}%)\n")
         f.write(f"  Rejected: {stats['rejected']} ({100*stats['rejected']/stats['total']:.1f}%)\n")
         f.write(f"  Errors: {stats['errors']} ({100*stats['errors']/stats['total']:.1f}%)\n")
@@ -850,7 +1683,11 @@ def main():
     print("=" * 70)
     print("PATH B ENRICHMENT SUMMARY")
     print("=" * 70)
-    print(f"Total Path B companies: {stats['total']}")
+    if already_done:
+        print(f"Processed this run: {stats['total']} ({already_done} already done)")
+        print(f"Total Path B companies in output: {stats['total'] + already_done}")
+    else:
+        print(f"Total Path B companies: {stats['total']}")
     print(f"Accepted: {stats['accepted']} ({100*stats['accepted']/stats['total']:.1f}%)")
     print(f"Rejected: {stats['rejected']} ({100*stats['rejected']/stats['total']:.1f}%)")
     print(f"Errors: {stats['errors']} ({100*stats['errors']/stats['total']:.1f}%)")
@@ -860,8 +1697,24 @@ def main():
     print(f"  Input tokens: {counter.total_input_tokens:,}")
     print(f"  Output tokens: {counter.total_output_tokens:,}")
     print(f"  Total tokens: {counter.total_tokens():,}")
+    print(f"  Prompt cache reads: {counter.total_cache_read_tokens:,} "
+          f"(writes: {counter.total_cache_write_tokens:,})")
+    print(f"  Duplicate rows served from earlier results: {memo.hits:,}")
+    print()
+    etld1_stats = etld1.cache_info()
+    aggregator_stats = is_aggregator.cache_info()
+    print("Domain lookup cache:")
+    print(f"  etld1: {etld1_stats.hits:,} hits, {etld1_stats.misses:,} misses")
+    print(f"  is_aggregator: {aggregator_stats.hits:,} hits, {aggregator_stats.misses:,} misses")
     print()
 
+    if places_cache is not None:
+        print("Google Places cache:")
+        print(f"  {places_cache.hits:,} hits, {places_cache.misses:,} misses")
+        print()
+        del TOOL_REGISTRY['places_cache']
+        places_cache.close()
+
 
 if __name__ == '__main__':
     main()
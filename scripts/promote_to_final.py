@@ -33,13 +33,19 @@ Date: 2025-11-16
 """
 
 import csv
+import os
 import sys
+import mmap
+import heapq
 import logging
 import argparse
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Set, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.helpers import atomic_write
+
 # ============================================================================
 # Setup Logging
 # ============================================================================
@@ -63,15 +69,22 @@ TIER_4_REVIEW = Path("data/working/tier_4_review.csv")
 OUTPUT_FILE = Path("data/final/companies.csv")
 METADATA_FILE = Path("data/final/last_updated.txt")
 
+# Line validate_for_promotion.py writes when every validator passes
+VALIDATION_PASS_MARKER = b"ALL VALIDATORS PASSED"
+
 # Production columns (user-facing fields only, drop internal working columns)
-PRODUCTION_COLUMNS = [
+PRODUCTION_COLUMNS = (
     "Company Name",
     "Website",
     "City",
     "Address",
     "Company_Stage",
     "Focus_Areas",
-]
+)
+PRODUCTION_COLUMN_SET = frozenset(PRODUCTION_COLUMNS)
+
+# "Reviewed" values in reviewed_flags.csv that count as reviewed (lowercased)
+REVIEWED_VALUES = frozenset({'yes', 'y', 'true', '1'})
 
 
 # ============================================================================
@@ -101,11 +114,17 @@ def check_validation_report(report_path: Path, force: bool = False) -> bool:
     # Read report and check for failures
     logger.info(f"Checking validation report: {report_path}")
 
-    with open(report_path, 'r', encoding='utf-8') as f:
-        report_content = f.read()
+    # Search the mapped bytes for the marker instead of decoding the whole
+    # report into a string (mmap cannot map an empty file)
+    with open(report_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            passed = False
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                passed = mm.find(VALIDATION_PASS_MARKER) != -1
 
     # Check for "ALL VALIDATORS PASSED"
-    if "ALL VALIDATORS PASSED" in report_content:
+    if passed:
         logger.info("  ✓ All validators passed")
         return True
     else:
@@ -159,23 +178,25 @@ def check_tier_4_review(tier_4_path: Path, reviewed_flags_path: Path,
         logger.error("Create reviewed_flags.csv with review results")
         return False
 
-    # Load reviewed companies
-    reviewed_companies = set()
+    # Strike reviewed companies off the Tier 4 list while streaming the
+    # flags file; stop reading once every Tier 4 company is accounted for
+    unreviewed = set(tier_4_companies)
     with open(reviewed_flags_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            company_name = row.get("Company Name", "").strip()
             reviewed = row.get("Reviewed", "").strip().lower()
 
-            if company_name and reviewed in ['yes', 'y', 'true', '1']:
-                reviewed_companies.add(company_name)
+            if reviewed in REVIEWED_VALUES:
+                unreviewed.discard(row.get("Company Name", "").strip())
+                if not unreviewed:
+                    break
 
     # Check if all Tier 4 companies are reviewed
-    unreviewed = tier_4_companies - reviewed_companies
 
     if len(unreviewed) > 0:
         logger.error(f"  ✗ {len(unreviewed)} Tier 4 companies not reviewed:")
-        for company in list(unreviewed)[:10]:
+        # First 10 alphabetically, without copying or sorting the whole set
+        for company in heapq.nsmallest(10, unreviewed):
             logger.error(f"    - {company}")
         if len(unreviewed) > 10:
             logger.error(f"    ... and {len(unreviewed) - 10} more")
@@ -239,35 +260,47 @@ def promote_to_final(input_path: Path, output_path: Path) -> Dict[str, int]:
         return {}
 
     logger.info(f"Reading working data from: {input_path}")
-
-    # Load data
-    rows = []
-    with open(input_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            # Select only production columns
-            production_row = {}
-            for col in PRODUCTION_COLUMNS:
-                production_row[col] = row.get(col, "")
-
-            rows.append(production_row)
-
-    logger.info(f"Loaded {len(rows)} companies")
-
-    # Write to final
     logger.info(f"Writing to final: {output_path}")
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=PRODUCTION_COLUMNS)
-        writer.writeheader()
-        writer.writerows(rows)
+    # Rows go straight from input to output, one at a time; the final file
+    # only replaces the previous one once every row has been written
+    total = 0
+    with open(input_path, 'r', encoding='utf-8') as f, \
+            atomic_write(output_path, encoding='utf-8', newline='') as out:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        writer = csv.writer(out)
+        writer.writerow(PRODUCTION_COLUMNS)
+
+        # Input position of each production column (None if absent), worked
+        # out once so the per-row work is a flat index lookup; a repeated
+        # header keeps its last position, as csv.DictReader does
+        positions = {name: i for i, name in enumerate(header) if name in PRODUCTION_COLUMN_SET}
+        idx = tuple(positions.get(col) for col in PRODUCTION_COLUMNS)
+        width = len(header)
+
+        def production_rows():
+            nonlocal total
+            for row in reader:
+                if not row:
+                    continue  # Blank line (csv.DictReader skips these too)
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+
+                # Select only production columns
+                total += 1
+                yield [row[i] if i is not None else "" for i in idx]
+
+        # writerows drives the generator from C, one row at a time
+        writer.writerows(production_rows())
+
+    logger.info(f"Promoted {total} companies")
 
     # Statistics
     stats = {
-        "total": len(rows),
+        "total": total,
     }
 
     return stats
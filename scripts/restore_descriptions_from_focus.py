@@ -4,8 +4,14 @@ Restore descriptions from original verbose focus areas
 Uses the original database to populate empty description fields
 """
 
+import sys
 import sqlite3
 import logging
+from itertools import groupby, islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.db.indexes import ensure_empty_description_index
 
 # Setup logging
 logging.basicConfig(
@@ -22,82 +28,75 @@ def restore_descriptions(
     """
     Restore descriptions from original verbose focus areas
     """
-    # Connect to both databases
+    # Connect to the current database with the original attached, so the
+    # focus areas of every company can be fetched in one query
     current_conn = sqlite3.connect(current_db)
     current_cursor = current_conn.cursor()
+    current_cursor.execute("ATTACH DATABASE ? AS orig", (original_db,))
+
+    # Keep the JOIN's transient index and sort in memory and give the page
+    # cache ~64 MB so the update pass finds its pages warm
+    current_cursor.execute("PRAGMA temp_store = MEMORY")
+    current_cursor.execute("PRAGMA cache_size = -64000")
 
-    original_conn = sqlite3.connect(original_db)
-    original_cursor = original_conn.cursor()
+    # Dry runs leave the database untouched, schema included
+    if not dry_run:
+        ensure_empty_description_index(current_cursor)
 
     logger.info("=" * 70)
     logger.info("RESTORING DESCRIPTIONS FROM ORIGINAL FOCUS AREAS")
     logger.info("=" * 70)
 
-    # Get companies without descriptions
+    # Count companies without and with descriptions in one scan; every
+    # update fills an empty one, so the total afterwards needs no rescan
     current_cursor.execute("""
-        SELECT company_id, company_name, description
+        SELECT COUNT(*) - COUNT(NULLIF(description, '')), COUNT(NULLIF(description, ''))
         FROM companies
-        WHERE description IS NULL OR description = ''
     """)
+    without_desc, total_with_desc = current_cursor.fetchone()
+    logger.info(f"Found {without_desc} companies without descriptions")
 
-    companies_without_desc = current_cursor.fetchall()
-    logger.info(f"Found {len(companies_without_desc)} companies without descriptions")
+    # Original verbose focus areas of every such company, longest first
+    current_cursor.execute("""
+        SELECT c.company_id, c.company_name, fa.focus_area
+        FROM companies c
+        JOIN orig.company_focus_areas fa ON fa.company_id = c.company_id
+        WHERE (c.description IS NULL OR c.description = '')
+        AND LENGTH(fa.focus_area) > 30
+        ORDER BY c.company_id, LENGTH(fa.focus_area) DESC
+    """)
 
     updates = []
 
-    for company_id, company_name, _ in companies_without_desc:
-        # Get original verbose focus areas for this company
-        original_cursor.execute("""
-            SELECT focus_area
-            FROM company_focus_areas
-            WHERE company_id = ?
-            AND LENGTH(focus_area) > 30
-            ORDER BY LENGTH(focus_area) DESC
-        """, (company_id,))
+    for (company_id, company_name), rows in groupby(current_cursor, key=lambda row: row[:2]):
+        # Use the longest (most descriptive) focus area as description; if
+        # there are several, combine the longest 3
+        description = ". ".join(row[2] for row in islice(rows, 3))
 
-        verbose_focus_areas = original_cursor.fetchall()
+        updates.append((description, company_id))
 
-        if verbose_focus_areas:
-            # Use the longest (most descriptive) focus area as description
-            description = verbose_focus_areas[0][0]
-
-            # If multiple verbose focus areas, combine them
-            if len(verbose_focus_areas) > 1:
-                all_verbose = [fa[0] for fa in verbose_focus_areas[:3]]  # Max 3
-                description = ". ".join(all_verbose)
-
-            updates.append((description, company_id))
-
-            if len(updates) <= 5:  # Show first 5 examples
-                logger.info(f"\nCompany: {company_name}")
-                logger.info(f"  New description: {description[:100]}...")
+        if len(updates) <= 5:  # Show first 5 examples
+            logger.info(f"\nCompany: {company_name}")
+            logger.info(f"  New description: {description[:100]}...")
 
     logger.info(f"\nWill update {len(updates)} company descriptions")
 
     if not dry_run and updates:
         logger.info("Updating descriptions...")
-        current_cursor.executemany(
-            "UPDATE companies SET description = ? WHERE company_id = ?",
-            updates
-        )
-        current_conn.commit()
+        # One transaction (and one commit) for every update
+        with current_conn:
+            current_cursor.executemany(
+                "UPDATE companies SET description = ? WHERE company_id = ?",
+                updates
+            )
         logger.info("✓ Descriptions updated successfully")
-
-        # Verify the update
-        current_cursor.execute("""
-            SELECT COUNT(*)
-            FROM companies
-            WHERE description IS NOT NULL AND description != ''
-        """)
-        total_with_desc = current_cursor.fetchone()[0]
-        logger.info(f"Total companies with descriptions now: {total_with_desc}")
+        logger.info(f"Total companies with descriptions now: {total_with_desc + len(updates)}")
 
     elif dry_run:
         logger.info("\n*** DRY RUN MODE - No changes made ***")
         logger.info(f"Would update {len(updates)} descriptions")
 
     current_conn.close()
-    original_conn.close()
 
 def main():
     import argparse
@@ -4,9 +4,15 @@ Restore descriptions from V4 verbose focus areas
 Uses the V4 companies.csv to populate empty description fields
 """
 
+import re
+import csv
+import sys
 import sqlite3
-import pandas as pd
 import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.db.indexes import ensure_empty_description_index
 
 # Setup logging
 logging.basicConfig(
@@ -15,6 +21,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Trailing legal suffix dropped before the looser name comparisons
+LEGAL_SUFFIX = re.compile(r',?\s+(inc\.?|llc|corp\.?)$', re.IGNORECASE)
+
+def clean_name(name):
+    """Lowercased company name without a trailing Inc/LLC/Corp"""
+    return LEGAL_SUFFIX.sub('', name.strip()).strip().lower()
+
 def restore_descriptions(
     db_path='data/bayarea_biotech_sources.db',
     v4_csv='data/v4_companies.csv',
@@ -23,26 +36,54 @@ def restore_descriptions(
     """
     Restore descriptions from V4 verbose focus areas
     """
-    # Load V4 data
+    # Load V4 data in one streaming pass, keeping only verbose focus areas
+    # (> 50 chars) that could be good descriptions. Each V4 name is indexed
+    # once so each company is a dict probe instead of a scan over every V4
+    # row; the first V4 row wins.
     logger.info("Loading V4 companies data...")
-    v4_df = pd.read_csv(v4_csv)
-    logger.info(f"Loaded {len(v4_df)} companies from V4")
-
-    # Filter to verbose focus areas (> 50 chars) that could be good descriptions
-    verbose_v4 = v4_df[v4_df['Focus Areas'].str.len() > 50].copy()
-    logger.info(f"Found {len(verbose_v4)} companies with verbose focus areas (>50 chars)")
+    total_v4 = 0
+    verbose_count = 0
+    by_name = {}
+    by_clean = {}
+    by_prefix = {}
+    with open(v4_csv, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            total_v4 += 1
+            focus = row.get('Focus Areas') or ''
+            if len(focus) <= 50:
+                continue
+            verbose_count += 1
+            v4_name = row.get('Company Name') or ''
+            if v4_name:
+                by_name.setdefault(v4_name.lower(), focus)
+                by_clean.setdefault(clean_name(v4_name), focus)
+                # Every run of leading words, so "Zeta Bio" finds
+                # "Zeta Bio Therapeutics" with one probe
+                words = v4_name.lower().split()
+                for end in range(1, len(words)):
+                    by_prefix.setdefault(' '.join(words[:end]), focus)
+    logger.info(f"Loaded {total_v4} companies from V4")
+    logger.info(f"Found {verbose_count} companies with verbose focus areas (>50 chars)")
 
     # Connect to current database
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    # Give the page cache ~64 MB so the update pass finds its pages warm
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA cache_size = -64000")
+
+    # Dry runs leave the database untouched, schema included
+    if not dry_run:
+        ensure_empty_description_index(cursor)
+
     logger.info("=" * 70)
     logger.info("RESTORING DESCRIPTIONS FROM V4 FOCUS AREAS")
     logger.info("=" * 70)
 
     # Get companies without descriptions
     cursor.execute("""
-        SELECT company_id, company_name, description
+        SELECT company_id, company_name, google_address
         FROM companies
         WHERE description IS NULL OR description = ''
     """)
@@ -56,25 +97,26 @@ def restore_descriptions(
 
     for company_id, company_name, _ in companies_without_desc:
         # Try to match by company name (case insensitive)
-        v4_match = verbose_v4[verbose_v4['Company Name'].str.lower() == company_name.lower()]
+        description = by_name.get(company_name.lower())
 
-        if len(v4_match) > 0:
+        if description is not None:
             matched += 1
             # Use the verbose focus area as description
-            description = v4_match.iloc[0]['Focus Areas']
             updates.append((description, company_id))
 
             if matched <= 5:  # Show first 5 examples
                 logger.info(f"\nMatched: {company_name}")
                 logger.info(f"  Description: {description[:100]}...")
         else:
-            # Try fuzzy matching by removing common suffixes
-            clean_name = company_name.replace(' Inc', '').replace(' Inc.', '').replace(' LLC', '').replace(' Corp', '').strip()
-            v4_match = verbose_v4[verbose_v4['Company Name'].str.contains(clean_name, case=False, na=False)]
-
-            if len(v4_match) > 0:
+            # Try fuzzy matching by removing common suffixes: same name
+            # without its suffix, then a V4 name that starts with it
+            clean = clean_name(company_name)
+            description = by_clean.get(clean)
+            if description is None:
+                description = by_prefix.get(' '.join(clean.split()))
+
+            if description is not None:
                 matched += 1
-                description = v4_match.iloc[0]['Focus Areas']
                 updates.append((description, company_id))
 
                 if matched <= 5:
@@ -90,31 +132,34 @@ def restore_descriptions(
         logger.info(f"\nNot matched ({len(not_matched)}): {', '.join(not_matched[:10])}")
 
     if not dry_run and updates:
-        logger.info("\nUpdating descriptions...")
-        cursor.executemany(
-            "UPDATE companies SET description = ? WHERE company_id = ?",
-            updates
-        )
-        conn.commit()
-        logger.info("✓ Descriptions updated successfully")
-
-        # Verify the update
+        # Count existing descriptions (overall and California) in one scan;
+        # every update fills an empty one, so the totals after the update
+        # follow without scanning the table again
         cursor.execute("""
-            SELECT COUNT(*)
+            SELECT COUNT(NULLIF(description, '')),
+                   COUNT(CASE WHEN google_address LIKE '%, CA %' THEN NULLIF(description, '') END)
             FROM companies
-            WHERE description IS NOT NULL AND description != ''
         """)
-        total_with_desc = cursor.fetchone()[0]
-        logger.info(f"Total companies with descriptions now: {total_with_desc}")
+        total_with_desc, ca_with_desc = cursor.fetchone()
 
-        # Check California companies specifically
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM companies
-            WHERE (description IS NOT NULL AND description != '')
-            AND google_address LIKE '%, CA %'
-        """)
-        ca_with_desc = cursor.fetchone()[0]
+        # Same test as LIKE '%, CA %' (case-insensitive for ASCII)
+        ca_ids = {
+            company_id for company_id, _, address in companies_without_desc
+            if ', ca ' in (address or '').lower()
+        }
+
+        logger.info("\nUpdating descriptions...")
+        # One transaction (and one commit) for every update
+        with conn:
+            cursor.executemany(
+                "UPDATE companies SET description = ? WHERE company_id = ?",
+                updates
+            )
+        logger.info("✓ Descriptions updated successfully")
+
+        total_with_desc += len(updates)
+        ca_with_desc += sum(1 for _, company_id in updates if company_id in ca_ids)
+        logger.info(f"Total companies with descriptions now: {total_with_desc}")
         logger.info(f"California companies with descriptions: {ca_with_desc}")
 
     elif dry_run:
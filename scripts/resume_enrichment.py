@@ -2,6 +2,7 @@
 """Resume enrichment for remaining unenriched companies."""
 
 import csv
+import sys
 import json
 from pathlib import Path
 
@@ -10,67 +11,85 @@ REFERENCE_LIST = Path("data/working/Post-Google-API-Reference-List.csv")
 COMPANIES_MERGED = Path("data/working/companies_merged.csv")
 CHUNK_DIR = Path("data/working/chunks")
 
-# Load reference list to see what's already enriched
-with open(REFERENCE_LIST, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    reference_data = {row['Original_Company_Name']: row for row in reader}
+# 1 MB file buffers: fewer read/write syscalls on the CSVs
+IO_BUFFER_SIZE = 1 << 20
 
-# Load all companies
-with open(COMPANIES_MERGED, 'r', encoding='utf-8') as f:
+# Load reference list to see what's already enriched; only the Enriched
+# flag is read later, so keep that instead of the whole row
+with open(REFERENCE_LIST, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
     reader = csv.DictReader(f)
-    all_companies = list(reader)
+    reference_unenriched = {
+        sys.intern(row['Original_Company_Name']): row.get('Enriched') == 'No'
+        for row in reader
+    }
+
+
+def is_unenriched(company):
+    """True for a company with a website that the reference list marks unenriched."""
+    return bool(company.get('Website', '')) and reference_unenriched.get(company.get('Company Name', ''), False)
 
-# Filter to unenriched companies with websites
-unenriched = []
-for idx, company in enumerate(all_companies):
-    name = company.get('Company Name', '')
-    website = company.get('Website', '')
-    ref = reference_data.get(name, {})
 
-    if website and ref.get('Enriched') == 'No':
-        company['original_index'] = idx
-        unenriched.append(company)
+# First pass: count only, so chunk sizes are known before any row is kept
+total_companies = 0
+unenriched_count = 0
+with open(COMPANIES_MERGED, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+    for company in csv.DictReader(f):
+        total_companies += 1
+        if is_unenriched(company):
+            unenriched_count += 1
 
-print(f"Total companies: {len(all_companies)}")
-print(f"Unenriched companies with websites: {len(unenriched)}")
+print(f"Total companies: {total_companies}")
+print(f"Unenriched companies with websites: {unenriched_count}")
 
-if len(unenriched) == 0:
+if unenriched_count == 0:
     print("All companies already enriched!")
     exit(0)
 
 # Create chunk directory
 CHUNK_DIR.mkdir(exist_ok=True)
 
-# Split into chunks
-chunk_size = (len(unenriched) + NUM_WORKERS - 1) // NUM_WORKERS
+# Second pass: stream unenriched companies straight into their chunk files,
+# one open chunk at a time
+chunk_size = (unenriched_count + NUM_WORKERS - 1) // NUM_WORKERS
 chunks = []
+chunk_f = None
 
-for i in range(NUM_WORKERS):
-    start_idx = i * chunk_size
-    end_idx = min((i + 1) * chunk_size, len(unenriched))
-
-    if start_idx >= len(unenriched):
-        break
-
-    chunk_companies = unenriched[start_idx:end_idx]
-    chunk_file = CHUNK_DIR / f"chunk_{i}.csv"
-
-    # Write chunk to CSV
-    if chunk_companies:
-        with open(chunk_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=chunk_companies[0].keys())
-            writer.writeheader()
-            writer.writerows(chunk_companies)
-
-        chunks.append({
-            'worker_id': i,
-            'chunk_file': str(chunk_file),
-            'start_index': int(chunk_companies[0]['original_index']),
-            'end_index': int(chunk_companies[-1]['original_index']),
-            'size': len(chunk_companies)
-        })
-
-        print(f"Worker {i}: {len(chunk_companies)} companies (indices {chunks[-1]['start_index']}-{chunks[-1]['end_index']})")
+with open(COMPANIES_MERGED, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+    reader = csv.DictReader(f)
+    fieldnames = reader.fieldnames + ['original_index']
+
+    try:
+        for idx, company in enumerate(reader):
+            if not is_unenriched(company):
+                continue
+
+            # Start the next chunk once the current one is full
+            if chunk_f is None or chunks[-1]['size'] == chunk_size:
+                if chunk_f is not None:
+                    chunk_f.close()
+                i = len(chunks)
+                chunk_file = CHUNK_DIR / f"chunk_{i}.csv"
+                chunk_f = open(chunk_file, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE)
+                writer = csv.DictWriter(chunk_f, fieldnames=fieldnames)
+                writer.writeheader()
+                chunks.append({
+                    'worker_id': i,
+                    'chunk_file': str(chunk_file),
+                    'start_index': idx,
+                    'end_index': idx,
+                    'size': 0
+                })
+
+            company['original_index'] = idx
+            writer.writerow(company)
+            chunks[-1]['end_index'] = idx
+            chunks[-1]['size'] += 1
+    finally:
+        if chunk_f is not None:
+            chunk_f.close()
+
+for chunk in chunks:
+    print(f"Worker {chunk['worker_id']}: {chunk['size']} companies (indices {chunk['start_index']}-{chunk['end_index']})")
 
 # Write worker config
 config_file = CHUNK_DIR / "worker_config.json"
@@ -11,9 +11,14 @@ Standard format:
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse, urlunparse
 
+# Distinct URLs remembered by standardize_url; scraped sources repeat the
+# same websites many times over
+URL_CACHE_SIZE = 65536
+
 
 def standardize_url(url: Optional[str]) -> Optional[str]:
     """
@@ -23,6 +28,8 @@ def standardize_url(url: Optional[str]) -> Optional[str]:
     - Remove trailing slash
     - Clean up common issues
 
+    Results are cached per input string, so repeated URLs are parsed once.
+
     Args:
         url: The URL to standardize (can be None or malformed)
 
@@ -32,6 +39,12 @@ def standardize_url(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
 
+    return _standardize_url_cached(url)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _standardize_url_cached(url: str) -> Optional[str]:
+    """standardize_url for a non-empty string (pure, so safe to cache)."""
     # Clean up the URL
     url = url.strip()
 
@@ -133,7 +146,9 @@ def batch_standardize_urls(urls: list) -> list:
     Returns:
         List of standardized URLs
     """
-    return [standardize_url(url) for url in urls]
+    # Standardize each distinct URL once, then map results back in order
+    standardized = {url: standardize_url(url) for url in dict.fromkeys(urls)}
+    return [standardized[url] for url in urls]
 
 
 # Test the standardization
@@ -69,10 +69,12 @@ class AutonomousDatasetManager:
             # Count companies in output file
             api_file = os.path.join(self.working_dir, 'api_companies.csv')
             if os.path.exists(api_file):
-                with open(api_file, 'r', encoding='utf-8') as f:
-                    count = sum(1 for _ in f) - 1  # Subtract header
-                    self.log(f"Found {count} new companies from APIs")
-                    return count
+                with open(api_file, 'rb') as f:
+                    data = f.read()
+                # Lines = newlines, plus an unterminated last line
+                count = data.count(b'\n') + (data[-1:] not in (b'', b'\n')) - 1  # Subtract header
+                self.log(f"Found {count} new companies from APIs")
+                return count
 
         except subprocess.TimeoutExpired:
             self.log("API expansion timed out", "WARNING")
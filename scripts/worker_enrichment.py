@@ -6,7 +6,6 @@ Processes a specific chunk of companies.
 
 import os
 import sys
-import json
 import csv
 from pathlib import Path
 
@@ -15,6 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.helpers import etld1, brand_token_from_etld1, name_similarity
 from config.geography import geofence_ok
+from utils.helpers import atomic_write
+from scripts.parallel_enrichment import IO_BUFFER_SIZE, load_worker_rows, read_json
 import googlemaps
 
 def calculate_confidence_score(bpg_name, details, bpg_website):
@@ -76,16 +77,14 @@ def calculate_confidence_score(bpg_name, details, bpg_website):
 
     return score, reasons
 
-def enrich_chunk(worker_id, chunk_file, output_file):
+def enrich_chunk(worker_id, worker, output_file):
     """Enrich a chunk of companies."""
 
     # Initialize Google Maps client
     gmaps = googlemaps.Client(key=os.environ['GOOGLE_MAPS_API_KEY'])
 
-    # Load chunk
-    with open(chunk_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        companies = list(reader)
+    # Load chunk (byte range of the input CSV, or a chunk file from resume_enrichment.py)
+    companies = load_worker_rows(worker)
 
     print(f"[Worker {worker_id}] Processing {len(companies)} companies")
 
@@ -149,7 +148,7 @@ def enrich_chunk(worker_id, chunk_file, output_file):
 
     # Save results
     if enriched:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        with atomic_write(output_file, newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
             writer = csv.DictWriter(f, fieldnames=enriched[0].keys())
             writer.writeheader()
             writer.writerows(enriched)
@@ -158,7 +157,7 @@ def enrich_chunk(worker_id, chunk_file, output_file):
     # Save failed
     if failed:
         failed_file = output_file.replace('.csv', '_failed.csv')
-        with open(failed_file, 'w', newline='', encoding='utf-8') as f:
+        with atomic_write(failed_file, newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
             writer = csv.DictWriter(f, fieldnames=failed[0].keys())
             writer.writeheader()
             writer.writerows(failed)
@@ -175,14 +174,15 @@ def main():
 
     # Load worker config
     config_file = Path("data/working/chunks/worker_config.json")
-    with open(config_file) as f:
-        workers = json.load(f)
+    workers = read_json(config_file)
 
     worker = workers[worker_id]
-    chunk_file = worker['chunk_file']
-    output_file = chunk_file.replace('.csv', '_enriched.csv')
+    if 'output_file' in worker:
+        output_file = worker['output_file']
+    else:
+        output_file = worker['chunk_file'].replace('.csv', '_enriched.csv')
 
-    enrich_chunk(worker_id, chunk_file, output_file)
+    enrich_chunk(worker_id, worker, output_file)
 
 if __name__ == "__main__":
     main()
@@ -14,6 +14,8 @@ import re
 # Import secure configuration
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.secure_config import get_config
+from utils.helpers import atomic_write
+from scripts.parallel_enrichment import IO_BUFFER_SIZE, load_worker_rows, read_json
 
 # Get configuration
 config = get_config()
@@ -215,20 +217,22 @@ def main():
         exit(1)
 
     worker_id = int(sys.argv[1])
-    chunk_file = Path(f"data/working/chunks/chunk_{worker_id}.csv")
+    config_file = Path("data/working/chunks/worker_config.json")
     output_file = Path(f"data/working/chunks/chunk_{worker_id}_enriched.csv")
 
-    if not chunk_file.exists():
-        print(f"[Worker {worker_id}] No chunk file found")
+    workers = []
+    if config_file.exists():
+        workers = read_json(config_file)
+
+    if worker_id >= len(workers):
+        print(f"[Worker {worker_id}] No chunk assigned")
         exit(0)
 
     # Initialize Google Maps client
     gmaps = GoogleMapsClient(key=API_KEY)
 
-    # Read companies
-    with open(chunk_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        companies = list(reader)
+    # Read companies (byte range of the input CSV, or a chunk file from resume_enrichment.py)
+    companies = load_worker_rows(workers[worker_id])
 
     print(f"[Worker {worker_id}] Processing {len(companies)} companies")
 
@@ -279,7 +283,7 @@ def main():
     # Write results
     if enriched:
         fieldnames = list(enriched[0].keys())
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        with atomic_write(output_file, newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(enriched)
@@ -289,7 +293,7 @@ def main():
             'Google_Address', 'Google_Name', 'Google_Website',
             'Confidence_Score', 'Search_Query', 'Latitude', 'Longitude'
         ]
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        with atomic_write(output_file, newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
 
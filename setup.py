@@ -31,12 +31,20 @@ setup(
         "requests>=2.25.0",
         "googlemaps>=4.10.0",
         "beautifulsoup4>=4.9.0",
-        "pandas>=1.2.0",
+        "pandas>=1.5.0",
+        "numpy>=1.21.0",
         "python-dotenv>=0.19.0",
         "tenacity>=8.0.0",  # For retry logic
         "validators>=0.18.0",  # For input validation
     ],
     extras_require={
+        "monitor": [
+            "watchdog>=2.0",  # Event-driven refresh in scripts/monitor_progress.py
+        ],
+        "fast-json": [
+            "orjson>=3.0",  # JSON in scripts/parallel_enrichment.py and scripts/path_b_enrichment.py
+            "fastjsonschema>=2.15",  # Compiled result validation in scripts/path_b_enrichment.py
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -0,0 +1,120 @@
+"""
+Tests for generate_review_queues.py script.
+
+Tests include:
+- Tier calculation thresholds
+- Confidence extraction from parsed rows
+- Review queue generation (spot check + Tier 4)
+
+Author: Bay Area Biotech Map V4.3
+Date: 2025-11-16
+"""
+
+import sys
+import csv
+import numpy as np
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Import script functions
+from scripts.generate_review_queues import (
+    calculate_tiers,
+    generate_review_queues,
+)
+
+
+# ============================================================================
+# Test calculate_tiers
+# ============================================================================
+
+def _reference_tier(confidence):
+    """Original if/elif cascade, kept as an oracle for calculate_tiers."""
+    if confidence >= 0.95:
+        return 1
+    elif confidence >= 0.90:
+        return 2
+    elif confidence >= 0.75:
+        return 3
+    else:
+        return 4
+
+
+def test_calculate_tiers_matches_reference():
+    """Test vectorized tier calculation against the if/elif cascade."""
+    scores = np.array([0.0, 0.749, 0.75, 0.89, 0.9, 0.94, 0.95, 1.0])
+
+    tiers = calculate_tiers(scores)
+
+    assert tiers.tolist() == [_reference_tier(score) for score in scores]
+
+
+def test_calculate_tiers_returns_ints():
+    """Test that tiers are integers, not bools or floats."""
+    tiers = calculate_tiers(np.array([1.0, 0.5]))
+
+    assert tiers.dtype.kind == 'i'
+    assert tiers.tolist() == [1, 4]
+
+
+def test_calculate_tiers_nan_is_tier_4():
+    """Test that NaN confidence is treated as lowest tier."""
+    assert calculate_tiers(np.array([float("nan")])).tolist() == [4]
+
+
+# ============================================================================
+# Test generate_review_queues
+# ============================================================================
+
+def _write_csv(path, fieldnames, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+
+
+def _read_csv(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_generate_review_queues_tiers(tmp_path):
+    """Test tier statistics and Tier 4 queue contents."""
+    input_file = tmp_path / "companies_focused.csv"
+    _write_csv(input_file, ['Company Name', 'Confidence', 'Confidence_Det'], [
+        ['Genentech', '0.97', ''],
+        ['BioMarin', '', '0.92'],
+        ['Gilead', '0.80', ''],
+        ['Unknown Bio', '', ''],
+    ])
+
+    stats = generate_review_queues(
+        input_file, tmp_path / "spot_check.csv", tmp_path / "tier_4.csv"
+    )
+
+    assert stats["total"] == 4
+    assert stats["tier_1"] == 1
+    assert stats["tier_2"] == 1
+    assert stats["tier_3"] == 1
+    assert stats["tier_4"] == 1
+    assert stats["spot_check_size"] == 2
+
+    tier_4 = _read_csv(tmp_path / "tier_4.csv")
+    assert len(tier_4) == 1
+    assert tier_4[0]['Company Name'] == 'Unknown Bio'
+    assert tier_4[0]['Tier'] == '4'
+    assert tier_4[0]['Confidence_Score'] == '0.000'
+
+    spot_check = _read_csv(tmp_path / "spot_check.csv")
+    assert {row['Company Name'] for row in spot_check} == {'Genentech', 'BioMarin'}
+    assert all(row['Tier'] in ('1', '2') for row in spot_check)
+
+
+def test_generate_review_queues_missing_input(tmp_path):
+    """Test that a missing input file returns empty stats."""
+    stats = generate_review_queues(
+        tmp_path / "missing.csv", tmp_path / "spot_check.csv", tmp_path / "tier_4.csv"
+    )
+
+    assert stats == {}
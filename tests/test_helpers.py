@@ -7,6 +7,7 @@ Tests cover:
 - Company name normalization and similarity
 - Multi-tenant address handling
 - Validation logic
+- Atomic output file writes
 
 Author: Bay Area Biotech Map V4.3
 Date: 2025-11-15
@@ -24,6 +25,7 @@ from utils.helpers import (
     normalize_address,
     is_multi_tenant,
     validate_multi_tenant_match,
+    atomic_write,
 )
 
 
@@ -512,6 +514,39 @@ class TestMultiTenantValidation:
         assert result is True  # Function doesn't filter aggregators
 
 
+# ============================================================================
+# Tests for Atomic Writes
+# ============================================================================
+
+class TestAtomicWrite:
+    """Tests for atomic_write() context manager."""
+
+    def test_replaces_file_on_success(self, tmp_path):
+        """Test that the new content replaces the old file in one step."""
+        path = tmp_path / "out.csv"
+        path.write_text("old\n")
+
+        with atomic_write(path, encoding='utf-8') as f:
+            f.write("new\n")
+            assert path.read_text() == "old\n"
+
+        assert path.read_text() == "new\n"
+        assert not (tmp_path / "out.csv.tmp").exists()
+
+    def test_keeps_original_on_error(self, tmp_path):
+        """Test that a failed write leaves the old file and no temp file."""
+        path = tmp_path / "out.csv"
+        path.write_text("old\n")
+
+        with pytest.raises(ValueError):
+            with atomic_write(path, encoding='utf-8') as f:
+                f.write("partial")
+                raise ValueError("boom")
+
+        assert path.read_text() == "old\n"
+        assert not (tmp_path / "out.csv.tmp").exists()
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
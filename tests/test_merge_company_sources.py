@@ -24,11 +24,13 @@ scripts_dir = Path(__file__).parent.parent / 'scripts'
 sys.path.insert(0, str(scripts_dir))
 
 from merge_company_sources import (
+    Company,
     deduplicate_by_etld1_and_name,
     check_and_reset_aggregators,
     apply_geofence,
     generate_domain_reuse_report,
     save_companies,
+    _read_source_columns,
 )
 
 
@@ -38,8 +40,8 @@ class TestDeduplication:
     def test_dedupe_same_domain_same_name(self):
         """Test deduplication with same eTLD+1 and normalized name."""
         companies = [
-            {'Company Name': 'Genentech, Inc.', 'Website': 'https://www.gene.com', 'City': 'South San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Genentech', 'Website': 'https://gene.com/about', 'City': 'South San Francisco', 'source': 'Existing', 'Address': '1 DNA Way', 'Company Stage': 'Public', 'Focus Areas': 'Biotechnology'},
+            Company('Genentech, Inc.', website='https://www.gene.com', city='South San Francisco', source='BPG'),
+            Company('Genentech', website='https://gene.com/about', city='South San Francisco', address='1 DNA Way', stage='Public', focus='Biotechnology', source='Existing'),
         ]
 
         deduplicated, conflicts = deduplicate_by_etld1_and_name(companies)
@@ -47,17 +49,17 @@ class TestDeduplication:
         # Should merge to single company
         assert len(deduplicated) == 1
         # Should prefer BPG (source priority)
-        assert deduplicated[0]['source'] == 'BPG'
+        assert deduplicated[0].source == 'BPG'
         # Should have same domain
-        assert 'gene.com' in deduplicated[0]['Website']
+        assert 'gene.com' in deduplicated[0].website
         # No conflicts (same normalized name)
         assert len(conflicts) == 0
 
     def test_dedupe_same_domain_different_names(self):
         """Test domain-reuse detection with same eTLD+1, different names."""
         companies = [
-            {'Company Name': 'Test Biotech', 'Website': 'https://www.testbio.com', 'City': 'San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Different Company', 'Website': 'https://www.testbio.com', 'City': 'San Francisco', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Test Biotech', website='https://www.testbio.com', city='San Francisco', source='BPG'),
+            Company('Different Company', website='https://www.testbio.com', city='San Francisco', source='Wikipedia'),
         ]
 
         deduplicated, conflicts = deduplicate_by_etld1_and_name(companies)
@@ -71,8 +73,8 @@ class TestDeduplication:
     def test_dedupe_different_domains_same_name(self):
         """Test deduplication with different eTLD+1s but same normalized name."""
         companies = [
-            {'Company Name': 'BioMarin Pharmaceutical', 'Website': 'https://www.biomarin.com', 'City': 'San Rafael', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'BioMarin Pharmaceutical Inc.', 'Website': 'https://www.biomarin-pharma.com', 'City': 'San Rafael', 'source': 'Existing', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('BioMarin Pharmaceutical', website='https://www.biomarin.com', city='San Rafael', source='BPG'),
+            Company('BioMarin Pharmaceutical Inc.', website='https://www.biomarin-pharma.com', city='San Rafael', source='Existing'),
         ]
 
         deduplicated, conflicts = deduplicate_by_etld1_and_name(companies)
@@ -85,8 +87,8 @@ class TestDeduplication:
     def test_dedupe_no_website(self):
         """Test deduplication for companies without websites."""
         companies = [
-            {'Company Name': 'Startup Bio Inc.', 'Website': '', 'City': 'San Francisco', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Startup Bio', 'Website': '', 'City': 'San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Startup Bio Inc.', city='San Francisco', source='Wikipedia'),
+            Company('Startup Bio', city='San Francisco', source='BPG'),
         ]
 
         deduplicated, conflicts = deduplicate_by_etld1_and_name(companies)
@@ -94,22 +96,22 @@ class TestDeduplication:
         # Should merge by name (both have no website)
         assert len(deduplicated) == 1
         # Should prefer BPG
-        assert deduplicated[0]['source'] == 'BPG'
+        assert deduplicated[0].source == 'BPG'
 
     def test_dedupe_priority_order(self):
         """Test that BPG > Existing > Wikipedia priority is respected."""
         companies = [
-            {'Company Name': 'Test Company', 'Website': 'https://test.com', 'City': 'Berkeley', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': 'Wiki data'},
-            {'Company Name': 'Test Company Inc', 'Website': 'https://test.com', 'City': 'Berkeley', 'source': 'Existing', 'Address': '123 Main St', 'Company Stage': 'Private', 'Focus Areas': 'Existing data'},
-            {'Company Name': 'Test Company', 'Website': 'https://test.com', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': 'BPG data'},
+            Company('Test Company', website='https://test.com', city='Berkeley', focus='Wiki data', source='Wikipedia'),
+            Company('Test Company Inc', website='https://test.com', city='Berkeley', address='123 Main St', stage='Private', focus='Existing data', source='Existing'),
+            Company('Test Company', website='https://test.com', city='Berkeley', focus='BPG data', source='BPG'),
         ]
 
         deduplicated, conflicts = deduplicate_by_etld1_and_name(companies)
 
         # Should keep only BPG version
         assert len(deduplicated) == 1
-        assert deduplicated[0]['source'] == 'BPG'
-        assert deduplicated[0]['Focus Areas'] == 'BPG data'
+        assert deduplicated[0].source == 'BPG'
+        assert deduplicated[0].focus == 'BPG data'
 
 
 class TestAggregatorHandling:
@@ -118,7 +120,7 @@ class TestAggregatorHandling:
     def test_aggregator_detection_linkedin(self):
         """Test LinkedIn aggregator detection."""
         companies = [
-            {'Company Name': 'Bio Company', 'Website': 'https://www.linkedin.com/company/biocompany', 'City': 'Oakland', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Bio Company', website='https://www.linkedin.com/company/biocompany', city='Oakland', source='Wikipedia'),
         ]
 
         modified, count = check_and_reset_aggregators(companies)
@@ -126,36 +128,36 @@ class TestAggregatorHandling:
         # Should detect LinkedIn as aggregator
         assert count == 1
         # Should reset Website to empty
-        assert modified[0]['Website'] == ''
+        assert modified[0].website == ''
 
     def test_aggregator_detection_biopharmguy(self):
         """Test BioPharmGuy aggregator detection."""
         companies = [
-            {'Company Name': 'Listed Company', 'Website': 'https://biopharmguy.com/links/company123', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Listed Company', website='https://biopharmguy.com/links/company123', city='Berkeley', source='BPG'),
         ]
 
         modified, count = check_and_reset_aggregators(companies)
 
         # Should detect BioPharmGuy as aggregator
         assert count == 1
-        assert modified[0]['Website'] == ''
+        assert modified[0].website == ''
 
     def test_aggregator_detection_wixsite(self):
         """Test Wixsite aggregator detection."""
         companies = [
-            {'Company Name': 'Wix Biotech', 'Website': 'https://mybiotech.wixsite.com/home', 'City': 'San Francisco', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Wix Biotech', website='https://mybiotech.wixsite.com/home', city='San Francisco', source='Wikipedia'),
         ]
 
         modified, count = check_and_reset_aggregators(companies)
 
         # Should detect Wixsite as aggregator
         assert count == 1
-        assert modified[0]['Website'] == ''
+        assert modified[0].website == ''
 
     def test_non_aggregator(self):
         """Test that legitimate domains are not flagged."""
         companies = [
-            {'Company Name': 'Genentech', 'Website': 'https://www.gene.com', 'City': 'South San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Genentech', website='https://www.gene.com', city='South San Francisco', source='BPG'),
         ]
 
         modified, count = check_and_reset_aggregators(companies)
@@ -163,7 +165,7 @@ class TestAggregatorHandling:
         # Should NOT detect as aggregator
         assert count == 0
         # Website should be preserved
-        assert modified[0]['Website'] == 'https://www.gene.com'
+        assert modified[0].website == 'https://www.gene.com'
 
 
 class TestGeofencing:
@@ -172,9 +174,9 @@ class TestGeofencing:
     def test_geofence_bay_area_city(self):
         """Test geofence accepts Bay Area cities."""
         companies = [
-            {'Company Name': 'SF Biotech', 'Website': 'https://sfbio.com', 'City': 'San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'SSF Pharma', 'Website': 'https://ssfpharma.com', 'City': 'South San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Berkeley Bio', 'Website': 'https://berkbio.com', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('SF Biotech', website='https://sfbio.com', city='San Francisco', source='BPG'),
+            Company('SSF Pharma', website='https://ssfpharma.com', city='South San Francisco', source='BPG'),
+            Company('Berkeley Bio', website='https://berkbio.com', city='Berkeley', source='BPG'),
         ]
 
         filtered = apply_geofence(companies)
@@ -185,9 +187,9 @@ class TestGeofencing:
     def test_geofence_rejects_out_of_area(self):
         """Test geofence rejects cities outside Bay Area."""
         companies = [
-            {'Company Name': 'Davis Biotech', 'Website': 'https://davisbio.com', 'City': 'Davis', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Sacramento Pharma', 'Website': 'https://sacpharma.com', 'City': 'Sacramento', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'LA Biotech', 'Website': 'https://labio.com', 'City': 'Los Angeles', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Davis Biotech', website='https://davisbio.com', city='Davis', source='BPG'),
+            Company('Sacramento Pharma', website='https://sacpharma.com', city='Sacramento', source='BPG'),
+            Company('LA Biotech', website='https://labio.com', city='Los Angeles', source='Wikipedia'),
         ]
 
         filtered = apply_geofence(companies)
@@ -198,16 +200,16 @@ class TestGeofencing:
     def test_geofence_mixed(self):
         """Test geofence with mixed in/out of area."""
         companies = [
-            {'Company Name': 'SF Biotech', 'Website': 'https://sfbio.com', 'City': 'San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Davis Biotech', 'Website': 'https://davisbio.com', 'City': 'Davis', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'Berkeley Bio', 'Website': 'https://berkbio.com', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('SF Biotech', website='https://sfbio.com', city='San Francisco', source='BPG'),
+            Company('Davis Biotech', website='https://davisbio.com', city='Davis', source='BPG'),
+            Company('Berkeley Bio', website='https://berkbio.com', city='Berkeley', source='BPG'),
         ]
 
         filtered = apply_geofence(companies)
 
         # Only SF and Berkeley should pass
         assert len(filtered) == 2
-        cities = {c['City'] for c in filtered}
+        cities = {c.city for c in filtered}
         assert 'San Francisco' in cities
         assert 'Berkeley' in cities
         assert 'Davis' not in cities
@@ -215,9 +217,9 @@ class TestGeofencing:
     def test_geofence_city_variants(self):
         """Test geofence handles city name variants."""
         companies = [
-            {'Company Name': 'SSF Bio 1', 'Website': 'https://ssf1.com', 'City': 'South San Francisco', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'SSF Bio 2', 'Website': 'https://ssf2.com', 'City': 'South SF', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
-            {'Company Name': 'SSF Bio 3', 'Website': 'https://ssf3.com', 'City': 'S San Francisco', 'source': 'Wikipedia', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('SSF Bio 1', website='https://ssf1.com', city='South San Francisco', source='BPG'),
+            Company('SSF Bio 2', website='https://ssf2.com', city='South SF', source='Wikipedia'),
+            Company('SSF Bio 3', website='https://ssf3.com', city='S San Francisco', source='Wikipedia'),
         ]
 
         filtered = apply_geofence(companies)
@@ -280,7 +282,7 @@ class TestOutputValidation:
     def test_save_to_working_directory(self):
         """Test that save_companies accepts working/ path."""
         companies = [
-            {'Company Name': 'Test Bio', 'Website': 'https://test.com', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Test Bio', website='https://test.com', city='Berkeley', source='BPG'),
         ]
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -302,10 +304,29 @@ class TestOutputValidation:
                 assert rows[0]['Company Name'] == 'Test Bio'
                 assert rows[0]['Validation_Source'] == 'BPG'
 
+    def test_save_unsorted_keeps_merge_order(self):
+        """Test that sort=False streams companies in the order given."""
+        companies = [
+            Company('Zeta Bio', website='https://zeta.com', city='Berkeley', source='BPG'),
+            Company('Alpha Bio', website='https://alpha.com', city='Oakland', source='Existing'),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            working_dir = Path(tmpdir) / 'working'
+            working_dir.mkdir()
+            output_path = working_dir / 'companies_merged.csv'
+
+            saved = save_companies(iter(companies), output_path, sort=False)
+            assert saved == 2
+
+            with open(output_path, 'r') as f:
+                rows = list(csv.DictReader(f))
+                assert [row['Company Name'] for row in rows] == ['Zeta Bio', 'Alpha Bio']
+
     def test_save_rejects_non_working_path(self):
         """Test that save_companies rejects paths not in working/."""
         companies = [
-            {'Company Name': 'Test Bio', 'Website': 'https://test.com', 'City': 'Berkeley', 'source': 'BPG', 'Address': '', 'Company Stage': '', 'Focus Areas': ''},
+            Company('Test Bio', website='https://test.com', city='Berkeley', source='BPG'),
         ]
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -318,6 +339,41 @@ class TestOutputValidation:
                 save_companies(companies, output_path)
 
 
+class TestSourceLoading:
+    """Tests for reading source CSV columns."""
+
+    COLUMNS = ['Company Name', 'Website', 'City']
+
+    def test_read_missing_columns_as_empty(self, tmp_path):
+        """Test that wanted columns absent from the file come back as ''."""
+        source = tmp_path / 'source.csv'
+        source.write_text('Company Name,Notes\n Genentech ,x\n', encoding='utf-8')
+
+        df = _read_source_columns(source, self.COLUMNS)
+
+        assert list(df.columns) == self.COLUMNS
+        assert df.values.tolist() == [['Genentech', '', '']]
+
+    @pytest.mark.parametrize('content', ['', 'Website,City\n'])
+    def test_empty_source_loads_as_empty_frame(self, tmp_path, content):
+        """Test that zero-byte and header-only files load without 'Company Name'."""
+        source = tmp_path / 'source.csv'
+        source.write_text(content, encoding='utf-8')
+
+        df = _read_source_columns(source, self.COLUMNS)
+
+        assert list(df.columns) == self.COLUMNS
+        assert len(df) == 0
+
+    def test_rows_without_company_name_rejected(self, tmp_path):
+        """Test that a file with rows but no 'Company Name' column is an error."""
+        source = tmp_path / 'source.csv'
+        source.write_text('Name,Notes\nGenentech,x\n', encoding='utf-8')
+
+        with pytest.raises(ValueError, match='Company Name'):
+            _read_source_columns(source, self.COLUMNS)
+
+
 class TestIntegration:
     """Integration tests for full merge workflow."""
 
@@ -334,15 +390,13 @@ class TestIntegration:
         with open(fixture_path, 'r') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                companies.append({
-                    'Company Name': row['Company Name'],
-                    'Website': row['Website'],
-                    'City': row['City'],
-                    'source': 'BPG',
-                    'Address': '',
-                    'Company Stage': '',
-                    'Focus Areas': row.get('Notes', ''),
-                })
+                companies.append(Company(
+                    row['Company Name'],
+                    website=row['Website'],
+                    city=row['City'],
+                    focus=row.get('Notes', ''),
+                    source='BPG',
+                ))
 
         # Check and reset aggregators
         companies, agg_count = check_and_reset_aggregators(companies)
@@ -360,7 +414,7 @@ class TestIntegration:
         geofenced = apply_geofence(deduplicated)
 
         # Should filter out Davis and Sacramento
-        cities = {c['City'] for c in geofenced}
+        cities = {c.city for c in geofenced}
         assert 'Davis' not in cities
         assert 'Sacramento' not in cities
         # Should keep Bay Area cities
@@ -24,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from scripts.merge_enrichment_outputs import (
     load_csv,
     deduplicate_companies,
+    deduplicate_frame,
     normalize_fields,
 )
 
@@ -164,6 +165,47 @@ def test_deduplicate_companies_confidence_det_vs_confidence():
     assert result[0]['Confidence_Det'] == '0.95'
 
 
+def test_deduplicate_companies_unparseable_confidence():
+    """Test that blank or non-numeric confidence counts as 0.0."""
+    companies = [
+        {'Company Name': 'Genentech', 'Website': 'https://www.gene.com', 'Confidence': 'high', 'Address': '1 DNA Way'},
+        {'Company Name': 'Genentech', 'Website': 'https://www.gene.com', 'Confidence': ' 0.10 ', 'Address': ''},
+        {'Company Name': 'BioMarin', 'Website': 'https://www.biomarin.com', 'Confidence': '', 'Address': ''},
+        {'Company Name': 'BioMarin', 'Website': 'https://www.biomarin.com', 'Confidence': 'n/a', 'Address': '770 Lindaro St'},
+    ]
+
+    result = deduplicate_companies(companies)
+
+    # Genentech: 0.10 beats unparseable; BioMarin: both 0.0, more complete wins
+    assert [company['Confidence'] for company in result] == [' 0.10 ', 'n/a']
+
+
+def test_deduplicate_frame_matches_companies():
+    """Test DataFrame deduplication keeps the same rows as the dict version."""
+    import pandas as pd
+
+    path_a = pd.DataFrame({
+        'Company Name': ['Genentech', 'Gilead', ''],
+        'Confidence_Det': ['0.80', '0.90', '0.99'],
+    })
+    path_b = pd.DataFrame({
+        'Company Name': ['genentech ', 'BioMarin'],
+        'Confidence': ['0.95', '0.70'],
+    })
+    combined = pd.concat([path_a, path_b], ignore_index=True, sort=False)
+    companies = [
+        {key: value for key, value in row.items() if pd.notna(value)}
+        for row in combined.to_dict('records')
+    ]
+
+    result = deduplicate_frame(combined)
+
+    assert list(result['Company Name']) == [
+        company['Company Name'] for company in deduplicate_companies(companies)
+    ]
+    assert list(result['Company Name']) == ['genentech ', 'Gilead', 'BioMarin']
+
+
 # ============================================================================
 # Test normalize_fields
 # ============================================================================
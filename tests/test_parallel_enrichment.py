@@ -0,0 +1,154 @@
+"""
+Tests for parallel_enrichment.py script.
+
+Tests include:
+- Byte offsets of CSV rows (including quoted multi-line fields)
+- Loading a worker's rows from its byte range of the input CSV
+- Refusing byte ranges once the input CSV has changed
+- JSON checkpoint/config round trips with and without orjson
+
+Author: Bay Area Biotech Map V4.3
+Date: 2025-11-16
+"""
+
+import os
+import sys
+import csv
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Import script functions
+from scripts import parallel_enrichment
+from scripts.parallel_enrichment import load_worker_rows, read_json, scan_records, write_json
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _write_companies(path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Company Name', 'Website', 'Notes'])
+        writer.writerow(['Genentech', 'https://gene.com', 'plain'])
+        writer.writerow(['No Site Bio', '', ''])
+        writer.writerow(['BioMarin', 'https://biomarin.com', 'two\nlines'])
+        f.write('\r\n')  # blank line, skipped like csv.DictReader does
+        writer.writerow(['Gilead', 'https://gilead.com', 'says "hi"'])
+
+
+# ============================================================================
+# Test scan_records
+# ============================================================================
+
+def test_scan_records_offsets(tmp_path):
+    """Test that each offset points at the start of its row."""
+    input_file = tmp_path / "companies.csv"
+    _write_companies(input_file)
+    data = input_file.read_bytes()
+
+    with open(input_file, 'rb') as f:
+        records = list(scan_records(f))
+
+    assert [row[0] for _, row in records] == [
+        'Company Name', 'Genentech', 'No Site Bio', 'BioMarin', 'Gilead'
+    ]
+    assert records[3][1][2] == 'two\nlines'
+    for offset, row in records:
+        assert data[offset:].startswith(row[0].encode('utf-8'))
+
+
+# ============================================================================
+# Test read_json / write_json
+# ============================================================================
+
+def test_json_round_trip_without_orjson(tmp_path):
+    """Test that orjson and the stdlib fallback read each other's output."""
+    data = {"processed_indices": [0, 5, 1000000], "note": "Genentech"}
+    fast = tmp_path / "fast.json"
+    slow = tmp_path / "slow.json"
+
+    write_json(fast, data)
+    with patch.object(parallel_enrichment, 'orjson', None):
+        write_json(slow, data)
+        assert read_json(fast) == data
+
+    assert read_json(slow) == data
+    assert json.loads(fast.read_text()) == data
+
+
+def test_invalid_checkpoint_is_backed_up(tmp_path):
+    """Test that a malformed checkpoint is moved aside and ignored."""
+    input_file = tmp_path / "companies.csv"
+    _write_companies(input_file)
+    checkpoint = tmp_path / ".checkpoint_enrichment.json"
+    checkpoint.write_text('{"processed_indices": [0,')
+    chunk_dir = tmp_path / "chunks"
+
+    with patch.object(parallel_enrichment, 'INPUT_CSV', input_file), \
+         patch.object(parallel_enrichment, 'CHECKPOINT_FILE', checkpoint), \
+         patch.object(parallel_enrichment, 'CHUNK_DIR', chunk_dir):
+        parallel_enrichment.main()
+
+    assert not checkpoint.exists()
+    assert (tmp_path / ".checkpoint_enrichment.corrupt.json").exists()
+    workers = read_json(chunk_dir / "worker_config.json")
+    assert sum(worker['size'] for worker in workers) == 3
+
+
+# ============================================================================
+# Test main + load_worker_rows
+# ============================================================================
+
+def test_workers_read_their_byte_ranges(tmp_path):
+    """Test that workers get exactly the unprocessed Path A companies."""
+    input_file = tmp_path / "companies.csv"
+    _write_companies(input_file)
+    checkpoint = tmp_path / ".checkpoint_enrichment.json"
+    checkpoint.write_text(json.dumps({"processed_indices": [0]}))
+    chunk_dir = tmp_path / "chunks"
+
+    with patch.object(parallel_enrichment, 'INPUT_CSV', input_file), \
+         patch.object(parallel_enrichment, 'CHECKPOINT_FILE', checkpoint), \
+         patch.object(parallel_enrichment, 'CHUNK_DIR', chunk_dir), \
+         patch.object(parallel_enrichment, 'NUM_WORKERS', 2):
+        parallel_enrichment.main()
+
+    with open(chunk_dir / "worker_config.json") as f:
+        workers = json.load(f)
+
+    assert not list(chunk_dir.glob("chunk_*.csv"))
+    rows = [row for worker in workers for row in load_worker_rows(worker)]
+    assert [(row['original_index'], row['Company Name']) for row in rows] == [
+        (2, 'BioMarin'), (3, 'Gilead')
+    ]
+    assert rows[0]['Notes'] == 'two\nlines'
+    assert rows[1]['Notes'] == 'says "hi"'
+
+
+def test_workers_refuse_changed_input(tmp_path):
+    """Test that workers stop if the input CSV changed after the config was written."""
+    input_file = tmp_path / "companies.csv"
+    _write_companies(input_file)
+    chunk_dir = tmp_path / "chunks"
+
+    with patch.object(parallel_enrichment, 'INPUT_CSV', input_file), \
+         patch.object(parallel_enrichment, 'CHECKPOINT_FILE', tmp_path / "missing.json"), \
+         patch.object(parallel_enrichment, 'CHUNK_DIR', chunk_dir):
+        parallel_enrichment.main()
+
+    worker = read_json(chunk_dir / "worker_config.json")[0]
+    assert len(load_worker_rows(worker)) == worker['size']
+
+    # Same size, newer mtime: offsets can no longer be trusted
+    stat = input_file.stat()
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(ValueError, match="changed since worker_config.json"):
+        load_worker_rows(worker)
+
@@ -14,6 +14,7 @@ Date: 2025-11-16
 
 import sys
 import json
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
@@ -27,6 +28,12 @@ from scripts.path_b_enrichment import (
     GET_PLACE_DETAILS_TOOL,
     COMPANY_ENRICHMENT_SCHEMA,
     AnthropicUsageCounter,
+    PlacesCache,
+    RateLimiter,
+    EnrichmentMemo,
+    make_gmaps_client,
+    dumps_json,
+    loads_json,
     search_places_tool,
     get_place_details_tool,
     accept_enrichment_result,
@@ -159,6 +166,37 @@ def test_search_places_tool_success(setup_tool_registry, mock_gmaps):
     assert result['results'][0]['name'] == 'Genentech'
 
 
+def test_tool_results_are_trimmed(setup_tool_registry, mock_gmaps):
+    """Test that tool results drop bytes the model does not need."""
+    mock_gmaps.places.return_value = {
+        'status': 'OK',
+        'results': [{
+            'place_id': 'place_123',
+            'name': 'G' * 200,
+            'formatted_address': 'A' * 300,
+            'types': ['health', 'point_of_interest', 'establishment', 'store', 'finance', 'food']
+        }]
+    }
+    mock_gmaps.place.return_value = {
+        'status': 'OK',
+        'result': {
+            'name': 'Genentech',
+            'formatted_address': '1 DNA Way, South San Francisco, CA 94080',
+            'geometry': {'location': {'lat': 37.66243219876, 'lng': -122.38011234567}}
+        }
+    }
+
+    place = search_places_tool("Genentech")['results'][0]
+    details = get_place_details_tool("place_123")
+
+    assert len(place['name']) == 80
+    assert len(place['address']) == 120
+    assert place['types'] == ['health', 'point_of_interest', 'establishment', 'store']
+    assert details['latitude'] == 37.66243
+    assert details['longitude'] == -122.38011
+    assert details['formatted_address'] == '1 DNA Way, South San Francisco, CA 94080'
+
+
 def test_search_places_tool_with_location_bias(setup_tool_registry, mock_gmaps):
     """Test search_places_tool with location bias."""
     mock_gmaps.places.return_value = {
@@ -231,6 +269,11 @@ def test_get_place_details_tool_success(setup_tool_registry, mock_gmaps):
     assert result['longitude'] == -122.3801
     assert result['business_status'] == 'OPERATIONAL'
 
+    # Only the location is requested, not the viewport
+    fields = mock_gmaps.place.call_args.kwargs['fields']
+    assert 'geometry/location' in fields
+    assert 'geometry' not in fields
+
 
 def test_get_place_details_tool_error(setup_tool_registry, mock_gmaps):
     """Test get_place_details_tool with API error."""
@@ -254,6 +297,82 @@ def test_get_place_details_tool_not_found(setup_tool_registry, mock_gmaps):
     assert 'error' in result
 
 
+# ============================================================================
+# Test Google Places Tool Cache
+# ============================================================================
+
+@pytest.fixture
+def places_cache(tmp_path):
+    """Register a PlacesCache in TOOL_REGISTRY."""
+    cache = PlacesCache(tmp_path / "places_cache.db")
+    TOOL_REGISTRY['places_cache'] = cache
+    yield cache
+    del TOOL_REGISTRY['places_cache']
+    cache.close()
+
+
+def test_places_cache_serves_repeat_calls(setup_tool_registry, mock_gmaps, places_cache):
+    """Test that a repeated tool call is answered from the cache."""
+    mock_gmaps.places.return_value = {
+        'status': 'OK',
+        'results': [{'place_id': 'abc', 'name': 'Genentech', 'formatted_address': 'SSF', 'types': []}]
+    }
+
+    first = search_places_tool("Genentech SSF")
+    second = search_places_tool(query="Genentech SSF")
+
+    assert first == second
+    assert mock_gmaps.places.call_count == 1
+    assert places_cache.hits == 1
+    assert places_cache.misses == 1
+
+
+def test_places_cache_ignores_query_case_and_spacing(setup_tool_registry, mock_gmaps, places_cache):
+    """Test that near-identical search queries share one cache entry."""
+    mock_gmaps.places.return_value = {'status': 'ZERO_RESULTS', 'results': []}
+
+    search_places_tool("Genentech  South San Francisco")
+    search_places_tool("genentech south san francisco ")
+
+    assert mock_gmaps.places.call_count == 1
+    assert places_cache.hits == 1
+
+
+def test_places_limiter_only_gates_network_calls(setup_tool_registry, mock_gmaps, places_cache):
+    """Test that the Places rate limiter is not charged for cache hits."""
+    mock_gmaps.places.return_value = {'status': 'ZERO_RESULTS', 'results': []}
+    limiter = Mock()
+    TOOL_REGISTRY['places_limiter'] = limiter
+    try:
+        search_places_tool("Genentech SSF")
+        search_places_tool("Genentech SSF")
+    finally:
+        del TOOL_REGISTRY['places_limiter']
+
+    assert limiter.wait.call_count == 1
+
+
+def test_places_cache_skips_errors(setup_tool_registry, mock_gmaps, places_cache):
+    """Test that failed tool calls are not cached."""
+    mock_gmaps.place.side_effect = Exception("quota")
+
+    get_place_details_tool("abc")
+    get_place_details_tool("abc")
+
+    assert mock_gmaps.place.call_count == 2
+
+
+def test_places_cache_expiry_and_vacuum(tmp_path):
+    """Test that expired entries are ignored and removed by vacuum."""
+    cache = PlacesCache(tmp_path / "places_cache.db", max_age_days=0)
+    cache.max_age_seconds = -1  # Everything is already expired
+    cache.put('search_places', {'query': 'x'}, {'status': 'OK'})
+
+    assert cache.get('search_places', {'query': 'x'}) is None
+    assert cache.vacuum() == 1
+    cache.close()
+
+
 # ============================================================================
 # Test AnthropicUsageCounter
 # ============================================================================
@@ -314,6 +433,173 @@ def test_anthropic_usage_counter_report():
     assert "Total tokens: 1,500" in report
 
 
+def test_anthropic_usage_counter_prompt_cache_tokens():
+    """Test that prompt cache reads/writes are tracked apart from input tokens."""
+    counter = AnthropicUsageCounter()
+
+    counter.record_usage(Mock(input_tokens=50, output_tokens=10,
+                              cache_creation_input_tokens=1200, cache_read_input_tokens=0))
+    counter.record_usage(Mock(input_tokens=60, output_tokens=10,
+                              cache_creation_input_tokens=0, cache_read_input_tokens=1200))
+    counter.record_usage(Mock(input_tokens=70, output_tokens=10,
+                              cache_creation_input_tokens=None, cache_read_input_tokens=None))
+
+    assert counter.total_input_tokens == 180
+    assert counter.total_cache_write_tokens == 1200
+    assert counter.total_cache_read_tokens == 1200
+    assert "Prompt cache reads: 1,200" in counter.report()
+    assert counter.estimated_cost() == pytest.approx(
+        180 * 3e-6 + 1200 * 3.75e-6 + 1200 * 0.3e-6 + 30 * 15e-6
+    )
+
+
+def test_anthropic_usage_counter_prices_each_model():
+    """Test that triage and escalation calls are priced at their own rates."""
+    from scripts.path_b_enrichment import ANTHROPIC_MODEL, TRIAGE_MODEL
+
+    counter = AnthropicUsageCounter()
+    counter.record_usage(Mock(input_tokens=1000, output_tokens=100,
+                              cache_creation_input_tokens=None, cache_read_input_tokens=None),
+                         TRIAGE_MODEL)
+    counter.record_usage(Mock(input_tokens=1000, output_tokens=100,
+                              cache_creation_input_tokens=None, cache_read_input_tokens=None),
+                         ANTHROPIC_MODEL)
+
+    assert counter.total_calls == 2
+    assert counter.model_usage[TRIAGE_MODEL]['input'] == 1000
+    assert counter.estimated_cost() == pytest.approx(
+        1000 * 0.8e-6 + 100 * 4e-6 + 1000 * 3e-6 + 100 * 15e-6
+    )
+    report = counter.report()
+    assert f"{TRIAGE_MODEL} (1 calls" in report
+    assert f"{ANTHROPIC_MODEL} (1 calls" in report
+
+
+# ============================================================================
+# Test RateLimiter
+# ============================================================================
+
+def test_rate_limiter_spaces_calls():
+    """Test that calls are spaced by the interval, including across threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    limiter = RateLimiter(0.05)
+    starts = []
+
+    def call(_):
+        limiter.wait()
+        starts.append(time.monotonic())
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(call, range(4)))
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(gaps) == 3
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+def test_rate_limiter_adapts_within_bounds():
+    """Test that backoff() doubles and recover() shrinks the spacing, within bounds."""
+    limiter = RateLimiter(1.0, min_interval=0.5, max_interval=3.0)
+
+    limiter.backoff()
+    assert limiter.interval == 2.0
+    limiter.backoff()
+    assert limiter.interval == 3.0
+
+    for _ in range(20):
+        limiter.recover()
+    assert limiter.interval == 0.5
+
+    fixed = RateLimiter(1.0)
+    fixed.backoff()
+    fixed.recover()
+    assert fixed.interval == 1.0
+
+
+def test_places_limiter_backs_off_on_over_query_limit(setup_tool_registry, mock_gmaps):
+    """Test that OVER_QUERY_LIMIT widens the Places spacing and success narrows it."""
+    from googlemaps.exceptions import ApiError
+
+    limiter = RateLimiter(0.01, min_interval=0.005, max_interval=0.02)
+    TOOL_REGISTRY['places_limiter'] = limiter
+    try:
+        mock_gmaps.place.side_effect = ApiError('OVER_QUERY_LIMIT')
+        get_place_details_tool("abc")
+        assert limiter.interval == 0.02
+        get_place_details_tool("abc")
+        assert limiter.interval == 0.02  # capped at max_interval
+
+        mock_gmaps.place.side_effect = None
+        mock_gmaps.place.return_value = {'status': 'OK', 'result': {}}
+        get_place_details_tool("abc")
+        assert limiter.interval == pytest.approx(0.02 / 1.1)
+    finally:
+        del TOOL_REGISTRY['places_limiter']
+
+
+def test_make_gmaps_client_pool_fits_workers():
+    """Test that the shared Google Maps session keeps a connection per worker."""
+    client = make_gmaps_client("AIza-test-key", pool_size=16)
+
+    adapter = client.session.get_adapter("https://maps.googleapis.com")
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 3
+    assert client.timeout == 10
+
+
+# ============================================================================
+# Test JSON Helpers
+# ============================================================================
+
+def test_json_helpers_match_without_orjson():
+    """Test that orjson and the stdlib fallback produce the same text."""
+    from scripts import path_b_enrichment
+
+    data = {'reasoning': 'Café Bio — Mission Bay', 'confidence': 0.85, 'types': ['establishment']}
+    fast = dumps_json(data)
+    with patch.object(path_b_enrichment, 'orjson', None):
+        slow = dumps_json(data)
+        assert loads_json(fast) == data
+
+    assert fast == slow
+    assert loads_json(slow) == data
+    with pytest.raises(json.JSONDecodeError):
+        loads_json('{"confidence":')
+
+
+# ============================================================================
+# Test EnrichmentMemo
+# ============================================================================
+
+def test_enrichment_memo_shares_results_between_name_variants():
+    """Test that rows naming the same company in the same city run once."""
+    memo = EnrichmentMemo()
+    run = Mock(return_value={'confidence': 0.9})
+
+    first = memo.get_or_run("Acme Bio, Inc.", "South San Francisco", run)
+    second = memo.get_or_run("ACME BIO", " south  san francisco", run)
+    other_city = memo.get_or_run("Acme Bio", "Oakland", run)
+
+    assert first is second
+    assert other_city == {'confidence': 0.9}
+    assert run.call_count == 2
+    assert memo.hits == 1
+
+
+def test_enrichment_memo_retries_after_failure():
+    """Test that a failed enrichment is not remembered."""
+    memo = EnrichmentMemo()
+    run = Mock(side_effect=[RuntimeError("overloaded"), {'confidence': 0.9}])
+
+    with pytest.raises(RuntimeError):
+        memo.get_or_run("Acme Bio", "Oakland", run)
+
+    assert memo.get_or_run("Acme Bio", "Oakland", run) == {'confidence': 0.9}
+    assert run.call_count == 2
+
+
 # ============================================================================
 # Test Acceptance Logic
 # ============================================================================
@@ -446,6 +732,32 @@ def test_accept_enrichment_result_reject_aggregator():
     assert enriched_data['Website'] == ''
 
 
+def test_accept_enrichment_result_catches_unflagged_aggregator():
+    """Test that an aggregator website is rejected even if the LLM passed it."""
+    validation = {
+        'in_bay_area': True,
+        'is_business': True,
+        'brand_domain_ok': True,
+        'multi_tenant_ok': True,
+        'reasoning': 'Looks fine'
+    }
+    result = {
+        'company_name': 'Some Company',
+        'website': 'https://www.crunchbase.com/organization/some-company',
+        'address': '123 Main St, San Francisco, CA',
+        'city': 'San Francisco',
+        'place_id': 'place_111',
+        'confidence': 0.90,
+        'validation': validation
+    }
+
+    accepted, enriched_data = accept_enrichment_result(result, 'Some Company')
+
+    assert accepted is False
+    assert json.loads(enriched_data['Validation_JSON']) == validation
+    assert ', "' not in enriched_data['Validation_JSON']
+
+
 def test_accept_enrichment_result_null_fields():
     """Test acceptance logic handles null fields correctly."""
     result = {
@@ -477,6 +789,31 @@ def test_accept_enrichment_result_null_fields():
 # Test Tool Use Controller Loop (Mocked)
 # ============================================================================
 
+def _final_result(company_name='Genentech', confidence=0.9, **fields):
+    """A final enrichment result that satisfies COMPANY_ENRICHMENT_SCHEMA."""
+    return {
+        'company_name': company_name,
+        'website': None,
+        'address': None,
+        'city': None,
+        'place_id': None,
+        'confidence': confidence,
+        'validation': {
+            'in_bay_area': True,
+            'is_business': True,
+            'brand_domain_ok': True,
+            'multi_tenant_ok': True,
+            'reasoning': 'test'
+        },
+        **fields
+    }
+
+
+def _end_turn(payload):
+    block = Mock(type='text', text=json.dumps(payload))
+    return Mock(stop_reason='end_turn', content=[block], usage=Mock(input_tokens=10, output_tokens=5))
+
+
 def test_run_structured_enrichment_mock():
     """Test run_structured_enrichment with mocked Anthropic response."""
     from scripts.path_b_enrichment import run_structured_enrichment
@@ -538,6 +875,29 @@ def test_run_structured_enrichment_mock():
     assert mock_counter.total_output_tokens == 200
 
 
+def test_prompt_prefix_shared_across_companies():
+    """Test that only the tail of the prompt depends on the company."""
+    from scripts.path_b_enrichment import VALIDATION_RUBRIC, run_structured_enrichment
+
+    mock_response = Mock(stop_reason='end_turn',
+                         content=[Mock(text=json.dumps(_final_result('x')))],
+                         usage=Mock(input_tokens=1, output_tokens=1))
+    mock_client = Mock()
+    mock_client.messages.create.return_value = mock_response
+
+    prompts = []
+    for name, city in [('Genentech', 'South San Francisco'), ('BioMarin', 'San Rafael')]:
+        run_structured_enrichment(name, city, mock_client, AnthropicUsageCounter())
+        prompts.append(mock_client.messages.create.call_args.kwargs['messages'][0]['content'])
+
+    assert '{' not in VALIDATION_RUBRIC
+    for (rubric, details), name in zip(prompts, ['Genentech', 'BioMarin']):
+        assert rubric == {"type": "text", "text": VALIDATION_RUBRIC,
+                          "cache_control": {"type": "ephemeral"}}
+        assert name not in VALIDATION_RUBRIC
+        assert name in details['text']
+
+
 def test_run_structured_enrichment_tool_use():
     """Test run_structured_enrichment with tool use."""
     from scripts.path_b_enrichment import run_structured_enrichment
@@ -640,6 +1000,229 @@ def test_run_structured_enrichment_tool_use():
     del TOOL_REGISTRY['gmaps']
 
 
+def test_run_structured_enrichment_stops_when_first_search_is_empty(setup_tool_registry, mock_gmaps):
+    """Test that an empty first search ends the loop without another API round."""
+    from scripts.path_b_enrichment import run_structured_enrichment
+
+    # The prefetched query fails outright; the model's own first search is empty
+    mock_gmaps.places.side_effect = [
+        {'status': 'UNKNOWN_ERROR'},
+        {'status': 'ZERO_RESULTS', 'results': []},
+    ]
+
+    search_block = Mock(type='tool_use', input={'query': 'Nowhere Biosciences Oakland'}, id='toolu_1')
+    search_block.name = 'search_places'
+    mock_response = Mock(stop_reason='tool_use', content=[search_block],
+                         usage=Mock(input_tokens=400, output_tokens=100))
+    mock_client = Mock()
+    mock_client.messages.create.return_value = mock_response
+
+    result = run_structured_enrichment('Nowhere Bio', 'Oakland', mock_client, AnthropicUsageCounter())
+
+    assert mock_client.messages.create.call_count == 1
+    assert result['confidence'] == 0.0
+    assert result['place_id'] is None
+    accepted, enriched_data = accept_enrichment_result(result, 'Nowhere Bio')
+    assert accepted is False
+    assert enriched_data['Rejection_Reason'] == 'No Google Places results found'
+
+
+def test_run_structured_enrichment_keeps_prefetched_candidates(setup_tool_registry, mock_gmaps):
+    """Test that an empty first search does not discard prefetched candidates."""
+    from scripts.path_b_enrichment import run_structured_enrichment
+
+    # The prefetched query finds a candidate; the model's own first search does not
+    mock_gmaps.places.side_effect = [
+        {'status': 'OK', 'results': [{'place_id': 'ChIJ_x', 'name': 'Nowhere Labs'}]},
+        {'status': 'ZERO_RESULTS', 'results': []},
+    ]
+
+    search_block = Mock(type='tool_use', input={'query': 'Nowhere Biosciences Oakland'}, id='toolu_1')
+    search_block.name = 'search_places'
+    search_response = Mock(stop_reason='tool_use', content=[search_block],
+                           usage=Mock(input_tokens=400, output_tokens=100))
+    mock_client = Mock()
+    mock_client.messages.create.side_effect = [
+        search_response,
+        _end_turn(_final_result('Nowhere Bio', place_id='ChIJ_x')),
+    ]
+
+    result = run_structured_enrichment('Nowhere Bio', 'Oakland', mock_client, AnthropicUsageCounter())
+
+    assert mock_client.messages.create.call_count == 2
+    assert result['place_id'] == 'ChIJ_x'
+
+
+def test_run_structured_enrichment_prefetch_without_candidates(setup_tool_registry, mock_gmaps):
+    """Test that an empty prefetched search returns the null result with no model call."""
+    from scripts.path_b_enrichment import run_structured_enrichment
+
+    mock_gmaps.places.return_value = {'status': 'ZERO_RESULTS', 'results': []}
+    mock_client = Mock()
+
+    result = run_structured_enrichment('Nowhere Bio', 'Oakland', mock_client, AnthropicUsageCounter())
+
+    mock_gmaps.places.assert_called_once_with('Nowhere Bio Oakland CA biotech')
+    mock_client.messages.create.assert_not_called()
+    assert result['confidence'] == 0.0
+    assert result['validation']['reasoning'] == 'No Google Places results found'
+
+
+def test_run_structured_enrichment_prefetch_in_prompt(setup_tool_registry, mock_gmaps):
+    """Test that prefetched candidates follow the cached rubric in the first message."""
+    from scripts.path_b_enrichment import VALIDATION_RUBRIC, run_structured_enrichment
+
+    mock_gmaps.places.return_value = {
+        'status': 'OK',
+        'results': [{'place_id': 'ChIJ_bm', 'name': 'BioMarin', 'formatted_address': 'San Rafael, CA'}]
+    }
+    mock_client = Mock()
+    mock_client.messages.create.return_value = _end_turn(_final_result('BioMarin'))
+
+    run_structured_enrichment('BioMarin', '', mock_client, AnthropicUsageCounter())
+
+    mock_gmaps.places.assert_called_once_with('BioMarin CA biotech')
+    rubric, company, prefetched = mock_client.messages.create.call_args.kwargs['messages'][0]['content']
+    assert rubric['text'] == VALIDATION_RUBRIC
+    assert 'cache_control' not in company and 'cache_control' not in prefetched
+    assert '"BioMarin CA biotech"' in prefetched['text']
+    assert 'ChIJ_bm' in prefetched['text']
+
+
+@pytest.mark.parametrize("triage_result, models", [
+    ({'confidence': 0.95}, ['TRIAGE']),
+    ({'confidence': 0.0}, ['TRIAGE']),
+    ({'confidence': 0.7}, ['TRIAGE', 'MAIN']),
+    ({'confidence': 0.95, 'escalate': True}, ['TRIAGE', 'MAIN']),
+])
+def test_run_triaged_enrichment_escalates_uncertain_results(triage_result, models):
+    """Test that only uncertain triage results are re-run on the main model."""
+    from scripts.path_b_enrichment import ANTHROPIC_MODEL, TRIAGE_MODEL, run_triaged_enrichment
+
+    mock_client = Mock()
+    mock_client.messages.create.side_effect = [
+        _end_turn(_final_result(**triage_result)), _end_turn(_final_result(confidence=0.9))
+    ]
+    counter = AnthropicUsageCounter()
+
+    result = run_triaged_enrichment('Genentech', 'South San Francisco', mock_client, counter)
+
+    names = {TRIAGE_MODEL: 'TRIAGE', ANTHROPIC_MODEL: 'MAIN'}
+    called = [names[call.kwargs['model']] for call in mock_client.messages.create.call_args_list]
+    assert called == models
+    assert result['confidence'] == (0.9 if len(models) == 2 else triage_result['confidence'])
+    assert sorted(names[model] for model in counter.model_usage) == sorted(models)
+
+
+def test_run_triaged_enrichment_escalates_failed_triage():
+    """Test that a triage run without usable output falls through to the main model."""
+    from scripts.path_b_enrichment import ANTHROPIC_MODEL, run_triaged_enrichment
+
+    bad = Mock(stop_reason='end_turn', content=[Mock(type='text', text='not json')],
+               usage=Mock(input_tokens=10, output_tokens=5))
+    mock_client = Mock()
+    mock_client.messages.create.side_effect = [bad, _end_turn(_final_result(confidence=0.9))]
+
+    result = run_triaged_enrichment('Genentech', '', mock_client, AnthropicUsageCounter())
+
+    assert result['confidence'] == 0.9
+    assert mock_client.messages.create.call_args.kwargs['model'] == ANTHROPIC_MODEL
+
+
+def test_run_structured_enrichment_retries_off_schema_output():
+    """Test that a final answer failing the schema is sent back instead of returned."""
+    from scripts.path_b_enrichment import run_structured_enrichment
+
+    mock_client = Mock()
+    mock_client.messages.create.side_effect = [
+        _end_turn({'company_name': 'Genentech', 'confidence': '0.9'}),
+        _end_turn(_final_result(confidence=0.9)),
+    ]
+
+    result = run_structured_enrichment('Genentech', '', mock_client, AnthropicUsageCounter())
+
+    assert result['confidence'] == 0.9
+    messages = mock_client.messages.create.call_args.kwargs['messages']
+    assert messages[-2]['role'] == 'assistant'
+    assert 'schema' in messages[-1]['content']
+
+
+@pytest.mark.parametrize("mutate, error", [
+    (lambda r: r.pop('place_id'), "data must contain place_id"),
+    (lambda r: r.update(confidence=True), "data.confidence must be number"),
+    (lambda r: r.update(website=3), "data.website must be string or null"),
+    (lambda r: r['validation'].update(extra=1), "data.validation must not contain extra"),
+])
+def test_check_schema_rejects_malformed_results(mutate, error):
+    """Test the fallback schema check against COMPANY_ENRICHMENT_SCHEMA."""
+    from scripts.path_b_enrichment import COMPANY_ENRICHMENT_SCHEMA, check_schema
+
+    schema = COMPANY_ENRICHMENT_SCHEMA['schema']
+    result = _final_result(website='https://gene.com', confidence=1, escalate=False)
+    check_schema(result, schema)
+
+    mutate(result)
+    with pytest.raises(ValueError, match=error):
+        check_schema(result, schema)
+
+
+def test_run_tool_call_only_dispatches_tools(setup_tool_registry, mock_gmaps):
+    """Test that runtime TOOL_REGISTRY entries cannot be invoked as tools."""
+    from scripts.path_b_enrichment import run_tool_call
+
+    block = Mock(input={})
+    block.name = 'gmaps'
+
+    result = run_tool_call(block)
+
+    assert result == {"status": "ERROR", "error": "Unknown tool: gmaps"}
+    assert not mock_gmaps.called
+
+
+def test_run_structured_enrichment_parallel_tool_calls():
+    """Test that tool calls from one turn run concurrently and keep their order."""
+    import threading
+    from scripts.path_b_enrichment import run_structured_enrichment
+
+    # Both calls must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_tool(place_id):
+        barrier.wait()
+        return {"status": "OK", "place_id": place_id}
+
+    from scripts import path_b_enrichment
+    from types import MappingProxyType
+
+    tool_blocks = []
+    for i in range(2):
+        block = Mock()
+        block.type = 'tool_use'
+        block.name = 'fake_details'
+        block.input = {'place_id': f'place_{i}'}
+        block.id = f'toolu_{i}'
+        tool_blocks.append(block)
+
+    mock_response1 = Mock(stop_reason='tool_use', content=tool_blocks,
+                          usage=Mock(input_tokens=400, output_tokens=100))
+    mock_text_block = Mock(text=json.dumps(_final_result('Genentech')))
+    mock_response2 = Mock(stop_reason='end_turn', content=[mock_text_block],
+                          usage=Mock(input_tokens=600, output_tokens=250))
+
+    mock_client = Mock()
+    mock_client.messages.create.side_effect = [mock_response1, mock_response2]
+
+    with patch.object(path_b_enrichment, 'TOOL_FUNCTIONS',
+                      MappingProxyType({'fake_details': fake_tool})):
+        result = run_structured_enrichment('Genentech', 'South San Francisco',
+                                           mock_client, AnthropicUsageCounter())
+
+    assert result['company_name'] == 'Genentech'
+    tool_results = mock_client.messages.create.call_args_list[1].kwargs['messages'][-1]['content']
+    assert [r['tool_use_id'] for r in tool_results] == ['toolu_0', 'toolu_1']
+    assert json.loads(tool_results[1]['content'])['place_id'] == 'place_1'
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
@@ -709,3 +1292,137 @@ def test_full_path_b_pipeline():
 
     # Cleanup
     del TOOL_REGISTRY['gmaps']
+
+
+def test_main_resume_keys_on_name_and_city(tmp_path):
+    """Test that --resume only skips the same name in the same city."""
+    import csv
+
+    with open(tmp_path / "queue.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Company Name', 'City'])
+        writer.writerow(['Acme Bio', 'Oakland'])
+        writer.writerow(['Acme Bio', 'Berkeley'])
+    outcomes = {'Acme Bio': 'accepted'}
+
+    assert _run_main(tmp_path, ['--limit', '1'], outcomes) == ['Acme Bio']
+    processed = _run_main(tmp_path, ['--resume'], outcomes)
+
+    assert processed == ['Acme Bio']
+    with open(tmp_path / "out.csv", newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['Queue_City'] for row in rows] == ['Oakland', 'Berkeley']
+
+
+def test_load_queue_keeps_only_enrichment_columns(tmp_path):
+    """Test that queue rows are slotted and drop columns enrichment never reads."""
+    from scripts.path_b_enrichment import QueueRow, load_queue
+
+    queue = tmp_path / "queue.csv"
+    queue.write_text(
+        "Company Name,Website,City,Notes\n"
+        "Genentech,https://gene.com,South San Francisco,long notes\n"
+        "BioMarin,,,\n"
+        "\"Acme, Inc.\",,South San Francisco,\"two\nlines\"\n",
+        encoding='utf-8'
+    )
+
+    rows = load_queue(queue)
+
+    assert rows == [
+        QueueRow('Genentech', 'South San Francisco'),
+        QueueRow('BioMarin', ''),
+        QueueRow('Acme, Inc.', 'South San Francisco'),
+    ]
+    assert not hasattr(rows[0], '__dict__')
+    assert rows[0].city is rows[2].city
+
+
+def test_load_queue_without_city_column(tmp_path):
+    """Test that a queue with no City column loads with empty city hints."""
+    from scripts.path_b_enrichment import QueueRow, load_queue
+
+    queue = tmp_path / "queue.csv"
+    queue.write_text("Company Name\nGenentech\n", encoding='utf-8')
+
+    assert load_queue(queue) == [QueueRow('Genentech', '')]
+
+
+def _run_main(tmp_path, argv, outcomes):
+    """Run main() against tmp_path with process_company returning `outcomes` by name."""
+    from scripts import path_b_enrichment
+
+    def fake_process(company, client, counter, memo=None, limiter=None):
+        name = company.company_name
+        outcome = outcomes[name]
+        data = {'Company Name': name, 'Confidence': '0.900', 'Validation_Source': 'PathB',
+                'Address': '1 DNA Way', 'City': company.city}
+        if outcome == 'rejected':
+            data['Rejection_Reason'] = 'outside Bay Area'
+        elif outcome == 'error':
+            data['Validation_JSON'] = json.dumps({'error': 'overloaded'})
+            data['Error'] = 'overloaded'
+        return outcome, data
+
+    with patch.object(path_b_enrichment, 'INPUT_FILE', tmp_path / "queue.csv"), \
+         patch.object(path_b_enrichment, 'WORKING_DIR', tmp_path), \
+         patch.object(path_b_enrichment, 'OUTPUT_FILE', tmp_path / "out.csv"), \
+         patch.object(path_b_enrichment, 'MANUAL_QUEUE', tmp_path / "manual.csv"), \
+         patch.object(path_b_enrichment, 'ANTHROPIC_USAGE_REPORT', tmp_path / "usage.txt"), \
+         patch.object(path_b_enrichment, 'RATE_LIMIT_DELAY', 0), \
+         patch.object(path_b_enrichment, 'process_company', side_effect=fake_process) as process, \
+         patch.object(path_b_enrichment.googlemaps, 'Client'), \
+         patch.object(path_b_enrichment.anthropic, 'Anthropic'), \
+         patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'x', 'ANTHROPIC_API_KEY': 'y'}), \
+         patch.object(sys, 'argv', ['path_b_enrichment.py', '--no-cache'] + argv):
+        path_b_enrichment.main()
+
+    return [call.args[0].company_name for call in process.call_args_list]
+
+
+def test_main_streams_rows_and_resumes(tmp_path):
+    """Test that outputs are written row by row and --resume retries only errored companies."""
+    import csv
+
+    with open(tmp_path / "queue.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Company Name', 'City'])
+        for name, city in [('Genentech', 'Oakland'), ('Davis Bio', 'Oakland'),
+                           ('Flaky Bio', 'Oakland'), ('UCD Spinout', 'Davis'),
+                           ('BioMarin', '')]:
+            writer.writerow([name, city])
+    outcomes = {'Genentech': 'accepted', 'Davis Bio': 'rejected',
+                'Flaky Bio': 'error', 'BioMarin': 'accepted'}
+
+    processed = _run_main(tmp_path, ['--limit', '4'], outcomes)
+    # Out-of-area city hints are rejected without calling process_company
+    assert processed == ['Genentech', 'Davis Bio', 'Flaky Bio']
+
+    with open(tmp_path / "manual.csv", newline='', encoding='utf-8') as f:
+        manual = list(csv.DictReader(f))
+    assert [row['Company Name'] for row in manual] == ['Davis Bio', 'Flaky Bio', 'UCD Spinout']
+    assert manual[0]['Rejection_Reason'] == 'outside Bay Area'
+    assert manual[1]['Error'] == 'overloaded'
+    assert 'outside the 9-county whitelist' in manual[2]['Rejection_Reason']
+
+    outcomes['Flaky Bio'] = 'accepted'
+    processed = _run_main(tmp_path, ['--resume'], outcomes)
+    assert processed == ['Flaky Bio', 'BioMarin']
+
+    # Statistics count this run's rows separately from earlier runs'
+    report = (tmp_path / "usage.txt").read_text(encoding='utf-8')
+    assert "Processed this run: 2 (3 already done)" in report
+    assert "Total Path B companies in output: 5" in report
+
+    with open(tmp_path / "out.csv", newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['Company Name'] for row in rows] == [
+        'Genentech', 'Davis Bio', 'UCD Spinout', 'Flaky Bio', 'BioMarin'
+    ]
+    assert not any('error' in row['Validation_JSON'] for row in rows)
+
+    # The retried company was accepted, so it no longer needs review
+    with open(tmp_path / "manual.csv", newline='', encoding='utf-8') as f:
+        manual = list(csv.DictReader(f))
+    assert [row['Company Name'] for row in manual] == ['Davis Bio', 'UCD Spinout']
+    assert 'Error' not in rows[0]
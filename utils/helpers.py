@@ -7,12 +7,17 @@ This module provides utility functions for:
 - Company name normalization and similarity scoring
 - Multi-tenant/incubator address handling
 - Validation logic for Path A and Path B enrichment
+- Atomic output file writes
 
 Author: Bay Area Biotech Map V4.3
 Date: 2025-11-15
 """
 
+import os
 import re
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 import tldextract
 from textdistance import jaro_winkler
@@ -22,6 +27,10 @@ from textdistance import jaro_winkler
 # Constants
 # ============================================================================
 
+# Memoized URL parses kept per process (etld1 / is_aggregator); bounded so a
+# long enrichment run over many distinct candidate websites stays flat
+URL_CACHE_SIZE = 1 << 16
+
 # Aggregator domains that should NOT be used as canonical websites
 # These domains host multiple companies and are not suitable for deduplication
 AGGREGATOR_ETLD1 = {
@@ -45,6 +54,40 @@ AGGREGATOR_ETLD1 = {
     "wikipedia.org",  # Wikipedia articles
 }
 
+# eTLD+1 extractor using tldextract's bundled public suffix snapshot.
+# The default extractor may fetch the live list over HTTP on first use,
+# which stalls the first etld1() call of a run (or times out offline).
+_TLD_EXTRACTOR = tldextract.TLDExtract(suffix_list_urls=())
+
+# Company name normalization patterns (compiled once at import)
+_NAME_PUNCT_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Common company suffixes, stripped in this order. Order matters: each suffix
+# is checked once against the result of the previous one, so
+# "Acme Therapeutics Inc" loses "inc" first and then "therapeutics".
+# By the time these run the name holds only word characters and single
+# spaces, so a plain tail comparison is enough: a suffix counts only as a
+# whole word (the entire name, or preceded by a space). Each step may try
+# more than one spelling, but strips at most one.
+_NAME_SUFFIXES = (
+    ('inc',),
+    ('incorporated',),
+    ('llc',),
+    ('ltd',),
+    ('limited',),
+    ('corp',),
+    ('corporation',),
+    ('co',),
+    ('company',),
+    ('laboratories',),
+    ('labs', 'lab'),  # labs?
+    ('therapeutics',),
+    ('bio',),
+    ('pharma',),
+    ('pharmaceuticals',),
+)
+
 # Known multi-tenant/incubator addresses in the Bay Area
 # Companies at these addresses need strong brand-domain validation
 INCUBATOR_ADDRESSES = {
@@ -65,6 +108,7 @@ INCUBATOR_ADDRESSES = {
 # URL and Domain Functions
 # ============================================================================
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def etld1(url: str) -> str:
     """
     Extract the eTLD+1 (effective top-level domain + 1) from a URL.
@@ -94,7 +138,7 @@ def etld1(url: str) -> str:
 
     try:
         # tldextract handles various URL formats and edge cases
-        extracted = tldextract.extract(url)
+        extracted = _TLD_EXTRACTOR(url)
 
         # Combine domain + suffix (e.g., "gene" + "com" → "gene.com")
         if extracted.domain and extracted.suffix:
@@ -133,7 +177,7 @@ def brand_token_from_etld1(domain: str) -> str:
 
     try:
         # Extract just the domain part (before the TLD)
-        extracted = tldextract.extract(domain)
+        extracted = _TLD_EXTRACTOR(domain)
         brand = extracted.domain
 
         # Remove common separators (hyphens, underscores)
@@ -146,6 +190,7 @@ def brand_token_from_etld1(domain: str) -> str:
         return ""
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def is_aggregator(url: str) -> bool:
     """
     Check if a URL is from an aggregator domain.
@@ -178,6 +223,7 @@ def is_aggregator(url: str) -> bool:
 # Company Name Functions
 # ============================================================================
 
+@lru_cache(maxsize=None)
 def normalize_name(name: str) -> str:
     """
     Normalize a company name for comparison and deduplication.
@@ -210,36 +256,24 @@ def normalize_name(name: str) -> str:
     normalized = name.lower()
 
     # Remove punctuation (but keep spaces and alphanumeric) - do this first
-    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = _NAME_PUNCT_RE.sub('', normalized)
 
     # Collapse multiple spaces to single space
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
 
     # Strip leading/trailing whitespace
     normalized = normalized.strip()
 
     # Remove common company suffixes
-    # Pattern matches suffixes at end of string, with word boundaries
-    suffixes = [
-        r'\binc$',
-        r'\bincorporated$',
-        r'\bllc$',
-        r'\bltd$',
-        r'\blimited$',
-        r'\bcorp$',
-        r'\bcorporation$',
-        r'\bco$',
-        r'\bcompany$',
-        r'\blaboratories$',
-        r'\blabs?$',
-        r'\btherapeutics$',
-        r'\bbio$',
-        r'\bpharma$',
-        r'\bpharmaceuticals$',
-    ]
-
-    for suffix in suffixes:
-        normalized = re.sub(suffix, '', normalized)
+    # Suffix must be a whole word at end of string
+    for suffixes in _NAME_SUFFIXES:
+        for suffix in suffixes:
+            if normalized == suffix:
+                normalized = ''
+                break
+            if normalized.endswith(suffix) and normalized[-len(suffix) - 1] == ' ':
+                normalized = normalized[:-len(suffix)]
+                break
         # Strip and collapse spaces after each removal
         normalized = normalized.strip()
 
@@ -423,6 +457,41 @@ def validate_multi_tenant_match(
     return False
 
 
+# ============================================================================
+# File Output Functions
+# ============================================================================
+
+@contextmanager
+def atomic_write(path, mode: str = 'w', **kwargs):
+    """
+    Open `path` for writing so readers never see a partially written file.
+
+    Writes go to `<path>.tmp` in the same directory, which replaces `path`
+    in one rename once the block exits cleanly. On error the temporary file
+    is removed and any existing `path` is left untouched.
+
+    Args:
+        path: Final output path
+        mode: File mode ('w' or 'wb')
+        **kwargs: Passed to open() (encoding, newline, buffering, ...)
+
+    Examples:
+        >>> with atomic_write(output_file, encoding='utf-8', newline='') as f:
+        ...     csv.writer(f).writerows(rows)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    f = open(tmp_path, mode, **kwargs)
+    try:
+        yield f
+    except BaseException:
+        f.close()
+        tmp_path.unlink()
+        raise
+    f.close()
+    os.replace(tmp_path, path)
+
+
 # ============================================================================
 # Module Info
 # ============================================================================
@@ -438,4 +507,5 @@ __all__ = [
     "normalize_address",
     "is_multi_tenant",
     "validate_multi_tenant_match",
+    "atomic_write",
 ]